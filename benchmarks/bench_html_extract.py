@@ -0,0 +1,71 @@
+"""新闻正文提取基准：对比各解析后端在保存的样例页面上的耗时和输出。
+
+用法（在项目根目录）::
+
+    python benchmarks/bench_html_extract.py [-n 轮数] [页面.html ...]
+
+不传页面时使用 ``benchmarks/fixtures/`` 下的全部样例。``legacy`` 即原
+``_extract_article_text`` 的实现（整页 html.parser + 文本里搜 charset），
+其余后端的输出应与它一致。
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.data.html_extract import BACKENDS, get_extractor, lxml_html  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def bench(extractor, pages, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for raw in pages.values():
+            extractor.extract(raw)
+    return (time.perf_counter() - started) / (rounds * len(pages)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rounds', type=int, default=20, help='每个后端重复的轮数')
+    parser.add_argument('pages', nargs='*', help='HTML 页面文件（默认全部样例）')
+    args = parser.parse_args()
+
+    paths = args.pages or sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+    pages = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        print("没有可用的页面")
+        return
+
+    names = [name for name in BACKENDS if name != 'lxml' or lxml_html is not None]
+    extractors = {name: get_extractor(name) for name in names}
+
+    print("输出一致性（与 legacy 对比）:")
+    baseline = {page: extractors['legacy'].extract(raw) for page, raw in pages.items()}
+    for page, expected in baseline.items():
+        status = []
+        for name, extractor in extractors.items():
+            if name == 'legacy':
+                continue
+            same = extractor.extract(pages[page]) == expected
+            status.append(f"{name}={'一致' if same else '不一致'}")
+        print(f"  {page:<32} {len(expected):>5} 字  {'  '.join(status)}")
+
+    print(f"\n平均每页耗时（{len(pages)} 页 × {args.rounds} 轮）:")
+    legacy_ms = None
+    for name, extractor in extractors.items():
+        ms = bench(extractor, pages, args.rounds)
+        legacy_ms = legacy_ms or ms
+        print(f"  {name:<10} {ms:8.2f} ms  {legacy_ms / ms:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""启动耗时基准：各模块的冷启动导入时间，以及 ``main.py`` / ``tui.py`` 到第一次输出的时间。
+
+用法（在项目根目录）::
+
+    python benchmarks/bench_startup.py [-n 轮数]
+
+每项都在新的子进程里测（模块缓存不共享），取中位数：
+
+- 导入：``python -c "import 模块"`` 内部计时，不含解释器本身的启动
+- ``main.py``：从启动进程到打印第一行（“初始化系统组件...”）的时间，之后立即结束进程，
+  不会真的发请求（使用占位的 API Key）
+- ``tui.py``：从启动进程到应用完成首次挂载（``App.run_test`` 就绪）的时间，需要 textual
+
+缺少依赖的项会标出缺的模块名并跳过。
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODULES = (
+    'src.data',
+    'src.data.database',
+    'src.data.stock_data',
+    'src.data.financial_data',
+    'src.data.news_data',
+    'src.llm',
+    'src.llm.model_api',
+    'src.tui.app',
+)
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import {module}
+print('READY', (time.perf_counter() - started) * 1000)
+"""
+
+TUI_SNIPPET = """
+import asyncio
+from src.tui.app import AiTouGuApp
+
+async def main():
+    async with AiTouGuApp().run_test():
+        print('READY', flush=True)
+
+asyncio.run(main())
+"""
+
+# 占位配置：让 main.py 走过 Key 检查，打印第一行后就被结束
+DUMMY_ENV = {
+    'DEEPSEEK_API_KEY': 'bench-placeholder',
+    'TUSHARE_TOKEN': 'bench-placeholder',
+}
+
+
+def _env():
+    env = dict(os.environ)
+    env.update(DUMMY_ENV)
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+
+def _missing_module(stderr):
+    for line in reversed(stderr.splitlines()):
+        if 'ModuleNotFoundError' in line:
+            return line.split("'")[1] if "'" in line else line
+    return None
+
+
+def time_to_first_line(args, marker=None, timeout=60.0):
+    """启动子进程，返回到输出第一行（或以 ``marker`` 开头的行）的秒数和该行内容"""
+    started = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=ROOT, env=_env(), stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True)
+    try:
+        for line in proc.stdout:
+            if marker is None or line.startswith(marker):
+                return time.perf_counter() - started, line.strip()
+        stderr = proc.stderr.read()
+        raise RuntimeError(_missing_module(stderr) or stderr.strip().splitlines()[-1])
+    finally:
+        proc.kill()
+        proc.wait(timeout)
+
+
+def bench_import(module, rounds):
+    samples = []
+    for _ in range(rounds):
+        _, line = time_to_first_line(
+            [sys.executable, '-c', IMPORT_SNIPPET.format(module=module)], 'READY')
+        samples.append(float(line.split()[1]))
+    return statistics.median(samples)
+
+
+def bench_first_output(args, rounds, marker=None):
+    return statistics.median(
+        time_to_first_line(args, marker)[0] * 1000 for _ in range(rounds)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--rounds', type=int, default=5, help='每项重复的次数')
+    args = parser.parse_args()
+
+    baseline = bench_first_output([sys.executable, '-c', 'print("READY")'], args.rounds)
+    print(f"解释器空启动: {baseline:8.1f} ms\n")
+
+    print("模块导入（不含解释器启动）:")
+    for module in MODULES:
+        try:
+            print(f"  {module:<28} {bench_import(module, args.rounds):8.1f} ms")
+        except RuntimeError as e:
+            print(f"  {module:<28} 跳过（缺少依赖: {e}）")
+
+    print("\n到第一次输出（含解释器启动）:")
+    targets = (
+        ('main.py', [sys.executable, '-u', 'main.py'], None),
+        ('tui.py', [sys.executable, '-c', TUI_SNIPPET], 'READY'),
+    )
+    for name, command, marker in targets:
+        try:
+            print(f"  {name:<28} {bench_first_output(command, args.rounds, marker):8.1f} ms")
+        except RuntimeError as e:
+            print(f"  {name:<28} 跳过（缺少依赖: {e}）")
+
+
+if __name__ == '__main__':
+    main()
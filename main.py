@@ -1,10 +1,12 @@
+import argparse
 import os
 from dotenv import load_dotenv
-from typing import Dict, List, Any
+from typing import Dict, Any
 from src.data import MaiRuiStockAPI, FinancialDataFetcher, NewsDataFetcher
 from src.llm import LLMService
-from src.portfolio import PortfolioManager
+from src.data.analysis_reuse import plan_reuse, stamp_market_result, stamp_stock_result
 from src.data.database import DatabaseManager
+from src.data.dedup import dedup_news
 
 def get_user_portfolio() -> Dict[str, float]:
     """获取用户持仓信息，测试环境返回默认值"""
@@ -60,19 +62,54 @@ def format_trading_advice(advice: Dict[str, Any]) -> str:
 风险等级: {advice.get('risk_level', '未指定')}
 ------------------------"""
 
+def print_stock_result(result: Dict[str, Any]) -> None:
+    """打印个股分析结果"""
+    print("\n分析结果:")
+    print("-" * 50)
+    if result['status'] == 'success':
+        print(result['analysis'])
+        print("\n" + format_trading_advice(result.get('trading_advice')))
+    else:
+        print(f"分析失败: {result.get('error')}")
+    print("-" * 50)
+
 def analyze_portfolio(portfolio: Dict[str, float], 
                      balance: float,
                      stock_api: MaiRuiStockAPI,
                      news_api: NewsDataFetcher,
                      financial_api: FinancialDataFetcher,
                      llm_service: LLMService,
-                     db: DatabaseManager) -> None:
-    """分析投资组合"""
-    
+                     db: DatabaseManager,
+                     force: bool = False) -> None:
+    """分析投资组合
+
+    非交易日里行情、K线不会变：最近一次收盘后、以相同持仓 / 资金分析过的
+    结果直接沿用数据库里的记录，不再重新拉数据、调用模型（见
+    :func:`src.data.analysis_reuse.plan_reuse`；``force=True`` 时照常分析）。
+    """
+    plan = plan_reuse(db, portfolio, balance, force)
+    reused, reused_market, pending = plan.stocks, plan.market, plan.pending
+    if plan.any_reused:
+        print("今天不是交易日，收盘后已有的分析结果直接沿用（--force 可强制重新分析）")
+
+    # 市场新闻先拉一次：既用于第 2 步的市场分析，也按提到的股票分发给持仓
+    market_news = []
+    if pending or reused_market is None:
+        market_news = stock_api.entity_linker.tag_news(news_api.get_daily_news(min_count=40))
+    routed_news = stock_api.entity_linker.route(market_news, pending)
+
     # 1. 分析持仓股票
     if portfolio:
         print("\n=== 分析持仓股票 ===")
+        # 先批量并发拉取所有持仓的实时行情、一次算好财务指标，循环里直接查表
+        quotes = stock_api.get_realtime_quotes(pending) if pending else {}
+        financials = financial_api.get_financial_data_batch(pending) if pending else {}
         for stock_code, position in portfolio.items():
+            if stock_code in reused:
+                print(f"\n{stock_code} 沿用 {reused[stock_code].get('timestamp')} 的分析结果")
+                print_stock_result(reused[stock_code])
+                continue
+
             print(f"\n分析 {stock_code} ...")
             
             # 获取股票信息
@@ -83,25 +120,25 @@ def analyze_portfolio(portfolio: Dict[str, float],
 
             # 获取实时行情（注入到 stock_info 让 LLM 拿到当前价）
             # T3.1: 让 LLM 决策时知道当前市场价, 避免 LLM 编造价格
-            try:
-                quote = stock_api.get_realtime_quote(stock_code)
-                stock_info['current_price'] = quote.get('price', 0)
-            except Exception as e:
-                print(f"获取 {stock_code} 实时行情失败: {e}")
-                stock_info['current_price'] = 0
+            quote = quotes.get(stock_code) or {}
+            if not quote:
+                print(f"获取 {stock_code} 实时行情失败")
+            stock_info['current_price'] = quote.get('price', 0)
 
             # 保存股票信息
             db.save_stock_info(stock_info)
             
             # 获取相关新闻
             news_list = news_api.get_stock_news(stock_code, days=7)
+            # 加上市场新闻里提到该股的条目（去掉重复转载）
+            news_list = dedup_news(news_list + routed_news.get(stock_code, []))
             print(f"获取到 {len(news_list)} 条相关新闻")
             
             # 保存新闻
             db.save_news(news_list, stock_code)
             
             # 获取财务数据
-            financial_data = financial_api.get_financial_data(stock_code)
+            financial_data = financials.get(stock_code) or {}
             
             # 添加持仓信息到分析
             stock_info['position'] = position
@@ -112,35 +149,32 @@ def analyze_portfolio(portfolio: Dict[str, float],
             # 保存分析结果
             if result['status'] == 'success':
                 result['stock_name'] = stock_info.get('name')
-                db.save_stock_analysis(stock_code, result)
+                db.save_stock_analysis(stock_code, stamp_stock_result(result, stock_code, position))
             
-            print("\n分析结果:")
-            print("-" * 50)
-            if result['status'] == 'success':
-                print(result['analysis'])
-                print("\n" + format_trading_advice(result.get('trading_advice')))
-            else:
-                print(f"分析失败: {result.get('error')}")
-            print("-" * 50)
+            print_stock_result(result)
             
             # 测试环境跳过用户交互
             # input("\n按Enter继续...")
     
     # 2. 分析市场机会
     print("\n=== 分析市场机会 ===")
-    # 获取财经新闻
-    market_news = news_api.get_daily_news(min_count=40)
-    print(f"\n获取到 {len(market_news)} 条市场新闻")
-    
-    # 保存市场新闻
-    db.save_news(market_news)
-    
-    # 调用模型分析市场机会
-    market_analysis = llm_service.analyze_market(market_news, balance)
-    
-    # 保存市场分析结果
-    if market_analysis['status'] == 'success':
-        db.save_market_analysis(market_analysis, balance)
+    if reused_market is not None:
+        print(f"\n沿用 {reused_market.get('timestamp')} 的市场分析结果")
+        market_analysis = reused_market
+    else:
+        print(f"\n获取到 {len(market_news)} 条市场新闻")
+        
+        # 保存市场新闻（同时按提到的股票分别入库）
+        db.save_news(market_news)
+        db.save_news_by_stock(market_news)
+        
+        # 调用模型分析市场机会
+        market_analysis = llm_service.analyze_market(market_news, balance)
+        
+        # 保存市场分析结果
+        if market_analysis['status'] == 'success':
+            stamp_market_result(market_analysis, portfolio, balance)
+            db.save_market_analysis(market_analysis, balance)
     
     print("\n市场分析结果:")
     print("-" * 50)
@@ -151,6 +185,11 @@ def analyze_portfolio(portfolio: Dict[str, float],
     print("-" * 50)
 
 def main():
+    parser = argparse.ArgumentParser(description="持仓日报 + 市场机会扫描")
+    parser.add_argument('--force', action='store_true',
+                        help='非交易日也重新拉取数据、调用模型分析')
+    args = parser.parse_args()
+
     # 1. 加载环境变量
     load_dotenv()
     api_key = os.getenv('DEEPSEEK_API_KEY')
@@ -183,7 +222,8 @@ def main():
         news_api=news_api,
         financial_api=financial_api,
         llm_service=llm_service,
-        db=db
+        db=db,
+        force=args.force
     )
 
 if __name__ == "__main__":
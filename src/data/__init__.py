@@ -1,6 +1,40 @@
-from .stock_data import MaiRuiStockAPI
-from .financial_data import FinancialDataFetcher
-from .news_data import NewsDataFetcher
-from .database import DatabaseManager
+"""数据层 — 按需导入。
 
-__all__ = ['MaiRuiStockAPI', 'FinancialDataFetcher', 'NewsDataFetcher', 'DatabaseManager']
+``financial_data`` 依赖 tushare / pandas，``news_data`` 依赖 bs4 / lxml，
+全部在包导入时加载要好几百毫秒；TUI 只打开行情页、cron 只跑某一步时
+用不到它们。这里用模块级 ``__getattr__``（PEP 562）在第一次访问某个
+名字时才导入对应子模块，``from src.data import X`` 的写法不变。
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .database import DatabaseManager
+    from .financial_data import FinancialDataFetcher
+    from .news_data import NewsDataFetcher
+    from .stock_data import AsyncMaiRuiStockAPI, MaiRuiStockAPI
+
+# 名字 → 定义它的子模块
+_LAZY_ATTRS = {
+    'MaiRuiStockAPI': '.stock_data',
+    'AsyncMaiRuiStockAPI': '.stock_data',
+    'FinancialDataFetcher': '.financial_data',
+    'NewsDataFetcher': '.news_data',
+    'DatabaseManager': '.database',
+}
+
+__all__ = ['MaiRuiStockAPI', 'AsyncMaiRuiStockAPI', 'FinancialDataFetcher', 'NewsDataFetcher', 'DatabaseManager']
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,101 @@
+"""非交易日沿用已保存的分析结果 — ``main.py`` 与 TUI ``AnalysisRunner`` 共用。
+
+非交易日里行情、K线不会变，最近一次收盘后已经跑过的个股 / 市场分析可以
+直接沿用，不再重新拉数据、调用模型。但结果只在输入没变时才能沿用：
+
+- 个股分析：持仓数量、成本价（写进提示词的持仓信息）
+- 市场分析：可用资金，以及整个持仓（代码、数量、成本）
+
+保存结果时用 :func:`stamp_stock_result` / :func:`stamp_market_result` 把输入
+指纹写进结果（随 ``analysis_data`` 一起落库），:func:`plan_reuse` 只沿用
+指纹一致、且在最近一次收盘后生成的结果；没有指纹的旧结果一律重新分析。
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Optional
+
+from .trade_calendar import TradeCalendar, get_default_calendar
+
+FINGERPRINT_KEY = 'input_fingerprint'
+
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def _position_key(position: Optional[Mapping[str, Any]]) -> List[float]:
+    position = position or {}
+    return [float(position.get('shares') or 0), float(position.get('cost') or 0)]
+
+
+def position_fingerprint(stock_code: str, position: Optional[Mapping[str, Any]]) -> str:
+    """个股分析的输入指纹（代码 + 持仓数量 + 成本价）"""
+    return _digest([stock_code, _position_key(position)])
+
+
+def portfolio_fingerprint(portfolio: Mapping[str, Mapping[str, Any]], balance: float) -> str:
+    """市场分析的输入指纹（可用资金 + 整个持仓）"""
+    holdings = sorted([code, _position_key(position)] for code, position in portfolio.items())
+    return _digest([float(balance or 0), holdings])
+
+
+def stamp_stock_result(result: Dict[str, Any], stock_code: str,
+                       position: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """保存个股分析前写入输入指纹"""
+    result[FINGERPRINT_KEY] = position_fingerprint(stock_code, position)
+    return result
+
+
+def stamp_market_result(result: Dict[str, Any], portfolio: Mapping[str, Mapping[str, Any]],
+                        balance: float) -> Dict[str, Any]:
+    """保存市场分析前写入输入指纹"""
+    result[FINGERPRINT_KEY] = portfolio_fingerprint(portfolio, balance)
+    return result
+
+
+class ReusePlan:
+    """:func:`plan_reuse` 的结果"""
+
+    def __init__(self, stocks: Dict[str, Dict[str, Any]], market: Optional[Dict[str, Any]],
+                 pending: List[str]):
+        self.stocks = stocks    # 股票代码 → 沿用的个股分析
+        self.market = market    # 沿用的市场分析，没有时为 None
+        self.pending = pending  # 需要重新分析的持仓（保持持仓顺序）
+
+    @property
+    def any_reused(self) -> bool:
+        return bool(self.stocks) or self.market is not None
+
+
+def _still_valid(saved: Optional[Dict[str, Any]], fingerprint: str,
+                 calendar: TradeCalendar) -> bool:
+    return bool(saved) and saved.get('status') == 'success' \
+        and saved.get(FINGERPRINT_KEY) == fingerprint \
+        and calendar.result_still_valid(saved.get('timestamp'))
+
+
+def plan_reuse(db, portfolio: Mapping[str, Mapping[str, Any]], balance: float,
+               force: bool = False, calendar: Optional[TradeCalendar] = None) -> ReusePlan:
+    """决定哪些持仓 / 市场分析可以沿用数据库里的结果
+
+    Args:
+        db: ``DatabaseManager``
+        portfolio: 股票代码 → ``{'shares': ..., 'cost': ...}``
+        balance: 可用资金
+        force: 为 ``True`` 时全部重新分析
+        calendar: 交易日历；默认使用进程内共享的日历
+    """
+    if force:
+        return ReusePlan({}, None, list(portfolio))
+    calendar = calendar or get_default_calendar()
+    stocks = {}
+    for stock_code, position in portfolio.items():
+        saved = db.get_latest_analysis(stock_code)
+        if _still_valid(saved, position_fingerprint(stock_code, position), calendar):
+            stocks[stock_code] = saved
+    market = db.get_latest_market_analysis()
+    if not _still_valid(market, portfolio_fingerprint(portfolio, balance), calendar):
+        market = None
+    return ReusePlan(stocks, market, [code for code in portfolio if code not in stocks])
@@ -0,0 +1,143 @@
+"""新闻正文缓存 — 按规范化 URL 存储提取后的正文，过期后条件请求复验。
+
+之前每次运行都会重新下载、重新解析同样的文章页面。这里把提取好的正文、
+``ETag`` / ``Last-Modified`` 和抓取时间存进 SQLite（默认与分析结果同库，
+``article_cache`` 表）：
+
+- 未过期（``max_age`` 内）：直接返回正文，不走网络
+- 已过期：带 ``If-None-Match`` / ``If-Modified-Since`` 发条件请求，
+  返回 304 时只刷新检查时间，正文沿用缓存
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 不影响页面内容的跟踪参数，规范化 URL 时去掉（另加所有 ``utm_*``）。
+# ``source`` / ``share`` 之类在部分站点是真正的内容参数，不在此列
+TRACKING_PARAMS = {'from', 'spm', 'wm', 'sudaref'}
+
+
+def normalize_url(url: str) -> str:
+    """规范化 URL：补全协议、小写主机名、去掉片段和跟踪参数、参数排序"""
+    url = (url or '').strip()
+    if url.startswith('//'):
+        url = f'https:{url}'
+    parts = urlsplit(url)
+    scheme = (parts.scheme or 'https').lower()
+    # http / https 指向同一篇文章，统一成 https 作为键
+    if scheme == 'http':
+        scheme = 'https'
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')
+    )
+    path = parts.path or '/'
+    return urlunsplit((scheme, parts.netloc.lower(), path, urlencode(query), ''))
+
+
+class ArticleCache:
+    """文章正文缓存（SQLite）"""
+
+    def __init__(self, db_path: str = "data/stock_analysis.db", max_age: float = 24 * 3600):
+        """
+        Args:
+            db_path: SQLite 文件路径（默认与 DatabaseManager 同库）
+            max_age: 缓存多少秒内视为新鲜、不发请求
+        """
+        dirname = os.path.dirname(db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.db_path = db_path
+        self.max_age = max_age
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS article_cache (
+                    url_key TEXT PRIMARY KEY,
+                    url TEXT,
+                    content TEXT,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetch_time REAL,
+                    checked_at REAL
+                )
+            """)
+            conn.commit()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """按 URL 查缓存，返回记录（含 ``fresh`` 字段）；没有时返回 ``None``"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute("""
+                    SELECT url, content, etag, last_modified, fetch_time, checked_at
+                    FROM article_cache WHERE url_key = ?
+                """, (normalize_url(url),)).fetchone()
+        except sqlite3.Error as e:
+            print(f"读取正文缓存失败: {e}")
+            return None
+        if not row:
+            return None
+        return {
+            'url': row[0],
+            'content': row[1],
+            'etag': row[2],
+            'last_modified': row[3],
+            'fetch_time': row[4],
+            'checked_at': row[5],
+            'fresh': time.time() - (row[5] or 0) < self.max_age,
+        }
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """根据缓存记录生成条件请求头"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, content: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        """写入 / 更新一篇文章的正文"""
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO article_cache
+                    (url_key, url, content, etag, last_modified, fetch_time, checked_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (normalize_url(url), url, content, etag, last_modified, now, now))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"写入正文缓存失败: {e}")
+
+    def touch(self, url: str) -> None:
+        """条件请求返回 304 后刷新检查时间"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("UPDATE article_cache SET checked_at = ? WHERE url_key = ?",
+                             (time.time(), normalize_url(url)))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"更新正文缓存失败: {e}")
+
+    def record(self, outcome: str) -> None:
+        """记一次命中 / 复验 / 未命中（``'hits'`` / ``'revalidated'`` / ``'misses'``，线程安全）"""
+        with self._stats_lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
@@ -0,0 +1,237 @@
+"""API 响应缓存 — 按端点设置 TTL 的 LRU 内存缓存 + 可选 SQLite 落盘。
+
+麦蕊的大部分数据一天内不会变（日K线、十大股东、股票列表），但之前每次
+``_request`` 都直接打网络。这里按端点前缀配置过期策略：
+
+- ``hsrl/ssjy`` 实时行情：几秒
+- ``hszbl/fsjy`` / ``hsrl/kline`` K线：到下一个交易日收盘后失效（按交易日历，跳过节假日）
+- ``hscp/sdgd`` 十大股东 / ``hslt/list`` 股票列表：数周
+
+内存层用 ``OrderedDict`` 做 LRU 淘汰；开启落盘后，跨进程（TUI 反复刷新、
+同一天多次 ``python main.py``）也能命中，静态数据不再走网络。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .trade_calendar import end_of_trading_day
+
+Ttl = Union[float, Callable[[float], float]]
+
+
+class CachePolicy:
+    """单个端点前缀的缓存策略"""
+
+    def __init__(self, prefix: str, ttl: Ttl, persist: bool = True):
+        """
+        Args:
+            prefix: 端点前缀，如 ``hszbl/fsjy``
+            ttl: 秒数，或接收当前时间戳、返回过期时间戳的函数
+            persist: 是否写入磁盘（实时行情这类秒级数据没必要落盘）
+        """
+        self.prefix = prefix
+        self.ttl = ttl
+        self.persist = persist
+
+    def expires_at(self, now: float) -> float:
+        if callable(self.ttl):
+            return self.ttl(now)
+        return now + self.ttl
+
+
+WEEK = 7 * 24 * 3600
+
+DEFAULT_POLICIES: List[CachePolicy] = [
+    CachePolicy("hsrl/ssjy", 5, persist=False),
+    CachePolicy("hszbl/fsjy", end_of_trading_day),
+    CachePolicy("hsrl/kline", end_of_trading_day),
+    CachePolicy("hscp/sdgd", 2 * WEEK),
+    CachePolicy("hslt/list", 2 * WEEK),
+]
+
+
+class ResponseCache:
+    """按端点 TTL 过期的 LRU 响应缓存（线程安全）"""
+
+    def __init__(self, policies: Optional[List[CachePolicy]] = None,
+                 max_entries: int = 2048, db_path: Optional[str] = None):
+        """
+        Args:
+            policies: 缓存策略列表，未命中任何前缀的端点不缓存
+            max_entries: 内存中最多保留的条目数，超出后淘汰最久未使用的
+            db_path: SQLite 文件路径；为 ``None`` 时只用内存
+        """
+        self.policies = policies if policies is not None else DEFAULT_POLICIES
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if db_path:
+            dirname = os.path.dirname(db_path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            self._init_db()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    endpoint TEXT,
+                    value TEXT,
+                    expires_at REAL
+                )
+            """)
+            conn.commit()
+
+    def policy_for(self, endpoint: str) -> Optional[CachePolicy]:
+        """按前缀匹配端点对应的缓存策略"""
+        for policy in self.policies:
+            if endpoint.startswith(policy.prefix):
+                return policy
+        return None
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        if not params:
+            return endpoint
+        return f"{endpoint}?{json.dumps(params, sort_keys=True, ensure_ascii=False)}"
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[bool, Any]:
+        """查询缓存
+
+        Returns:
+            Tuple[bool, Any]: ``(是否命中, 缓存值)``
+        """
+        policy = self.policy_for(endpoint)
+        if policy is None:
+            return False, None
+
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+
+        if self.db_path and policy.persist:
+            entry = self._load_from_disk(key, now)
+            if entry is not None:
+                with self._lock:
+                    self._store(key, entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                return True, entry[1]
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def set(self, endpoint: str, params: Optional[Dict], value: Any) -> None:
+        """写入缓存；空响应（通常意味着请求失败）不缓存"""
+        policy = self.policy_for(endpoint)
+        if policy is None or not value:
+            return
+
+        key = self.make_key(endpoint, params)
+        expires_at = policy.expires_at(time.time())
+        with self._lock:
+            self._store(key, (expires_at, value))
+
+        if self.db_path and policy.persist:
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute("""
+                        INSERT OR REPLACE INTO response_cache
+                        (cache_key, endpoint, value, expires_at)
+                        VALUES (?, ?, ?, ?)
+                    """, (key, endpoint, json.dumps(value, ensure_ascii=False), expires_at))
+                    conn.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                print(f"写入响应缓存失败 ({endpoint}): {e}")
+
+    def _store(self, key: str, entry: Tuple[float, Any]) -> None:
+        """写入内存层并按 LRU 淘汰（调用方持锁）"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load_from_disk(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM response_cache WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"读取响应缓存失败: {e}")
+            return None
+        if not row or row[1] <= now:
+            return None
+        return row[1], json.loads(row[0])
+
+    def clear(self) -> None:
+        """清空内存层和磁盘层"""
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("DELETE FROM response_cache")
+                conn.commit()
+
+    def purge_expired(self) -> int:
+        """删除磁盘上已过期的条目，返回删除条数"""
+        if not self.db_path:
+            return 0
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'entries': len(self._entries),
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> ResponseCache:
+    """进程内共享的默认缓存
+
+    TUI 每次刷新都会新建 ``MaiRuiStockAPI``，共享同一个缓存才能命中。
+    落盘路径取 ``MAIRUI_CACHE_DB``（默认 ``data/api_cache.db``），
+    设为空字符串则只用内存。
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            db_path = os.getenv("MAIRUI_CACHE_DB", "data/api_cache.db") or None
+            _default_cache = ResponseCache(db_path=db_path)
+        return _default_cache
@@ -1,9 +1,13 @@
 import sqlite3
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 import json
 import os
 
+from .dedup import NewsDeduplicator
+from .fts import build_match_query, tokenize
+from .news_watermarks import parse_news_time
+
 class DatabaseManager:
     """数据库管理器"""
     
@@ -19,8 +23,11 @@ class DatabaseManager:
             os.makedirs(dirname, exist_ok=True)
 
         self.db_path = db_path
+        self.fts_enabled = False
         self._init_db()
         self._migrate_db()
+        # 新闻近似去重（指纹表与新闻同库）
+        self.news_dedup = NewsDeduplicator(db_path)
     
     def _init_db(self):
         """初始化数据库表"""
@@ -78,6 +85,24 @@ class DatabaseManager:
                 print(f"警告: news_data 已有重复行，无法创建去重索引 ({e})；"
                       f"INSERT OR REPLACE 将退化为纯 INSERT。")
             
+            # 新闻全文索引（FTS5）：title / content 是 fts.tokenize 切好的二元组，
+            # rowid 对应 news_data.id。SQLite 没编译 FTS5 时退回 LIKE 检索。
+            cursor.execute("""
+                SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'
+            """)
+            fts_existed = cursor.fetchone() is not None
+            try:
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS news_fts
+                    USING fts5(title, content)
+                """)
+                self.fts_enabled = True
+            except sqlite3.OperationalError as e:
+                print(f"警告: SQLite 不支持 FTS5 ({e})，新闻检索退化为 LIKE 扫表。")
+                self.fts_enabled = False
+            if self.fts_enabled and not fts_existed:
+                self._rebuild_news_fts(cursor)
+            
             # 创建股票基本信息表
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS stock_info (
@@ -91,6 +116,16 @@ class DatabaseManager:
             
             conn.commit()
     
+    @staticmethod
+    def _rebuild_news_fts(cursor) -> None:
+        """用 news_data 现有数据重建全文索引（首次建索引时调用）"""
+        cursor.execute("DELETE FROM news_fts")
+        cursor.execute("SELECT id, title, content FROM news_data")
+        rows = [(row[0], tokenize(row[1]), tokenize(row[2])) for row in cursor.fetchall()]
+        cursor.executemany(
+            "INSERT INTO news_fts (rowid, title, content) VALUES (?, ?, ?)", rows
+        )
+
     def _migrate_db(self):
         """数据库迁移"""
         with sqlite3.connect(self.db_path) as conn:
@@ -175,13 +210,48 @@ class DatabaseManager:
             ))
             conn.commit()
     
+    @staticmethod
+    def _normalize_news_time(value: Any) -> Any:
+        """新闻时间统一存成 ``YYYY-MM-DD HH:MM:SS``（解析不了的原样保存）"""
+        timestamp = parse_news_time(value)
+        if timestamp is None:
+            return value
+        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
     def save_news(self, news_list: List[Dict[str, Any]], stock_code: str = None):
-        """保存新闻数据"""
+        """保存新闻数据
+
+        与该股票（大盘新闻为 ``stock_code=None``）已入库新闻近似重复的条目不再写入；
+        但标题、时间都相同的同一条新闻原地更新（如重新抓到了更完整的正文）。
+        新闻时间统一成 ``YYYY-MM-DD HH:MM:SS``，全文索引同步更新。
+        去重指纹与新闻在同一个事务里写入，写入失败时一起回滚。
+        """
+        fresh = self.news_dedup.find_new(news_list, stock_code)
+        fresh_ids = {id(news) for news, _ in fresh}
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             for news in news_list:
+                news_time = self._normalize_news_time(news.get('time'))
+                # 唯一索引 (stock_code, title, news_time) 对 NULL 的 stock_code（大盘新闻）
+                # 不生效，INSERT OR REPLACE 会重复插入，所以先按键查已有行、原地更新
+                cursor.execute("""
+                    SELECT id FROM news_data
+                    WHERE stock_code IS ? AND title IS ? AND news_time IS ?
+                """, (stock_code, news.get('title'), news_time))
+                existing = cursor.fetchone()
+                if existing is not None:
+                    old_id = existing[0]
+                    cursor.execute("""
+                        UPDATE news_data SET content = ?, source = ?, fetch_time = ?, url = ?
+                        WHERE id = ?
+                    """, (news.get('content'), news.get('source'),
+                          datetime.now().isoformat(), news.get('url'), old_id))
+                    self._index_news_fts(cursor, old_id, news)
+                    continue
+                if id(news) not in fresh_ids:
+                    continue
                 cursor.execute("""
-                    INSERT OR REPLACE INTO news_data 
+                    INSERT INTO news_data 
                     (stock_code, title, content, source, news_time, fetch_time, url)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
@@ -189,14 +259,109 @@ class DatabaseManager:
                     news.get('title'),
                     news.get('content'),
                     news.get('source'),
-                    news.get('time'),
+                    news_time,
                     datetime.now().isoformat(),
                     news.get('url')
                 ))
+                self._index_news_fts(cursor, cursor.lastrowid, news)
+            self.news_dedup.record(conn, stock_code, fresh)
             conn.commit()
+        self.news_dedup.register(stock_code, fresh)
+
+    def _index_news_fts(self, cursor, rowid: int, news: Dict[str, Any]) -> None:
+        """写入（或替换）``news_data`` 某一行的全文索引，与实际写入的行保持一致"""
+        if not self.fts_enabled:
+            return
+        cursor.execute("DELETE FROM news_fts WHERE rowid = ?", (rowid,))
+        cursor.execute("""
+            INSERT INTO news_fts (rowid, title, content) VALUES (?, ?, ?)
+        """, (rowid, tokenize(news.get('title')), tokenize(news.get('content'))))
+
+    def save_news_by_stock(self, news_list: List[Dict[str, Any]]) -> Dict[str, int]:
+        """把打过股票标签（``stocks`` 字段）的新闻按提到的股票分别入库
+
+        Returns:
+            Dict[str, int]: 每只股票分到的新闻条数
+        """
+        by_stock: Dict[str, List[Dict[str, Any]]] = {}
+        for news in news_list:
+            for code in news.get('stocks') or []:
+                by_stock.setdefault(code, []).append(news)
+        for code, items in by_stock.items():
+            self.save_news(items, code)
+        return {code: len(items) for code, items in by_stock.items()}
+
+    def search_news(self, query: str, code: Optional[str] = None,
+                    since: Optional[Union[str, datetime]] = None,
+                    limit: int = 20) -> List[Dict[str, Any]]:
+        """全文检索已入库的新闻
+
+        Args:
+            query: 检索词，多个词用空格分隔（AND）
+            code: 只查某只股票的新闻（大盘新闻不含在内）
+            since: 只查这个时间之后的新闻（``datetime`` 或可解析的时间字符串）
+            limit: 最多返回的条数
+
+        Returns:
+            List[Dict[str, Any]]: 按相关度排序（标题命中权重更高）的新闻，
+            每条含 code/title/content/source/time/url/score；走 ``LIKE``
+            退化路径时按时间倒序、``score`` 为 ``None``
+        """
+        filters, params = [], []
+        if code:
+            filters.append("n.stock_code = ?")
+            params.append(code)
+        if since:
+            filters.append("n.news_time >= ?")
+            params.append(self._normalize_news_time(since))
+
+        match = build_match_query(query) if self.fts_enabled else None
+        if match is not None:
+            sql = f"""
+                SELECT n.stock_code, n.title, n.content, n.source, n.news_time, n.url,
+                       bm25(news_fts, 3.0, 1.0) AS rank
+                FROM news_fts JOIN news_data n ON n.id = news_fts.rowid
+                WHERE news_fts MATCH ? {''.join(f' AND {f}' for f in filters)}
+                ORDER BY rank
+                LIMIT ?
+            """
+            params = [match] + params + [limit]
+        else:
+            terms = query.split()
+            if not terms:
+                return []
+            filters = [f"(n.title LIKE ? OR n.content LIKE ?)" for _ in terms] + filters
+            params = [p for term in terms for p in (f"%{term}%", f"%{term}%")] + params
+            sql = f"""
+                SELECT n.stock_code, n.title, n.content, n.source, n.news_time, n.url, NULL
+                FROM news_data n
+                WHERE {' AND '.join(filters)}
+                ORDER BY n.news_time DESC
+                LIMIT ?
+            """
+            params.append(limit)
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        return [
+            {
+                'code': row[0],
+                'title': row[1],
+                'content': row[2],
+                'source': row[3],
+                'time': row[4],
+                'url': row[5],
+                'score': -row[6] if row[6] is not None else None,
+            }
+            for row in rows
+        ]
     
     def save_stock_info(self, stock_info: Dict[str, Any]):
         """保存股票基本信息"""
+        # 股票池里查不到时 get_stock_info 返回的是占位信息，不落库，
+        # 免得覆盖 / 污染 stock_info 表里的真实数据
+        if str(stock_info.get('name') or '').startswith('未知股票_'):
+            return
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -0,0 +1,292 @@
+"""新闻近似去重 — 字符 shingle 上的 SimHash + 分段索引。
+
+同一条新闻会分别从 Tanshu、新浪滚动 feed、新浪首页和个股新闻页抓到，
+标题常有细微差别（“涨停”/“封板”、加个来源前缀、全角半角标点不同），
+``news_data`` 的唯一索引只能挡住 ``(stock_code, title, news_time)`` 完全相同的行。
+
+- 指纹：标题 + 正文开头归一化（去空白标点、统一大小写）后取字符 2-gram，
+  按出现次数加权算 64 位 SimHash；中文不用分词，字符 n-gram 就够稳
+- 标题够长时另算一个标题指纹，应对只有标题 / 摘要的来源
+- 判重：整体指纹海明距离 ≤ 3 或标题指纹 ≤ 6 视为同一条
+- 索引：64 位切成 ``threshold + 1`` 段，近似重复至少有一段完全相同（抽屉原理），
+  只和同段的候选比较
+- 落盘：``NewsDeduplicator`` 把指纹存进 SQLite（默认与分析结果同库，
+  ``news_fingerprints`` 表），入库前跨运行判重；超过 ``max_age`` 的指纹启动时清理。
+  指纹和新闻在同一个事务里写入，新闻写入失败时指纹一并回滚，不会误判为重复
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FINGERPRINT_BITS = 64
+DEFAULT_THRESHOLD = 3
+# 标题短、特征少，改一两个字海明距离就到 4~10，而不相关的标题一般在 20 以上
+TITLE_THRESHOLD = 6
+SHINGLE_SIZE = 2
+# 参与指纹的正文长度：不同来源的正文完整度差别很大（摘要 / 全文），只看开头
+CONTENT_PREFIX = 200
+# 标题单独判重的最短长度（归一化后）；太短的标题（“早间要闻”）每天都一样
+MIN_TITLE_LENGTH = 12
+
+_NOISE = re.compile(r'[\s\W_]+', re.UNICODE)
+_MASK = (1 << FINGERPRINT_BITS) - 1
+# 全角 ASCII（！到～）→ 半角
+_FULLWIDTH = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+
+
+def normalize_text(text: str) -> str:
+    """去掉空白和标点、统一小写（全角字母数字先转半角）"""
+    text = (text or '').translate(_FULLWIDTH)
+    return _NOISE.sub('', text).lower()
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str, shingle: int = SHINGLE_SIZE) -> int:
+    """字符 n-gram 加权 SimHash（64 位无符号整数）；空文本返回 0"""
+    text = normalize_text(text)
+    if not text:
+        return 0
+    if len(text) <= shingle:
+        features = Counter([text])
+    else:
+        features = Counter(text[i:i + shingle] for i in range(len(text) - shingle + 1))
+    weights = [0] * FINGERPRINT_BITS
+    for feature, count in features.items():
+        h = _hash64(feature)
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def news_fingerprint(news: Dict) -> Tuple[int, int]:
+    """一条新闻的指纹 ``(标题 + 正文开头, 标题)``
+
+    有的来源只有标题（新浪首页）或只有摘要，和全文版本的整体指纹相差较大，
+    所以标题足够长时再单独算一个标题指纹，任一命中即视为重复；标题太短时为 0。
+    """
+    title = news.get('title') or ''
+    content = news.get('content') or ''
+    if content == title:  # 首页抓取等只有标题的来源
+        content = ''
+    full = simhash(f"{title} {content[:CONTENT_PREFIX]}")
+    title_only = simhash(title) if len(normalize_text(title)) >= MIN_TITLE_LENGTH else 0
+    return full, title_only
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """SimHash 分段索引：``find`` 返回海明距离在阈值内的已有指纹"""
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        bands = threshold + 1
+        width = FINGERPRINT_BITS // bands
+        self._bands: List[Tuple[int, int]] = [
+            (i * width, width if i < bands - 1 else FINGERPRINT_BITS - i * width)
+            for i in range(bands)
+        ]
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _keys(self, fingerprint: int) -> Iterable[Tuple[int, int]]:
+        for i, (shift, width) in enumerate(self._bands):
+            yield i, fingerprint >> shift & ((1 << width) - 1)
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """返回一个近似重复的已有指纹；没有时返回 ``None``"""
+        for i, key in self._keys(fingerprint):
+            for candidate in self._buckets[i].get(key, ()):
+                if hamming(candidate, fingerprint) <= self.threshold:
+                    return candidate
+        return None
+
+    def add(self, fingerprint: int) -> None:
+        for i, key in self._keys(fingerprint):
+            self._buckets[i].setdefault(key, []).append(fingerprint)
+        self._size += 1
+
+
+class NewsIndex:
+    """整体指纹 + 标题指纹两个 :class:`SimHashIndex`，任一命中即为重复"""
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD,
+                 title_threshold: int = TITLE_THRESHOLD):
+        self.full = SimHashIndex(threshold)
+        self.title = SimHashIndex(title_threshold)
+
+    def __len__(self) -> int:
+        return len(self.full)
+
+    def seen(self, fingerprints: Tuple[int, int]) -> bool:
+        full, title = fingerprints
+        return bool(
+            (full and self.full.find(full) is not None)
+            or (title and self.title.find(title) is not None)
+        )
+
+    def add(self, fingerprints: Tuple[int, int]) -> None:
+        full, title = fingerprints
+        if full:
+            self.full.add(full)
+        if title:
+            self.title.add(title)
+
+
+def dedup_news(news_list: List[Dict], threshold: int = DEFAULT_THRESHOLD) -> List[Dict]:
+    """批内去重：保留每组近似重复新闻中的第一条（保持原顺序）"""
+    index = NewsIndex(threshold)
+    unique = []
+    for news in news_list:
+        fingerprints = news_fingerprint(news)
+        if index.seen(fingerprints):
+            continue
+        index.add(fingerprints)
+        unique.append(news)
+    return unique
+
+
+def _to_signed(value: int) -> int:
+    # SQLite INTEGER 是有符号 64 位
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value & _MASK
+
+
+class NewsDeduplicator:
+    """跨运行的新闻近似去重（指纹落盘），按 ``stock_code`` 分组
+
+    同一条新闻挂在不同股票下各保留一份；大盘新闻 ``stock_code`` 为 ``None``。
+    """
+
+    def __init__(self, db_path: str = "data/stock_analysis.db",
+                 threshold: int = DEFAULT_THRESHOLD, max_age: float = 30 * 86400):
+        """
+        Args:
+            db_path: SQLite 文件路径（默认与 DatabaseManager 同库）
+            threshold: 海明距离阈值
+            max_age: 指纹保留的秒数，更早的启动时清理
+        """
+        dirname = os.path.dirname(db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.db_path = db_path
+        self.threshold = threshold
+        self.max_age = max_age
+        self._indexes: Dict[str, NewsIndex] = {}
+        self._lock = threading.Lock()
+        self.duplicates = 0
+        self._load()
+
+    @staticmethod
+    def _scope(stock_code: Optional[str]) -> str:
+        return stock_code or ''
+
+    def _index(self, scope: str) -> NewsIndex:
+        index = self._indexes.get(scope)
+        if index is None:
+            index = self._indexes[scope] = NewsIndex(self.threshold)
+        return index
+
+    def _load(self) -> None:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS news_fingerprints (
+                        scope TEXT,
+                        fingerprint INTEGER,
+                        title_fingerprint INTEGER,
+                        title TEXT,
+                        created_at REAL
+                    )
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_news_fingerprints_created
+                    ON news_fingerprints(created_at)
+                """)
+                conn.execute("DELETE FROM news_fingerprints WHERE created_at < ?",
+                             (time.time() - self.max_age,))
+                conn.commit()
+                rows = conn.execute(
+                    "SELECT scope, fingerprint, title_fingerprint FROM news_fingerprints"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"读取新闻指纹失败: {e}")
+            return
+        for scope, full, title in rows:
+            self._index(scope).add((_to_unsigned(full or 0), _to_unsigned(title or 0)))
+
+    def find_new(self, news_list: List[Dict],
+                 stock_code: Optional[str] = None) -> List[Tuple[Dict, Tuple[int, int]]]:
+        """挑出与已登记新闻（及本批前面的新闻）都不近似重复的条目
+
+        只判断、不登记：调用方把新闻入库时用 :meth:`record` 在同一个事务里写指纹，
+        提交成功后再 :meth:`register` 进内存索引。
+
+        Returns:
+            List[Tuple[Dict, Tuple[int, int]]]: ``(新闻, 指纹)``，保持原顺序
+        """
+        batch = NewsIndex(self.threshold)
+        fresh = []
+        with self._lock:
+            index = self._index(self._scope(stock_code))
+            for news in news_list:
+                fingerprints = news_fingerprint(news)
+                if index.seen(fingerprints) or batch.seen(fingerprints):
+                    self.duplicates += 1
+                    continue
+                batch.add(fingerprints)
+                fresh.append((news, fingerprints))
+        return fresh
+
+    def record(self, conn: sqlite3.Connection, stock_code: Optional[str],
+               entries: Sequence[Tuple[Dict, Tuple[int, int]]]) -> None:
+        """在调用方的事务里写入 :meth:`find_new` 返回条目的指纹（由调用方提交）"""
+        scope = self._scope(stock_code)
+        now = time.time()
+        rows = [
+            (scope, _to_signed(full), _to_signed(title), news.get('title'), now)
+            for news, (full, title) in entries if full or title
+        ]
+        if rows:
+            conn.executemany("""
+                INSERT INTO news_fingerprints
+                (scope, fingerprint, title_fingerprint, title, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+
+    def register(self, stock_code: Optional[str],
+                 entries: Sequence[Tuple[Dict, Tuple[int, int]]]) -> None:
+        """事务提交后把指纹加入内存索引"""
+        with self._lock:
+            index = self._index(self._scope(stock_code))
+            for _, fingerprints in entries:
+                if any(fingerprints):
+                    index.add(fingerprints)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'fingerprints': sum(len(index) for index in self._indexes.values()),
+                'duplicates': self.duplicates,
+            }
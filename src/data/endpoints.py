@@ -0,0 +1,196 @@
+"""主备主机选择器 — 按延迟 / 错误率路由，失败过多时熔断。
+
+之前 ``MaiRuiStockAPI`` 和 ``NewsDataFetcher`` 每次都先打
+``api.mairui.club``，失败了才换 ``api1.mairui.club``：主站挂掉时每个请求
+都要先白等一次。这里为每个主机记录指数加权的延迟和错误率：
+
+- 健康（closed）：按 "延迟 × 错误惩罚" 从快到慢排序
+- 连续失败达到阈值 → 熔断（open），冷却期内排到最后
+- 冷却期过后 → 半开（half-open），放行一个探测请求；成功即恢复。
+  探测请求因为其他异常中断（调用方 :meth:`EndpointSelector.release`），
+  或超过 ``probe_timeout`` 仍没有结果时，放行下一个探测
+- 排在后面的健康主机长时间没被用到时，也会被提到前面重新测一次速，
+  避免主站恢复后因为历史分数一直排不上
+
+同一数据源的多个客户端共享一个选择器（``get_endpoint_selector``），
+主站故障时第一个请求踩坑，后续请求直接走备用站。
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class HostHealth:
+    """单个主机的健康状态"""
+
+    __slots__ = ('host', 'latency', 'error_rate', 'consecutive_failures',
+                 'state', 'opened_at', 'probing', 'probe_started', 'requests',
+                 'failures', 'last_attempt')
+
+    def __init__(self, host: str):
+        self.host = host
+        self.latency: Optional[float] = None  # EWMA 延迟（秒），未测过为 None
+        self.error_rate = 0.0                 # EWMA 错误率 0~1
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self.probe_started = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.last_attempt = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            'host': self.host,
+            'state': self.state,
+            'latency': self.latency,
+            'error_rate': self.error_rate,
+            'consecutive_failures': self.consecutive_failures,
+            'requests': self.requests,
+            'failures': self.failures,
+        }
+
+
+class EndpointSelector:
+    """带熔断的主机选择器（线程安全）"""
+
+    def __init__(self, hosts: Iterable[str], failure_threshold: int = 3,
+                 cooldown: float = 30.0, alpha: float = 0.3,
+                 error_penalty: float = 4.0, probe_interval: float = 300.0,
+                 probe_timeout: float = 60.0):
+        """
+        Args:
+            hosts: 候选主机（按偏好顺序，如主站在前）
+            failure_threshold: 连续失败多少次后熔断
+            cooldown: 熔断后多少秒放行探测请求
+            alpha: EWMA 平滑系数
+            error_penalty: 错误率对排序分数的放大倍数
+            probe_interval: 健康但未被选中的主机每隔多少秒重新测一次速
+            probe_timeout: 半开探测多少秒没有结果就视为丢失，允许重新探测
+        """
+        self.hosts = list(hosts)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self._health = {host: HostHealth(host) for host in self.hosts}
+        self._lock = threading.Lock()
+
+    def candidates(self) -> List[str]:
+        """返回本次请求应依次尝试的主机列表
+
+        熔断冷却已过的主机会被放在最前面做一次探测（同一时刻只放行一个探测），
+        其后是健康主机（已测速的按分数排序，未测过的按配置顺序），
+        最后是仍在熔断中的主机——全部熔断时也不至于无路可走。
+        """
+        now = time.time()
+        with self._lock:
+            probes, healthy, tripped = [], [], []
+            for order, host in enumerate(self.hosts):
+                health = self._health[host]
+                if health.state == CLOSED:
+                    healthy.append((health.latency is None, self._score(health), order, host))
+                elif self._probe_allowed(health, now):
+                    health.state = HALF_OPEN
+                    health.probing = True
+                    health.probe_started = now
+                    probes.append(host)
+                else:
+                    tripped.append((health.opened_at, host))
+            healthy.sort()
+            tripped.sort()
+            ordered = [h[-1] for h in healthy]
+            # 排在后面、很久没用过的已测速主机：本次提到最前面重新测速
+            for host in ordered[1:]:
+                health = self._health[host]
+                if health.latency is not None and now - health.last_attempt >= self.probe_interval:
+                    ordered.remove(host)
+                    ordered.insert(0, host)
+                    break
+            result = probes + ordered + [h[-1] for h in tripped]
+            if result:
+                self._health[result[0]].last_attempt = now
+            return result
+
+    def _probe_allowed(self, health: HostHealth, now: float) -> bool:
+        if health.probing:
+            # 探测请求迟迟没有回报结果（调用方异常退出），视为丢失
+            return now - health.probe_started >= self.probe_timeout
+        return now - health.opened_at >= self.cooldown
+
+    def _score(self, health: HostHealth) -> float:
+        latency = health.latency if health.latency is not None else 0.0
+        return latency * (1 + self.error_penalty * health.error_rate)
+
+    def record_success(self, host: str, latency: float) -> None:
+        with self._lock:
+            health = self._health.get(host)
+            if health is None:
+                return
+            health.requests += 1
+            health.latency = latency if health.latency is None else \
+                health.latency + self.alpha * (latency - health.latency)
+            health.error_rate *= (1 - self.alpha)
+            health.consecutive_failures = 0
+            if health.state != CLOSED:
+                print(f"{host} 探测成功，恢复使用")
+            health.state = CLOSED
+            health.probing = False
+
+    def record_failure(self, host: str, latency: Optional[float] = None) -> None:
+        with self._lock:
+            health = self._health.get(host)
+            if health is None:
+                return
+            health.requests += 1
+            health.failures += 1
+            health.error_rate += self.alpha * (1 - health.error_rate)
+            if latency is not None:
+                health.latency = latency if health.latency is None else \
+                    health.latency + self.alpha * (latency - health.latency)
+            health.consecutive_failures += 1
+            if health.state == HALF_OPEN or \
+                    health.consecutive_failures >= self.failure_threshold:
+                if health.state != OPEN:
+                    print(f"{host} 连续失败 {health.consecutive_failures} 次，暂停使用 {self.cooldown:.0f}s")
+                health.state = OPEN
+                health.opened_at = time.time()
+            health.probing = False
+
+    def release(self, host: str) -> None:
+        """请求因网络以外的原因中断（解析出错、``KeyboardInterrupt`` 等）
+
+        不计入健康度；若这是半开探测，退回熔断状态并立即允许下一次探测。
+        """
+        with self._lock:
+            health = self._health.get(host)
+            if health is None or not health.probing:
+                return
+            health.probing = False
+            if health.state == HALF_OPEN:
+                health.state = OPEN
+
+    def stats(self) -> List[Dict]:
+        with self._lock:
+            return [self._health[host].as_dict() for host in self.hosts]
+
+
+_selectors: Dict[str, EndpointSelector] = {}
+_selectors_lock = threading.Lock()
+
+
+def get_endpoint_selector(name: str, hosts: Iterable[str], **kwargs) -> EndpointSelector:
+    """按数据源名称获取进程内共享的选择器（首次调用时创建）"""
+    with _selectors_lock:
+        selector = _selectors.get(name)
+        if selector is None:
+            selector = _selectors[name] = EndpointSelector(hosts, **kwargs)
+        return selector
@@ -0,0 +1,187 @@
+"""新闻 → 股票实体链接 — 用股票池的名称 / 代码建 Aho-Corasick 自动机。
+
+市场分析第一步把 10 条原始新闻丢给 LLM，股票代码全靠模型自己“想”出来，
+新闻和它提到的股票之间没有任何关联。这里把股票池里所有股票的名称、
+去掉 ``ST`` / ``*ST`` 等前缀后的简称和 6 位代码建成一个 Aho-Corasick
+自动机，一次线性扫描就能找出一段文本提到的全部股票：
+
+- 重叠的命中按“最左最长”取舍：“中信证券”不会再额外算一次“中信”
+- 去掉前缀后的简称至少 ``MIN_VARIANT_LENGTH`` 个字（“*ST国华”不生成“国华”，
+  否则会命中“中国华电”）；不足 ``SHORT_NAME_LENGTH`` 的名称前后也不能紧挨汉字、字母、数字
+- 代码只在前后都不是数字、字母、汉字时才算（避免把“600000元”“000001股”
+  这类金额、数量当代码），紧跟在 ``SH`` / ``SZ`` / ``BJ`` 市场前缀后面的除外
+
+结果可用于给新闻打标签、按股票入库、给 LLM 提供候选股票，
+以及把市场新闻直接分发给提到的持仓股。
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .universe import StockUniverse
+
+# 名称前缀（风险警示 / 上市首日等），去掉后的简称也作为模式
+_NAME_PREFIXES = re.compile(r'^(\*?ST|S\*?ST|N|C|XD|XR|DR)\s*')
+# 太短的名称容易误命中，不作为模式
+MIN_NAME_LENGTH = 2
+# 去掉前缀后的简称的最短长度
+MIN_VARIANT_LENGTH = 3
+# 短于此长度的名称命中时同样要求前后独立成词
+SHORT_NAME_LENGTH = 3
+# 纯代码 / 短名称命中的前后不能紧挨这些字符（数字、字母、汉字）
+_WORD_CHAR = re.compile(r'[0-9A-Za-z０-９Ａ-Ｚａ-ｚ㐀-䶿一-鿿豈-﫿]')
+# 代码前允许紧挨的市场前缀，如 “SH600000”
+_MARKET_PREFIX = re.compile(r'(?<![0-9A-Za-z])(SH|SZ|BJ)$', re.IGNORECASE)
+
+
+def _code_boundary_ok(text: str, start: int, end: int) -> bool:
+    """纯代码命中是否独立成词（见模块说明）"""
+    if end < len(text) and _WORD_CHAR.match(text[end]):
+        return False
+    if start > 0 and _WORD_CHAR.match(text[start - 1]):
+        return bool(_MARKET_PREFIX.search(text[max(0, start - 3):start]))
+    return True
+
+
+def _short_name_boundary_ok(text: str, start: int, end: int) -> bool:
+    """短名称命中是否独立成词（前后都不是数字、字母、汉字）"""
+    return not (
+        (start > 0 and _WORD_CHAR.match(text[start - 1]))
+        or (end < len(text) and _WORD_CHAR.match(text[end]))
+    )
+
+
+class AhoCorasick:
+    """多模式串匹配自动机（构建 O(模式总长)，匹配 O(文本长度 + 命中数)）"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 每个状态上结束的模式：(模式长度, 值)
+        self._output: List[List[Tuple[int, str]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value: str) -> None:
+        """添加一个模式；命中时返回 ``value``"""
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        entry = (len(pattern), value)
+        if entry not in self._output[state]:
+            self._output[state].append(entry)
+        self._built = False
+
+    def build(self) -> None:
+        """计算失败指针（BFS），添加完所有模式后调用一次"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """逐个产出命中 ``(起始位置, 结束位置, 值)``，包含重叠命中"""
+        if not self._built:
+            self.build()
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                yield i - length + 1, i + 1, value
+
+
+class StockEntityLinker:
+    """股票实体链接器"""
+
+    def __init__(self, universe: StockUniverse):
+        self.universe = universe
+        self._automaton = AhoCorasick()
+        for entry in universe.entries():
+            code = entry['code']
+            self._automaton.add(code, code)
+            name = (entry.get('name') or '').replace(' ', '')
+            if len(name) >= MIN_NAME_LENGTH:
+                self._automaton.add(name, code)
+            variant = _NAME_PREFIXES.sub('', name)
+            if variant != name and len(variant) >= MIN_VARIANT_LENGTH:
+                self._automaton.add(variant, code)
+        self._automaton.build()
+
+    def _matches(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = []
+        for start, end, code in self._automaton.iter_matches(text):
+            matched = text[start:end]
+            if matched.isdigit():
+                if not _code_boundary_ok(text, start, end):
+                    continue
+            elif len(matched) < SHORT_NAME_LENGTH and not _short_name_boundary_ok(text, start, end):
+                continue
+            matches.append((start, end, code))
+        # 最左最长：按起点排序、同起点取最长，跳过与已选命中重叠的
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        selected, last_end = [], 0
+        for start, end, code in matches:
+            if start >= last_end:
+                selected.append((start, end, code))
+                last_end = end
+        return selected
+
+    def mentions(self, text: Optional[str]) -> Dict[str, int]:
+        """文本中提到的股票及次数（按首次出现顺序）"""
+        counts: Dict[str, int] = {}
+        for _, _, code in self._matches(text or ''):
+            counts[code] = counts.get(code, 0) + 1
+        return counts
+
+    def link(self, text: Optional[str]) -> List[str]:
+        """文本中提到的股票代码（按首次出现顺序去重）"""
+        return list(self.mentions(text))
+
+    def news_stocks(self, news: Dict) -> List[str]:
+        """一条新闻提到的股票（已打过标签的直接用 ``stocks`` 字段）"""
+        if 'stocks' in news:
+            return news['stocks']
+        return self.link(f"{news.get('title') or ''}\n{news.get('content') or ''}")
+
+    def tag_news(self, news_list: List[Dict]) -> List[Dict]:
+        """给每条新闻加上 ``stocks`` 字段（标题 + 正文提到的股票代码），返回新列表"""
+        return [{**news, 'stocks': self.news_stocks(news)} for news in news_list]
+
+    def route(self, news_list: List[Dict], codes: Iterable[str]) -> Dict[str, List[Dict]]:
+        """把新闻分发给它提到的股票：``{代码: [新闻, ...]}``（只含 ``codes`` 中的股票）"""
+        wanted = {code: [] for code in codes}
+        for news in news_list:
+            for code in self.news_stocks(news):
+                if code in wanted:
+                    wanted[code].append(news)
+        return wanted
+
+    def candidates(self, news_list: List[Dict], limit: int = 20) -> List[Tuple[str, int]]:
+        """新闻里被提到最多的股票 ``[(代码, 提及新闻数), ...]``，用于给 LLM 提供候选"""
+        counts: Dict[str, int] = {}
+        for news in news_list:
+            for code in self.news_stocks(news):
+                counts[code] = counts.get(code, 0) + 1
+        return sorted(counts.items(), key=lambda item: -item[1])[:limit]
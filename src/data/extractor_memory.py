@@ -0,0 +1,152 @@
+"""按站点记住正文容器选择器 — 先试上次命中的，失败再按默认顺序回退。
+
+``html_extract`` 对每个页面都按固定顺序试 6 个选择器；新闻源以新浪为主，
+绝大多数页面其实都命中同一个容器（``#artibody``），前面的扫描全是白做。
+这里按主机记录每个选择器的命中 / 未命中次数（SQLite，默认与分析结果同库，
+``extractor_selectors`` 表），给出该主机的选择器尝试顺序：
+
+- 净命中数（命中 - 未命中）为正的选择器按净命中数排在前面
+- 其余保持 ``CONTENT_SELECTORS`` 的默认顺序
+- 排第一的选择器没命中、其它选择器命中时记一次未命中，逐步让位
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from .html_extract import CONTENT_SELECTORS
+
+Selector = Tuple[str, str]
+
+
+def host_of(url: str) -> str:
+    """URL 的主机名（小写，去掉端口）"""
+    return (urlsplit(url).hostname or '').lower()
+
+
+class ExtractorMemory:
+    """站点 → 选择器命中统计（线程安全，读写都走内存，落盘用 SQLite）"""
+
+    def __init__(self, db_path: Optional[str] = "data/stock_analysis.db",
+                 selectors: Sequence[Selector] = CONTENT_SELECTORS):
+        """
+        Args:
+            db_path: SQLite 文件路径；``None`` 表示只在内存中学习
+            selectors: 默认的选择器顺序
+        """
+        if db_path:
+            dirname = os.path.dirname(db_path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+        self.db_path = db_path
+        self.selectors = list(selectors)
+        # host → {selector: [hits, misses]}
+        self._counts: Dict[str, Dict[Selector, List[int]]] = {}
+        self._lock = threading.Lock()
+        self.first_try_hits = 0
+        self.fallback_hits = 0
+        self.failures = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.db_path:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS extractor_selectors (
+                        host TEXT,
+                        attr TEXT,
+                        value TEXT,
+                        hits INTEGER DEFAULT 0,
+                        misses INTEGER DEFAULT 0,
+                        updated_at REAL,
+                        PRIMARY KEY (host, attr, value)
+                    )
+                """)
+                rows = conn.execute(
+                    "SELECT host, attr, value, hits, misses FROM extractor_selectors"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"读取选择器统计失败: {e}")
+            return
+        for host, attr, value, hits, misses in rows:
+            self._counts.setdefault(host, {})[(attr, value)] = [hits, misses]
+
+    def order(self, host: str) -> List[Selector]:
+        """该主机的选择器尝试顺序（学到的在前，其余按默认顺序）"""
+        with self._lock:
+            counts = self._counts.get(host)
+            if not counts:
+                return list(self.selectors)
+            scores = {sel: hits - misses for sel, (hits, misses) in counts.items()}
+        learned = sorted((sel for sel in self.selectors if scores.get(sel, 0) > 0),
+                         key=lambda sel: -scores[sel])
+        return learned + [sel for sel in self.selectors if sel not in learned]
+
+    def record(self, host: str, tried: Sequence[Selector], matched: Optional[Selector]) -> None:
+        """记录一次提取结果
+
+        Args:
+            host: 主机名
+            tried: 本次使用的尝试顺序（即 :meth:`order` 的结果）
+            matched: 命中的选择器；都没命中时为 ``None``
+        """
+        if not host or not tried:
+            return
+        first = tried[0]
+        changed = []
+        with self._lock:
+            counts = self._counts.setdefault(host, {})
+            if matched is None:
+                self.failures += 1
+            elif matched == first:
+                self.first_try_hits += 1
+            else:
+                self.fallback_hits += 1
+            if matched is not None:
+                counts.setdefault(matched, [0, 0])[0] += 1
+                changed.append(matched)
+            # 排第一的是学来的选择器，却由别的选择器命中：记未命中，让它逐步让位
+            # （整页都没有正文时不算，比如视频页）
+            if matched is not None and matched != first and first in counts:
+                counts[first][1] += 1
+                changed.append(first)
+            rows = [(host, sel[0], sel[1], counts[sel][0], counts[sel][1]) for sel in changed]
+        self._save(rows)
+
+    def _save(self, rows) -> None:
+        if not self.db_path or not rows:
+            return
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO extractor_selectors
+                    (host, attr, value, hits, misses, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, [row + (now,) for row in rows])
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"保存选择器统计失败: {e}")
+
+    def host_stats(self, host: str) -> Dict[str, Dict[str, int]]:
+        """某个主机各选择器的命中统计，如 ``{'id=artibody': {'hits': 12, 'misses': 0}}``"""
+        with self._lock:
+            return {
+                f"{attr}={value}": {'hits': hits, 'misses': misses}
+                for (attr, value), (hits, misses) in self._counts.get(host, {}).items()
+            }
+
+    def stats(self) -> Dict[str, int]:
+        """本次运行的统计：首选命中 / 回退命中 / 全部未命中 / 已学习的主机数"""
+        with self._lock:
+            return {
+                'first_try_hits': self.first_try_hits,
+                'fallback_hits': self.fallback_hits,
+                'failures': self.failures,
+                'hosts': len(self._counts),
+            }
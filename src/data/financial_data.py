@@ -1,96 +1,162 @@
 import os
-import tushare as ts
-from typing import List, Dict, Any
+import threading
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
+from .singleflight import get_singleflight, make_key
+from .tushare_scheduler import TushareScheduler, get_tushare_scheduler
+from .universe import to_ts_code
+
+# tushare / pandas 导入要几百毫秒，只在第一次真正请求或计算时加载
+if TYPE_CHECKING:
+    import pandas as pd
+    from .financial_store import FinancialStore
+
 # 加载环境变量
 load_dotenv()
 
 class FinancialDataFetcher:
     """财务数据获取器"""
     
-    def __init__(self, token: str = None):
+    def __init__(self, token: str = None, financial_store: Optional['FinancialStore'] = None,
+                 scheduler: Optional[TushareScheduler] = None):
         """初始化财务数据获取器，从环境变量加载Tushare token
         
         Args:
             token: API token，可选，若未提供则从环境变量TUSHARE_TOKEN获取
+            financial_store: 本地财务仓库；不传则使用默认仓库（与分析结果同库）
+            scheduler: Tushare 请求调度器；不传则使用进程内共享的调度器
         """
         self.token = token or os.getenv('TUSHARE_TOKEN')
         if not self.token:
             raise ValueError("请在.env文件中设置TUSHARE_TOKEN环境变量")
         
-        # 初始化Tushare API
-        ts.set_token(self.token)
-        self.api = ts.pro_api()
+        # Tushare API 在第一次请求时才初始化（见 ``api``）
+        self._api = None
+        self._api_lock = threading.Lock()
+        self.scheduler = scheduler or get_tushare_scheduler()
+        self._financial_store = financial_store
+
+    @property
+    def api(self):
+        """Tushare ``pro_api`` 客户端（首次访问时导入 tushare 并初始化）"""
+        if self._api is None:
+            with self._api_lock:
+                if self._api is None:
+                    import tushare as ts
+                    ts.set_token(self.token)
+                    self._api = ts.pro_api()
+        return self._api
+
+    # 同一次运行内相同的 Tushare 调用复用结果的时长（秒）
+    CALL_MEMO_TTL = 600
+
+    def _call(self, endpoint: str, **kwargs):
+        """调用 Tushare 接口（经调度器按接口的每分钟额度排队，限流时退避重试）
+
+        相同接口 + 相同参数的调用在 ``CALL_MEMO_TTL`` 内共享一次结果，
+        持仓股同时被市场扫描推荐时不会重复请求财务数据。
+
+        Args:
+            endpoint: 接口名，如 ``income`` / ``balancesheet``
+            **kwargs: 接口参数
+        """
+        def fetch():
+            return self.scheduler.call(endpoint, self._invoke, kwargs)
+
+        return get_singleflight().do(
+            make_key('tushare', endpoint, kwargs), fetch, ttl=self.CALL_MEMO_TTL
+        )
     
+    def _invoke(self, endpoint: str, **kwargs):
+        return getattr(self.api, endpoint)(**kwargs)
+
+    @property
+    def financial_store(self) -> 'FinancialStore':
+        """本地财务仓库（首次访问时创建默认仓库）"""
+        if self._financial_store is None:
+            from .financial_store import get_default_financial_store
+            self._financial_store = get_default_financial_store()
+        return self._financial_store
+
+    def _statement_records(self, statement: str, stock_code: str) -> List[Dict[str, Any]]:
+        """从本地仓库读取某只股票去年年初以来的报表（需要时先同步）"""
+        ts_code = to_ts_code(stock_code)
+        self.financial_store.ensure(self._call, statement, ts_code)
+        return self.financial_store.records(
+            statement, ts_code, start_period=f"{datetime.now().year - 1}0101"
+        )
+
+    def sync_financials(self) -> Dict[str, int]:
+        """批量同步最近几个报告期的全市场财务报表，返回 报表 → 写入行数"""
+        return self.financial_store.sync_all(self._call)
+
+    def get_ratios(self, stock_codes: Optional[Iterable[str]] = None) -> 'pd.DataFrame':
+        """一次算出多只股票（默认本地仓库里的全部股票）各报告期的财务指标
+
+        Args:
+            stock_codes: 股票代码；不传时先批量同步全市场，再对全部股票计算
+
+        Returns:
+            pd.DataFrame: 见 :func:`compute_ratios`
+        """
+        from .financial_ratios import compute_ratios
+        from .financial_store import STATEMENTS
+
+        if stock_codes is None:
+            self.sync_financials()
+            ts_codes = None
+        else:
+            ts_codes = list(dict.fromkeys(to_ts_code(code) for code in stock_codes))
+            for statement in STATEMENTS:
+                for ts_code in ts_codes:
+                    self.financial_store.ensure(self._call, statement, ts_code)
+        frames = {statement: self.financial_store.load(statement, ts_codes) for statement in STATEMENTS}
+        return compute_ratios(frames['income'], frames['balancesheet'],
+                              frames['cashflow'], frames['indicator'])
+
+    def get_financial_data_batch(self, stock_codes: Iterable[str]) -> Dict[str, dict]:
+        """批量获取多只股票最新一期的财务指标（一次计算），返回 股票代码 → 财务数据"""
+        from .financial_ratios import financial_data_by_code
+
+        codes = list(dict.fromkeys(stock_codes))
+        try:
+            by_ts_code = financial_data_by_code(self.get_ratios(codes),
+                                                [to_ts_code(code) for code in codes])
+        except Exception as e:
+            print(f"批量获取财务数据时出错: {str(e)}")
+            return {code: {} for code in codes}
+        return {code: by_ts_code.get(to_ts_code(code), {}) for code in codes}
+
     def get_financial_data(self, stock_code: str) -> dict:
-        """获取股票财务数据
+        """获取股票最新一期财务数据（读本地财务仓库，财报季之外不走网络）
         
         Args:
-            stock_code: 股票代码
+            stock_code: 股票代码（``600036`` / ``600036.SH`` 均可）
             
         Returns:
-            dict: 财务数据
+            dict: 财务数据（营收、净利润、毛利率、ROE 等，见 ``RATIO_COLUMNS``）
         """
-        try:
-            # 调用 tushare API 获取财务数据
-            df = self.api.income(
-                ts_code=stock_code,
-                start_date=(datetime.now().year - 1).__str__() + '0101',
-                end_date=datetime.now().strftime('%Y%m%d')
-            )
-            
-            if df.empty:
-                return {}
-            
-            # 获取最新一期财务数据
-            latest = df.iloc[0]
-            return {
-                'revenue': latest.get('revenue', 0),
-                'net_profit': latest.get('n_income', 0),
-                'gross_margin': latest.get('grossprofit_margin', 0),
-                'roe': latest.get('roe', 0),
-                'debt_ratio': latest.get('debt_to_assets', 0),
-                'current_ratio': latest.get('current_ratio', 0),
-                'inventory_turnover': latest.get('inv_turn', 0),
-                'receivables_turnover': latest.get('ar_turn', 0)
-            }
-        except Exception as e:
-            print(f"获取财务数据时出错: {str(e)}")
-            return {}
+        return self.get_financial_data_batch([stock_code])[stock_code]
     
     def get_income_statement(self, ts_code: str) -> List[Dict[str, Any]]:
         """获取利润表数据"""
-        df = self.api.income(
-            ts_code=ts_code,
-            start_date=(datetime.now().year - 1).__str__() + '0101',
-            end_date=datetime.now().strftime('%Y%m%d')
-        )
-        return df.to_dict('records')
+        return self._statement_records('income', ts_code)
     
     def get_balance_sheet(self, ts_code: str) -> List[Dict[str, Any]]:
         """获取资产负债表数据"""
-        df = self.api.balancesheet(
-            ts_code=ts_code,
-            start_date=(datetime.now().year - 1).__str__() + '0101',
-            end_date=datetime.now().strftime('%Y%m%d')
-        )
-        return df.to_dict('records')
+        return self._statement_records('balancesheet', ts_code)
     
     def get_cashflow(self, ts_code: str) -> List[Dict[str, Any]]:
         """获取现金流量表数据"""
-        df = self.api.cashflow(
-            ts_code=ts_code,
-            start_date=(datetime.now().year - 1).__str__() + '0101',
-            end_date=datetime.now().strftime('%Y%m%d')
-        )
-        return df.to_dict('records')
+        return self._statement_records('cashflow', ts_code)
     
     def get_forecast(self, ts_code: str) -> Dict[str, Any]:
         """获取业绩预告数据"""
-        df = self.api.forecast(
-            ts_code=ts_code,
+        df = self._call(
+            'forecast',
+            ts_code=to_ts_code(ts_code),
             start_date=(datetime.now().year).__str__() + '0101',
             end_date=datetime.now().strftime('%Y%m%d')
         )
@@ -98,8 +164,9 @@ class FinancialDataFetcher:
     
     def get_express(self, ts_code: str) -> Dict[str, Any]:
         """获取业绩快报数据"""
-        df = self.api.express(
-            ts_code=ts_code,
+        df = self._call(
+            'express',
+            ts_code=to_ts_code(ts_code),
             start_date=(datetime.now().year).__str__() + '0101',
             end_date=datetime.now().strftime('%Y%m%d')
         )
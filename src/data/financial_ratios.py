@@ -0,0 +1,224 @@
+"""财务指标引擎 — 把利润表 / 资产负债表 / 现金流量表按 ``(ts_code, end_date)``
+拼成一张宽表，对全部股票、全部报告期一次算出常用财务指标。
+
+之前 ``get_financial_data`` 从 ``income`` 里读 ``grossprofit_margin`` / ``roe`` /
+``debt_to_assets`` 等字段，利润表里根本没有这些列，LLM 看到的基本都是 0。
+这里全部用列运算（不逐行循环）：
+
+- 利润率：毛利率、净利率
+- 回报率：ROE（归母净利润 / 平均归母权益）、ROA（净利润 / 平均总资产）
+- 杠杆与流动性：资产负债率、流动比率、速动比率
+- 周转率：存货、应收账款、总资产周转率（分母取期末与上年末的平均值）
+- 现金流：经营现金流 / 净利润、自由现金流
+- 增长：营收 / 净利润同比（累计值对上年同期），环比（单季值对上一季度）
+
+A 股报表是年初至今的累计值，比率口径与 Tushare ``fina_indicator`` 一致（不年化）；
+算不出来的指标（缺字段、分母为 0）用 ``fina_indicator`` 的同名指标补齐。
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 报告期月日 → 上一个报告期（年份偏移, 月日）
+_PREVIOUS_QUARTER = {
+    '0331': (-1, '1231'),
+    '0630': (0, '0331'),
+    '0930': (0, '0630'),
+    '1231': (0, '0930'),
+}
+
+# 计算结果列 → 用来补缺的 fina_indicator 字段
+INDICATOR_FALLBACKS = {
+    'gross_margin': 'grossprofit_margin',
+    'net_margin': 'netprofit_margin',
+    'roe': 'roe',
+    'roa': 'roa',
+    'debt_ratio': 'debt_to_assets',
+    'current_ratio': 'current_ratio',
+    'quick_ratio': 'quick_ratio',
+    'inventory_turnover': 'inv_turn',
+    'receivables_turnover': 'ar_turn',
+    'asset_turnover': 'assets_turn',
+    'revenue_yoy': 'or_yoy',
+    'net_profit_yoy': 'netprofit_yoy',
+}
+
+RATIO_COLUMNS = (
+    'revenue', 'net_profit', 'gross_margin', 'net_margin', 'roe', 'roa',
+    'debt_ratio', 'current_ratio', 'quick_ratio', 'inventory_turnover',
+    'receivables_turnover', 'asset_turnover', 'ocf_to_net_profit', 'free_cashflow',
+    'revenue_yoy', 'net_profit_yoy', 'revenue_qoq', 'net_profit_qoq',
+)
+
+_KEYS = ['ts_code', 'end_date']
+
+
+def _numeric(df: Optional[pd.DataFrame], prefix: str = '') -> pd.DataFrame:
+    """只保留主键和数值列（非主键列转成 float，可加前缀避免重名）"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=_KEYS)
+    values = df.drop(columns=[c for c in df.columns if c in _KEYS or not _is_value_column(c)])
+    values = values.apply(pd.to_numeric, errors='coerce').add_prefix(prefix)
+    return pd.concat([df[_KEYS].astype(str), values], axis=1)
+
+
+def _is_value_column(name: str) -> bool:
+    return name not in ('ann_date', 'f_ann_date', 'report_type', 'update_flag', 'comp_type')
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    if name in df.columns:
+        return df[name].astype(float)
+    return pd.Series(np.nan, index=df.index)
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series, scale: float = 1.0) -> pd.Series:
+    """逐元素相除，分母为 0 / 缺失时得到 NaN"""
+    denominator = denominator.where(denominator != 0)
+    return numerator / denominator * scale
+
+
+def _growth(current: pd.Series, previous: pd.Series) -> pd.Series:
+    """增长率（%），分母取绝对值，上期由亏转盈时方向仍正确"""
+    return _ratio(current - previous, previous.abs(), 100.0)
+
+
+def _shifted_keys(end_dates: pd.Series, year_offset: int, month_day: Optional[str] = None) -> pd.Series:
+    years = end_dates.str[:4].astype(int) + year_offset
+    suffix = end_dates.str[4:] if month_day is None else month_day
+    return years.astype(str) + suffix
+
+
+def _previous_quarter_keys(end_dates: pd.Series) -> pd.Series:
+    month_day = end_dates.str[4:]
+    offsets = month_day.map(lambda md: _PREVIOUS_QUARTER.get(md, (0, None))[0])
+    suffixes = month_day.map(lambda md: _PREVIOUS_QUARTER.get(md, (0, ''))[1])
+    return (end_dates.str[:4].astype(int) + offsets).astype(str) + suffixes
+
+
+def _lookup(frame: pd.DataFrame, end_dates: pd.Series, columns: List[str]) -> pd.DataFrame:
+    """按 ``(ts_code, end_dates)`` 取同一股票其他报告期的值（找不到为 NaN）"""
+    indexed = frame.set_index(_KEYS)[columns]
+    keys = pd.MultiIndex.from_arrays([frame['ts_code'], end_dates])
+    return indexed.reindex(keys).set_axis(frame.index)
+
+
+def _average(frame: pd.DataFrame, column: str, prior_year_end: pd.DataFrame) -> pd.Series:
+    """期末与上年末的平均值；上年末缺失时用期末值"""
+    current = _column(frame, column)
+    previous = prior_year_end[column] if column in prior_year_end else current
+    return ((current + previous) / 2).fillna(current)
+
+
+def build_statement_frame(income: Optional[pd.DataFrame],
+                          balancesheet: Optional[pd.DataFrame],
+                          cashflow: Optional[pd.DataFrame],
+                          indicator: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """把各报表按 ``(ts_code, end_date)`` 外连接成一张宽表（``fina_indicator`` 字段加 ``ind_`` 前缀）"""
+    frame = _numeric(income)
+    for df, prefix in ((balancesheet, ''), (cashflow, ''), (indicator, 'ind_')):
+        part = _numeric(df, prefix)
+        part = part.drop(columns=[c for c in part.columns if c not in _KEYS and c in frame.columns])
+        frame = frame.merge(part, on=_KEYS, how='outer')
+    return frame.drop_duplicates(_KEYS).reset_index(drop=True)
+
+
+def compute_ratios(income: Optional[pd.DataFrame],
+                   balancesheet: Optional[pd.DataFrame],
+                   cashflow: Optional[pd.DataFrame],
+                   indicator: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """对全部股票、全部报告期计算财务指标
+
+    Args:
+        income / balancesheet / cashflow: 三大报表（``FinancialStore.load`` 的格式）
+        indicator: ``fina_indicator``，可选，用来补齐算不出来的指标
+
+    Returns:
+        pd.DataFrame: ``ts_code`` / ``end_date`` + ``RATIO_COLUMNS``，
+        按 ts_code、end_date 降序排列；百分比指标单位为 %
+    """
+    frame = build_statement_frame(income, balancesheet, cashflow, indicator)
+    if frame.empty:
+        return pd.DataFrame(columns=_KEYS + list(RATIO_COLUMNS))
+
+    end_dates = frame['end_date']
+    revenue = _column(frame, 'revenue').fillna(_column(frame, 'total_revenue'))
+    net_profit = _column(frame, 'n_income')
+    parent_profit = _column(frame, 'n_income_attr_p').fillna(net_profit)
+    frame['_revenue'] = revenue
+    frame['_net_profit'] = net_profit
+
+    # 上年末资产负债表（算平均余额）、上年同期 / 上一季度累计值（算增长）
+    balance_columns = [c for c in ('total_hldr_eqy_exc_min_int', 'total_assets',
+                                   'inventories', 'accounts_receiv') if c in frame.columns]
+    prior_year_end = _lookup(frame, _shifted_keys(end_dates, -1, '1231'), balance_columns)
+    same_period_last_year = _lookup(frame, _shifted_keys(end_dates, -1), ['_revenue', '_net_profit'])
+    previous_quarter = _lookup(frame, _previous_quarter_keys(end_dates), ['_revenue', '_net_profit'])
+
+    # 单季值 = 本期累计 - 上一季度累计（一季度本身就是单季）
+    is_q1 = end_dates.str[4:] == '0331'
+    for name in ('_revenue', '_net_profit'):
+        frame[f'{name}_q'] = frame[name].where(is_q1, frame[name] - previous_quarter[name])
+    previous_single = _lookup(frame, _previous_quarter_keys(end_dates), ['_revenue_q', '_net_profit_q'])
+
+    result = frame[_KEYS].copy()
+    result['revenue'] = revenue
+    result['net_profit'] = net_profit
+    result['gross_margin'] = _ratio(revenue - _column(frame, 'oper_cost'), revenue, 100.0)
+    result['net_margin'] = _ratio(net_profit, revenue, 100.0)
+    result['roe'] = _ratio(parent_profit, _average(frame, 'total_hldr_eqy_exc_min_int', prior_year_end), 100.0)
+    result['roa'] = _ratio(net_profit, _average(frame, 'total_assets', prior_year_end), 100.0)
+    result['debt_ratio'] = _ratio(_column(frame, 'total_liab'), _column(frame, 'total_assets'), 100.0)
+    current_liab = _column(frame, 'total_cur_liab')
+    current_assets = _column(frame, 'total_cur_assets')
+    result['current_ratio'] = _ratio(current_assets, current_liab)
+    result['quick_ratio'] = _ratio(current_assets - _column(frame, 'inventories').fillna(0), current_liab)
+    result['inventory_turnover'] = _ratio(_column(frame, 'oper_cost'),
+                                          _average(frame, 'inventories', prior_year_end))
+    result['receivables_turnover'] = _ratio(revenue, _average(frame, 'accounts_receiv', prior_year_end))
+    result['asset_turnover'] = _ratio(revenue, _average(frame, 'total_assets', prior_year_end))
+    operating_cash = _column(frame, 'n_cashflow_act')
+    result['ocf_to_net_profit'] = _ratio(operating_cash, net_profit)
+    result['free_cashflow'] = _column(frame, 'free_cashflow').fillna(
+        operating_cash - _column(frame, 'c_pay_acq_const_fiolta'))
+    result['revenue_yoy'] = _growth(revenue, same_period_last_year['_revenue'])
+    result['net_profit_yoy'] = _growth(net_profit, same_period_last_year['_net_profit'])
+    result['revenue_qoq'] = _growth(frame['_revenue_q'], previous_single['_revenue_q'])
+    result['net_profit_qoq'] = _growth(frame['_net_profit_q'], previous_single['_net_profit_q'])
+
+    for column, fallback in INDICATOR_FALLBACKS.items():
+        result[column] = result[column].fillna(_column(frame, f'ind_{fallback}'))
+    result[list(RATIO_COLUMNS)] = result[list(RATIO_COLUMNS)].replace([np.inf, -np.inf], np.nan)
+
+    return result.sort_values(_KEYS, ascending=[True, False]).reset_index(drop=True)
+
+
+def latest_ratios(ratios: pd.DataFrame) -> pd.DataFrame:
+    """每只股票最新一期（有营收或净利润）的指标，按 ts_code 索引"""
+    if ratios.empty:
+        return ratios.set_index('ts_code')
+    reported = ratios[ratios['revenue'].notna() | ratios['net_profit'].notna()]
+    latest = reported.sort_values('end_date').drop_duplicates('ts_code', keep='last')
+    return latest.set_index('ts_code')
+
+
+def to_financial_data(row: Optional[pd.Series]) -> Dict:
+    """把一行指标转成提示词用的 ``financial_data`` 字典（NaN → ``None``，保留两位小数）"""
+    if row is None:
+        return {}
+    data: Dict = {'report_period': row.get('end_date')}
+    for column in RATIO_COLUMNS:
+        value = row.get(column)
+        data[column] = None if value is None or pd.isna(value) else round(float(value), 2)
+    return data
+
+
+def financial_data_by_code(ratios: pd.DataFrame, ts_codes: Iterable[str]) -> Dict[str, Dict]:
+    """``{ts_code: financial_data}``，没有数据的股票为空字典"""
+    latest = latest_ratios(ratios)
+    return {
+        code: to_financial_data(latest.loc[code]) if code in latest.index else {}
+        for code in ts_codes
+    }
@@ -0,0 +1,374 @@
+"""本地财务数据仓库 — 按报告期批量拉取三大报表和财务指标，存进 ``(ts_code, end_date)`` 表。
+
+之前 ``get_financial_data`` 每次运行、每只股票都调一次 ``income`` 拉两年数据，
+再只取第一行。财报一个季度才变一次，这里改为：
+
+- 按报告期整市场拉取（``income_vip`` / ``balancesheet_vip`` / ``cashflow_vip`` /
+  ``fina_indicator_vip``，需要足够积分），没有权限时退回按股票拉取
+- 只保留常用字段，存进 SQLite（默认与分析结果同库）的 ``fin_income`` /
+  ``fin_balancesheet`` / ``fin_cashflow`` / ``fin_indicator`` 表，主键 ``(ts_code, end_date)``；
+  同一期有更正（``update_flag``）时保留最新公告的版本
+- ``fin_sync`` 表记录每个报告期（或股票）上次拉取的时间，按披露截止日判断是否
+  需要重拉：截止日之后拉过的期不再请求；披露期内最多每 ``REFRESH_TTL`` 秒一次
+
+读取接口返回 DataFrame / 记录列表，财务指标可以在本地数据上对全市场一次算完。
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .universe import to_ts_code
+
+# 每张表公共的标识字段（前两个是主键）
+KEY_FIELDS = ('ts_code', 'end_date', 'ann_date', 'f_ann_date', 'report_type', 'update_flag')
+
+# 报表 → 接口名 / 批量接口名 / 请求的标识字段 / 额外参数 / 保存的数值字段
+# （三大报表只取合并报表 report_type=1；fina_indicator 没有 f_ann_date / report_type）
+STATEMENTS: Dict[str, Dict] = {
+    'income': {
+        'endpoint': 'income',
+        'bulk_endpoint': 'income_vip',
+        'key_fields': KEY_FIELDS,
+        'params': {'report_type': '1'},
+        'fields': (
+            'basic_eps', 'total_revenue', 'revenue', 'total_cogs', 'oper_cost',
+            'sell_exp', 'admin_exp', 'fin_exp', 'rd_exp', 'operate_profit',
+            'total_profit', 'income_tax', 'n_income', 'n_income_attr_p', 'ebit', 'ebitda',
+        ),
+    },
+    'balancesheet': {
+        'endpoint': 'balancesheet',
+        'bulk_endpoint': 'balancesheet_vip',
+        'key_fields': KEY_FIELDS,
+        'params': {'report_type': '1'},
+        'fields': (
+            'money_cap', 'notes_receiv', 'accounts_receiv', 'inventories',
+            'total_cur_assets', 'fix_assets', 'goodwill', 'total_assets',
+            'st_borr', 'lt_borr', 'bond_payable', 'accounts_pay', 'total_cur_liab',
+            'total_ncl', 'total_liab', 'total_hldr_eqy_exc_min_int',
+            'total_hldr_eqy_inc_min_int',
+        ),
+    },
+    'cashflow': {
+        'endpoint': 'cashflow',
+        'bulk_endpoint': 'cashflow_vip',
+        'key_fields': KEY_FIELDS,
+        'params': {'report_type': '1'},
+        'fields': (
+            'c_fr_sale_sg', 'n_cashflow_act', 'c_pay_acq_const_fiolta',
+            'n_cashflow_inv_act', 'n_cash_flows_fnc_act', 'free_cashflow',
+        ),
+    },
+    'indicator': {
+        'endpoint': 'fina_indicator',
+        'bulk_endpoint': 'fina_indicator_vip',
+        'key_fields': ('ts_code', 'end_date', 'ann_date', 'update_flag'),
+        'params': {},
+        'fields': (
+            'grossprofit_margin', 'netprofit_margin', 'roe', 'roa', 'debt_to_assets',
+            'current_ratio', 'quick_ratio', 'inv_turn', 'ar_turn', 'assets_turn',
+            'or_yoy', 'netprofit_yoy',
+        ),
+    },
+}
+
+# 默认维护最近几个报告期（8 期 = 两年）
+DEFAULT_PERIODS = 8
+# 披露期内同一报告期 / 股票两次拉取的最小间隔（秒）
+REFRESH_TTL = 24 * 3600
+# 批量接口单次返回的行数上限，按 offset 翻页
+BULK_PAGE_SIZE = 5000
+
+# 报告期月日 → (截止日所在年份偏移, 截止月, 截止日)
+_DISCLOSURE_DEADLINES = {
+    '0331': (0, 4, 30),
+    '0630': (0, 8, 31),
+    '0930': (0, 10, 31),
+    '1231': (1, 4, 30),
+}
+
+Call = Callable[..., pd.DataFrame]
+
+
+def recent_periods(count: int = DEFAULT_PERIODS, today: Optional[date] = None) -> List[str]:
+    """已结束的最近 ``count`` 个报告期（``YYYYMMDD``，新的在前）"""
+    today = today or date.today()
+    periods = []
+    year = today.year
+    while len(periods) < count:
+        for suffix in ('1231', '0930', '0630', '0331'):
+            period = f"{year}{suffix}"
+            if datetime.strptime(period, '%Y%m%d').date() < today:
+                periods.append(period)
+                if len(periods) == count:
+                    break
+        year -= 1
+    return periods
+
+
+def disclosure_deadline(period: str) -> float:
+    """报告期的法定披露截止时间（截止日次日零点的时间戳）"""
+    offset, month, day = _DISCLOSURE_DEADLINES[period[4:]]
+    deadline = date(int(period[:4]) + offset, month, day) + timedelta(days=1)
+    return datetime(deadline.year, deadline.month, deadline.day).timestamp()
+
+
+def _period_stale(period: str, fetched_at: Optional[float], now: float) -> bool:
+    """本地该报告期的数据是否需要重新拉取"""
+    period_end = datetime.strptime(period, '%Y%m%d').timestamp()
+    deadline = disclosure_deadline(period)
+    if now < period_end:
+        return False
+    if fetched_at is None:
+        return True
+    if fetched_at >= deadline:
+        return False
+    if now >= deadline:
+        # 截止日之后补拉一次定稿
+        return True
+    return now - fetched_at > REFRESH_TTL
+
+
+def _is_permission_error(error: Exception) -> bool:
+    # 限流报错里也带“权限的具体详情”，不能只看“权限”两个字
+    message = str(error)
+    return ('没有' in message and '权限' in message) or '积分不足' in message
+
+
+class FinancialStore:
+    """按 ``(ts_code, end_date)`` 存储财务报表的本地仓库"""
+
+    def __init__(self, db_path: str = "data/stock_analysis.db",
+                 periods: int = DEFAULT_PERIODS):
+        """
+        Args:
+            db_path: SQLite 文件路径（默认与 DatabaseManager 同库）
+            periods: 维护最近几个报告期
+        """
+        dirname = os.path.dirname(db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.db_path = db_path
+        self.periods = periods
+        # 批量接口没有权限的报表，本进程内不再尝试
+        self._bulk_unavailable: set = set()
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._init_tables()
+
+    def _init_tables(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            for statement, spec in STATEMENTS.items():
+                columns = ', '.join(
+                    [f"{name} TEXT" for name in KEY_FIELDS]
+                    + [f"{name} REAL" for name in spec['fields']]
+                )
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS fin_{statement} (
+                        {columns},
+                        PRIMARY KEY (ts_code, end_date)
+                    )
+                """)
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_fin_{statement}_end_date "
+                    f"ON fin_{statement} (end_date)"
+                )
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fin_sync (
+                    statement TEXT,
+                    scope TEXT,
+                    fetched_at REAL,
+                    PRIMARY KEY (statement, scope)
+                )
+            """)
+            conn.commit()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    # ── 同步状态 ─────────────────────────────────────────
+
+    def _fetched_at(self, statement: str, scope: str) -> Optional[float]:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM fin_sync WHERE statement = ? AND scope = ?",
+                (statement, scope)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _mark_fetched(self, statement: str, scope: str, fetched_at: float) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fin_sync (statement, scope, fetched_at) VALUES (?, ?, ?)",
+                (statement, scope, fetched_at)
+            )
+            conn.commit()
+
+    # ── 写入 ─────────────────────────────────────────────
+
+    def _upsert(self, statement: str, df: Optional[pd.DataFrame]) -> int:
+        """把接口返回的报表写入本地表，返回写入行数"""
+        if df is None or df.empty:
+            return 0
+        columns = list(KEY_FIELDS) + list(STATEMENTS[statement]['fields'])
+        df = df.reindex(columns=columns)
+        df = df[df['ts_code'].notna() & df['end_date'].notna()]
+        # 同一期有多个版本时保留更正后（update_flag=1）、公告最晚的一条
+        df = (df.sort_values(['update_flag', 'f_ann_date', 'ann_date'], na_position='first')
+                .drop_duplicates(['ts_code', 'end_date'], keep='last'))
+        df = df.astype(object).where(df.notna(), None)
+        placeholders = ', '.join('?' for _ in columns)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO fin_{statement} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                df.itertuples(index=False, name=None)
+            )
+            conn.commit()
+        return len(df)
+
+    def _fields_param(self, statement: str) -> str:
+        spec = STATEMENTS[statement]
+        return ','.join(list(spec['key_fields']) + list(spec['fields']))
+
+    def sync_period(self, call: Call, statement: str, period: str,
+                    now: Optional[float] = None) -> Optional[int]:
+        """用批量接口拉取某个报告期的全市场报表
+
+        Args:
+            call: 调用 Tushare 接口的函数，``call(endpoint, **kwargs)``
+            statement: ``STATEMENTS`` 中的报表名
+            period: 报告期 ``YYYYMMDD``
+
+        Returns:
+            Optional[int]: 写入行数（已是最新时为 0，不发请求）；批量接口不可用时返回 ``None``
+        """
+        now = now if now is not None else time.time()
+        scope = f"period:{period}"
+        with self._lock_for(f"{statement}:{scope}"):
+            if statement in self._bulk_unavailable:
+                return None
+            if not _period_stale(period, self._fetched_at(statement, scope), now):
+                return 0
+            fields = self._fields_param(statement)
+            written, offset = 0, 0
+            try:
+                while True:
+                    df = call(STATEMENTS[statement]['bulk_endpoint'], period=period,
+                              fields=fields, limit=BULK_PAGE_SIZE, offset=offset,
+                              **STATEMENTS[statement]['params'])
+                    if df is None or df.empty:
+                        break
+                    written += self._upsert(statement, df)
+                    if len(df) < BULK_PAGE_SIZE:
+                        break
+                    offset += len(df)
+            except Exception as e:
+                if _is_permission_error(e):
+                    print(f"{STATEMENTS[statement]['bulk_endpoint']} 无权限，改为按股票拉取: {e}")
+                    self._bulk_unavailable.add(statement)
+                else:
+                    print(f"批量拉取 {statement} {period} 失败: {e}")
+                return None
+            self._mark_fetched(statement, scope, now)
+            return written
+
+    def sync_stock(self, call: Call, statement: str, ts_code: str,
+                   now: Optional[float] = None) -> int:
+        """按股票拉取最近几个报告期的报表（批量接口不可用时使用）
+
+        Returns:
+            int: 写入行数（已是最新时为 0，不发请求）
+        """
+        now = now if now is not None else time.time()
+        ts_code = to_ts_code(ts_code)
+        scope = f"stock:{ts_code}"
+        periods = recent_periods(self.periods, datetime.fromtimestamp(now).date())
+        with self._lock_for(f"{statement}:{scope}"):
+            fetched_at = self._fetched_at(statement, scope)
+            if not any(_period_stale(period, fetched_at, now) for period in periods):
+                return 0
+            df = call(STATEMENTS[statement]['endpoint'], ts_code=ts_code,
+                      start_date=periods[-1], end_date=periods[0],
+                      fields=self._fields_param(statement), **STATEMENTS[statement]['params'])
+            written = self._upsert(statement, df)
+            self._mark_fetched(statement, scope, now)
+            return written
+
+    def ensure(self, call: Call, statement: str, ts_code: str,
+               now: Optional[float] = None) -> None:
+        """确保本地有该股票最近几个报告期的报表：优先整市场批量拉取，不行再按股票拉取"""
+        now = now if now is not None else time.time()
+        periods = recent_periods(self.periods, datetime.fromtimestamp(now).date())
+        results = [self.sync_period(call, statement, period, now) for period in periods]
+        if any(result is None for result in results):
+            self.sync_stock(call, statement, ts_code, now)
+
+    def sync_all(self, call: Call, statements: Iterable[str] = tuple(STATEMENTS),
+                 now: Optional[float] = None) -> Dict[str, int]:
+        """批量同步最近几个报告期的全市场报表，返回 报表 → 写入行数"""
+        now = now if now is not None else time.time()
+        periods = recent_periods(self.periods, datetime.fromtimestamp(now).date())
+        written = {}
+        for statement in statements:
+            written[statement] = sum(
+                self.sync_period(call, statement, period, now) or 0 for period in periods
+            )
+        return written
+
+    # ── 读取 ─────────────────────────────────────────────
+
+    def load(self, statement: str, ts_codes: Optional[Iterable[str]] = None,
+             start_period: Optional[str] = None) -> pd.DataFrame:
+        """读取本地报表（不走网络），按 ts_code、end_date 降序排列
+
+        Args:
+            statement: ``STATEMENTS`` 中的报表名
+            ts_codes: 只读这些股票；默认全部
+            start_period: 只读 ``end_date >= start_period`` 的报告期
+        """
+        sql = f"SELECT * FROM fin_{statement} WHERE 1 = 1"
+        params: List = []
+        if ts_codes is not None:
+            codes = [to_ts_code(code) for code in ts_codes]
+            if not codes:
+                return pd.DataFrame(columns=list(KEY_FIELDS) + list(STATEMENTS[statement]['fields']))
+            sql += f" AND ts_code IN ({', '.join('?' for _ in codes)})"
+            params.extend(codes)
+        if start_period:
+            sql += " AND end_date >= ?"
+            params.append(start_period)
+        sql += " ORDER BY ts_code, end_date DESC"
+        with sqlite3.connect(self.db_path) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def records(self, statement: str, ts_code: str,
+                start_period: Optional[str] = None) -> List[Dict]:
+        """某只股票的报表记录（新的报告期在前）"""
+        df = self.load(statement, [ts_code], start_period)
+        return df.astype(object).where(df.notna(), None).to_dict('records')
+
+    def latest(self, statement: str, ts_code: str) -> Dict:
+        """某只股票最新一期报表；没有数据时返回空字典"""
+        records = self.records(statement, ts_code)
+        return records[0] if records else {}
+
+
+_default_store: Optional[FinancialStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_financial_store() -> FinancialStore:
+    """进程内共享的默认财务仓库（库文件取 ``FINANCIAL_STORE_DB``，默认与分析结果同库）"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = FinancialStore(os.getenv("FINANCIAL_STORE_DB", "data/stock_analysis.db"))
+        return _default_store
@@ -0,0 +1,55 @@
+"""新闻全文检索的分词 — 中文按字符二元组切分，在 Python 里完成。
+
+SQLite FTS5 自带的 ``unicode61`` 分词器按空白和标点切词，中文整句会被当成
+一个词，``MATCH '茅台'`` 查不到“贵州茅台发布公告”。这里在写入和查询两侧
+都先把文本转成空格分隔的词序列再交给 FTS5：
+
+- 连续的中日韩字符切成重叠的二元组：``贵州茅台`` → ``贵州 州茅 茅台``
+- 字母数字串整体保留并转小写：``ROE 15.04%`` → ``roe 15 04``
+
+查询时每个检索词的二元组组成一个短语（FTS5 短语要求词相邻，
+正好等价于子串匹配），多个检索词之间是 AND。
+"""
+
+import re
+from typing import List, Optional
+
+_CJK = r'㐀-䶿一-鿿豈-﫿'
+_RUN = re.compile(rf'[{_CJK}]+|[0-9A-Za-z０-９Ａ-Ｚａ-ｚ]+')
+_CJK_RUN = re.compile(rf'[{_CJK}]+')
+_FULLWIDTH = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+
+
+def _run_tokens(run: str) -> List[str]:
+    if _CJK_RUN.fullmatch(run):
+        if len(run) == 1:
+            return [run]
+        return [run[i:i + 2] for i in range(len(run) - 1)]
+    return [run.translate(_FULLWIDTH).lower()]
+
+
+def tokenize(text: Optional[str]) -> str:
+    """把文本转成 FTS5 索引用的空格分隔词序列"""
+    tokens = []
+    for run in _RUN.findall(text or ''):
+        tokens.extend(_run_tokens(run))
+    return ' '.join(tokens)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """把用户检索词转成 FTS5 ``MATCH`` 表达式
+
+    Returns:
+        Optional[str]: ``MATCH`` 表达式；检索词里有单个汉字（二元组索引查不到）
+        或没有可检索的内容时返回 ``None``，调用方应退回 ``LIKE``
+    """
+    phrases = []
+    for term in (query or '').split():
+        runs = _RUN.findall(term)
+        if not runs:
+            continue
+        if any(_CJK_RUN.fullmatch(run) and len(run) == 1 for run in runs):
+            return None
+        tokens = [token for run in runs for token in _run_tokens(run)]
+        phrases.append('"' + ' '.join(tokens) + '"')
+    return ' '.join(phrases) or None
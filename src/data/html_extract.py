@@ -0,0 +1,333 @@
+"""新闻页面正文提取 — 可插拔的解析后端。
+
+原来的做法是对整页建一棵 ``BeautifulSoup(..., 'html.parser')`` 树，再依次
+试 6 个选择器，编码靠在 ``response.text`` 里搜 ``charset=gb2312``（这一步
+本身就要先按错误的编码整页解码一次）。抓取并发之后解析就成了 CPU 热点。
+这里：
+
+- 编码在字节层面判断（BOM → HTTP 头 → 页面前 4KB 的 ``charset=``），只解码一次；
+  GB2312 / GBK 统一按超集 GB18030 解码，避免生僻字报错
+- ``lxml`` 后端：C 实现的解析器 + XPath 直接定位候选容器
+- ``strained`` 后端：BeautifulSoup + ``SoupStrainer``，只为候选容器建树
+- ``legacy`` 后端：原实现，保留用于对照基准
+
+默认优先 ``lxml``（未安装时退回 ``strained``），可用环境变量
+``NEWS_HTML_BACKEND`` 指定。三个后端对同一页面的输出一致，
+对比见 ``benchmarks/bench_html_extract.py``。
+"""
+
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml 是可选依赖
+    lxml_html = None
+
+# 正文候选容器，按优先级排列：(属性, 值)
+CONTENT_SELECTORS: List[Tuple[str, str]] = [
+    ('id', 'artibody'),
+    ('class', 'article-content'),
+    ('class', 'article'),
+    ('class', 'content'),
+    ('id', 'article_content'),
+    ('class', 'main-content'),
+]
+TEXT_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+# 容器内这些元素整体丢弃（与原实现 decompose 的集合一致）
+UNWANTED_TAGS = ('script', 'style', 'iframe', 'div', 'table')
+MIN_PARAGRAPH_LENGTH = 10
+MAX_CONTENT_LENGTH = 2000
+
+_CHARSET_PATTERN = re.compile(rb'charset\s*=\s*["\']?\s*([a-zA-Z0-9_\-]+)', re.IGNORECASE)
+_GB_FAMILY = {'gb2312', 'gbk', 'gb18030', 'x-gbk', 'cp936'}
+# XHTML 页面开头的 ``<?xml ... encoding="..."?>``：lxml 拒绝解析带编码声明的 str
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>', re.IGNORECASE)
+
+
+def normalize_charset(charset: Optional[str]) -> Optional[str]:
+    if not charset:
+        return None
+    charset = charset.strip().lower()
+    if charset in _GB_FAMILY:
+        return 'gb18030'
+    if charset in ('utf8', 'utf-8'):
+        return 'utf-8'
+    return charset
+
+
+def detect_charset(raw: bytes, content_type: Optional[str] = None,
+                   default: str = 'utf-8') -> str:
+    """在字节层面判断页面编码（不做整页解码）
+
+    优先级：BOM → HTTP ``Content-Type`` 头 → 页面前 4KB 的 ``<meta charset>``。
+    """
+    if raw.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8'
+    if content_type:
+        match = _CHARSET_PATTERN.search(content_type.encode('latin-1', 'ignore'))
+        if match:
+            return normalize_charset(match.group(1).decode('ascii')) or default
+    match = _CHARSET_PATTERN.search(raw[:4096])
+    if match:
+        return normalize_charset(match.group(1).decode('ascii', 'ignore')) or default
+    return default
+
+
+def decode_html(raw: bytes, content_type: Optional[str] = None,
+                default_charset: str = 'utf-8') -> str:
+    """按 :func:`detect_charset` 的结果整页解码一次"""
+    return raw.decode(detect_charset(raw, content_type, default_charset), errors='replace')
+
+
+def _finish(paragraphs: Sequence[str]) -> str:
+    if not paragraphs:
+        return ""
+    content = ' '.join(paragraphs)
+    content = re.sub(r'\s+', ' ', content)
+    return content[:MAX_CONTENT_LENGTH]
+
+
+class Extractor(ABC):
+    """正文提取后端接口"""
+
+    name = 'base'
+
+    def extract(self, raw: bytes, content_type: Optional[str] = None,
+                selectors: Optional[Sequence[Tuple[str, str]]] = None) -> str:
+        """从页面字节中提取正文，按 ``selectors`` 顺序取第一个有正文的容器"""
+        return self.extract_with_selector(raw, content_type, selectors)[0]
+
+    @abstractmethod
+    def extract_with_selector(
+        self, raw: bytes, content_type: Optional[str] = None,
+        selectors: Optional[Sequence[Tuple[str, str]]] = None,
+    ) -> Tuple[str, Optional[Tuple[str, str]]]:
+        """同 :meth:`extract`，并返回命中的选择器（都没命中时为 ``None``）"""
+
+
+def _extract_from_div(content_div) -> str:
+    """原实现对单个容器的处理：移除无关元素后收集段落文本"""
+    for unwanted in content_div.find_all(list(UNWANTED_TAGS)):
+        unwanted.decompose()
+    paragraphs = []
+    for p in content_div.find_all(list(TEXT_TAGS)):
+        text = p.get_text(strip=True)
+        if text and len(text) > MIN_PARAGRAPH_LENGTH:
+            paragraphs.append(text)
+    return _finish(paragraphs)
+
+
+def _class_token_pattern(classes: Sequence[str]) -> re.Pattern:
+    alternatives = '|'.join(re.escape(c) for c in classes)
+    return re.compile(rf'(?:^|\s)(?:{alternatives})(?:\s|$)')
+
+
+class LegacySoupExtractor(Extractor):
+    """原实现：整页 html.parser 建树 + 在解码后的文本里搜 charset（仅用于基准对照）"""
+
+    name = 'legacy'
+
+    def extract_with_selector(self, raw, content_type=None, selectors=None):
+        text = raw.decode('utf-8', errors='replace')
+        if 'charset=gb2312' in text or 'charset=GB2312' in text:
+            text = raw.decode('gb2312', errors='replace')
+        soup = BeautifulSoup(text, 'html.parser')
+        for attr, value in selectors or CONTENT_SELECTORS:
+            kwargs = {'id': value} if attr == 'id' else {'class_': value}
+            content_div = soup.find('div', **kwargs)
+            if content_div:
+                content = _extract_from_div(content_div)
+                if content:
+                    return content, (attr, value)
+        return "", None
+
+
+class StrainedSoupExtractor(Extractor):
+    """BeautifulSoup + SoupStrainer：只为候选容器建树"""
+
+    name = 'strained'
+
+    def __init__(self):
+        self.parser = 'lxml' if lxml_html is not None else 'html.parser'
+
+    def extract_with_selector(self, raw, content_type=None, selectors=None):
+        selectors = list(selectors or CONTENT_SELECTORS)
+        text = decode_html(raw, content_type)
+        # id 类和 class 类选择器各用一个 SoupStrainer，需要时才解析；
+        # 只有匹配到的 div 子树会被建树
+        soups = {}
+        for attr, value in selectors:
+            if attr not in soups:
+                values = [v for a, v in selectors if a == attr]
+                if attr == 'id':
+                    kwargs = {'id': values}
+                else:
+                    # 建树时 class 还是原始字符串（未拆分），按空白分隔的 token 匹配
+                    kwargs = {'class_': _class_token_pattern(values)}
+                soups[attr] = BeautifulSoup(
+                    text, self.parser, parse_only=SoupStrainer('div', **kwargs)
+                )
+            kwargs = {'id': value} if attr == 'id' else {'class_': value}
+            content_div = soups[attr].find('div', **kwargs)
+            if content_div:
+                content = _extract_from_div(content_div)
+                if content:
+                    return content, (attr, value)
+        return "", None
+
+
+class LxmlExtractor(Extractor):
+    """lxml 解析 + XPath 定位候选容器"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        if lxml_html is None:
+            raise ImportError("lxml 未安装，无法使用 lxml 解析后端")
+
+    @staticmethod
+    def _xpath(selector: Tuple[str, str]) -> str:
+        attr, value = selector
+        if attr == 'class':
+            return (f"//div[contains(concat(' ', normalize-space(@class), ' '), "
+                    f"' {value} ')][1]")
+        return f"//div[@{attr}='{value}'][1]"
+
+    def extract_with_selector(self, raw, content_type=None, selectors=None):
+        text = decode_html(raw, content_type)
+        if not text.strip():
+            return "", None
+        # 已经按 detect_charset 解码过，编码声明只会让 lxml 报 ValueError
+        root = lxml_html.document_fromstring(_XML_DECLARATION.sub('', text, count=1))
+        for selector in selectors or CONTENT_SELECTORS:
+            found = root.xpath(self._xpath(selector))
+            if not found:
+                continue
+            container = found[0]
+            paragraphs = []
+            for element in container.iter(*TEXT_TAGS):
+                if self._inside_unwanted(element, container):
+                    continue
+                text = ''.join(self._texts(element))
+                if text and len(text) > MIN_PARAGRAPH_LENGTH:
+                    paragraphs.append(text)
+            if paragraphs:
+                return _finish(paragraphs), selector
+        return "", None
+
+    @classmethod
+    def _texts(cls, element):
+        """与 ``get_text(strip=True)`` 一致：跳过注释和嵌套的无关元素，各段去空白"""
+        if element.text and element.text.strip():
+            yield element.text.strip()
+        for child in element:
+            if isinstance(child.tag, str) and child.tag not in UNWANTED_TAGS:
+                yield from cls._texts(child)
+            if child.tail and child.tail.strip():
+                yield child.tail.strip()
+
+    @staticmethod
+    def _inside_unwanted(element, container) -> bool:
+        parent = element.getparent()
+        while parent is not None and parent is not container:
+            if parent.tag in UNWANTED_TAGS:
+                return True
+            parent = parent.getparent()
+        return False
+
+
+BACKENDS = {
+    'legacy': LegacySoupExtractor,
+    'strained': StrainedSoupExtractor,
+    'lxml': LxmlExtractor,
+}
+
+_extractors: Dict[str, Extractor] = {}
+
+
+def get_extractor(name: Optional[str] = None) -> Extractor:
+    """按名称获取解析后端（默认取 ``NEWS_HTML_BACKEND``，再默认 lxml / strained）"""
+    name = name or os.getenv("NEWS_HTML_BACKEND") or ('lxml' if lxml_html is not None else 'strained')
+    if name not in _extractors:
+        backend = BACKENDS.get(name)
+        if backend is None:
+            print(f"未知的解析后端 {name}，改用 strained")
+            return get_extractor('strained')
+        try:
+            _extractors[name] = backend()
+        except ImportError as e:
+            print(f"{e}，改用 strained")
+            return get_extractor('strained')
+    return _extractors[name]
+
+
+def extract_article(raw: bytes, content_type: Optional[str] = None,
+                    backend: Optional[str] = None) -> str:
+    """用默认（或指定）后端从页面字节中提取正文"""
+    return get_extractor(backend).extract(raw, content_type)
+
+
+def extract_links(raw: bytes, content_type: Optional[str] = None,
+                  default_charset: str = 'utf-8') -> List[Tuple[str, str]]:
+    """只解析 ``<a href>`` 标签，返回 ``[(href, 文本), ...]``（列表页 / 首页用）"""
+    text = decode_html(raw, content_type, default_charset)
+    parser = 'lxml' if lxml_html is not None else 'html.parser'
+    soup = BeautifulSoup(text, parser, parse_only=SoupStrainer('a', href=True))
+    return [(a['href'], a.get_text().strip()) for a in soup.find_all('a', href=True)]
+
+
+_DATETIME_PATTERN = re.compile(r'(\d{4}-\d{1,2}-\d{1,2})(?:[\s\xa0]+(\d{1,2}:\d{2}(?::\d{2})?))?')
+
+
+def _find_datetime(text: str) -> Optional[str]:
+    """在一段文本里找 ``YYYY-MM-DD[ HH:MM[:SS]]``，返回规整后的字符串"""
+    match = _DATETIME_PATTERN.search(text or '')
+    if not match:
+        return None
+    date, clock = match.groups()
+    return f"{date} {clock}" if clock else date
+
+
+def extract_news_list(raw: bytes, content_type: Optional[str] = None,
+                      default_charset: str = 'utf-8') -> Optional[List[Tuple[str, str, Optional[str]]]]:
+    """解析新浪个股新闻列表页，返回 ``[(href, 标题, 发布时间), ...]``
+
+    支持两种版式（只解析对应容器）：
+
+    - ``<div class="datelist">``：每条是 ``2024-10-18 15:32 <a>标题</a>``，时间在链接前面的文本里
+    - ``<table id="con02-0">``：每行第一列是时间、第二列是链接
+
+    发布时间解析不到时为 ``None``；两种容器都没有时返回 ``None``
+    （调用方据此退回 :func:`extract_links`）。
+    """
+    text = decode_html(raw, content_type, default_charset)
+    parser = 'lxml' if lxml_html is not None else 'html.parser'
+
+    soup = BeautifulSoup(text, parser, parse_only=SoupStrainer('div', class_='datelist'))
+    datelist = soup.find('div')
+    if datelist is not None:
+        items = []
+        for link in datelist.find_all('a', href=True):
+            previous = link.previous_sibling
+            stamp = _find_datetime(str(previous)) if isinstance(previous, str) else None
+            items.append((link['href'], link.get_text().strip(), stamp))
+        return items
+
+    soup = BeautifulSoup(text, parser, parse_only=SoupStrainer('table', id='con02-0'))
+    table = soup.find('table')
+    if table is None:
+        return None
+    items = []
+    for row in table.find_all('tr')[1:]:  # 跳过表头
+        cols = row.find_all('td')
+        if len(cols) >= 2:
+            link = cols[1].find('a')
+            if link and link.has_attr('href'):
+                stamp = _find_datetime(cols[0].get_text(' '))
+                items.append((link['href'], link.get_text().strip(), stamp))
+    return items
@@ -0,0 +1,244 @@
+"""技术指标引擎 — 基于 NumPy 的整段数组计算。
+
+所有函数都沿最后一个轴计算：传一维数组就是单只股票，传 ``(股票数, K线数)``
+的二维数组就是一次算完整个股票池（长度不齐的用 NaN 在左侧补齐）。
+窗口不足的位置返回 NaN。
+
+递推型指标（EMA / RSI / KDJ）只在时间轴上循环一次，每步对所有股票做
+向量运算；其余指标（SMA / 布林带 / OBV 等）完全向量化。
+"""
+
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_float(x) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def _rolling(x: np.ndarray, n: int, func) -> np.ndarray:
+    """对最后一个轴做长度为 n 的滑动窗口聚合，前 n-1 个位置为 NaN"""
+    x = _as_float(x)
+    out = np.full(x.shape, np.nan)
+    if n <= 0 or x.shape[-1] < n:
+        return out
+    windows = sliding_window_view(x, n, axis=-1)
+    out[..., n - 1:] = func(windows, axis=-1)
+    return out
+
+
+def sma(x, n: int) -> np.ndarray:
+    """简单移动平均"""
+    return _rolling(x, n, np.mean)
+
+
+def rolling_std(x, n: int) -> np.ndarray:
+    """滑动总体标准差"""
+    return _rolling(x, n, np.std)
+
+
+def rolling_max(x, n: int) -> np.ndarray:
+    return _rolling(x, n, np.max)
+
+
+def rolling_min(x, n: int) -> np.ndarray:
+    return _rolling(x, n, np.min)
+
+
+def _recursive_smooth(x, alpha: float) -> np.ndarray:
+    """``y[t] = alpha * x[t] + (1 - alpha) * y[t-1]``，以每行首个有效值起算
+
+    NaN 输入不会污染后续结果：遇到 NaN 时沿用上一个值。
+    """
+    x = _as_float(x)
+    out = np.full(x.shape, np.nan)
+    prev = np.full(x.shape[:-1], np.nan)
+    for t in range(x.shape[-1]):
+        cur = x[..., t]
+        valid = ~np.isnan(cur)
+        started = ~np.isnan(prev)
+        prev = np.where(valid & started, alpha * cur + (1 - alpha) * prev,
+                        np.where(valid, cur, prev))
+        out[..., t] = prev
+    return out
+
+
+def ema(x, n: int) -> np.ndarray:
+    """指数移动平均（alpha = 2 / (n + 1)）"""
+    return _recursive_smooth(x, 2.0 / (n + 1))
+
+
+def macd(close, fast: int = 12, slow: int = 26,
+         signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD，按国内习惯返回 ``(DIF, DEA, MACD柱 = 2 * (DIF - DEA))``"""
+    dif = ema(close, fast) - ema(close, slow)
+    dea = ema(dif, signal)
+    return dif, dea, 2 * (dif - dea)
+
+
+def rsi(close, n: int = 14) -> np.ndarray:
+    """相对强弱指标（Wilder 平滑）"""
+    close = _as_float(close)
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    # clip 会保留 NaN，补齐位置不会被当成 0 涨跌参与平滑
+    gain = _recursive_smooth(np.clip(delta, 0, None), 1.0 / n)
+    loss = _recursive_smooth(np.clip(-delta, 0, None), 1.0 / n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = 100 - 100 / (1 + gain / loss)
+    out = np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), out)
+    # 有效价格不足 n 根时结果不可靠，置为 NaN
+    counts = np.cumsum(~np.isnan(delta), axis=-1)
+    return np.where(counts >= n, out, np.nan)
+
+
+def bollinger(close, n: int = 20,
+              k: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """布林带，返回 ``(中轨, 上轨, 下轨)``"""
+    mid = sma(close, n)
+    std = rolling_std(close, n)
+    return mid, mid + k * std, mid - k * std
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    prev_close = np.concatenate(
+        [np.full(close.shape[:-1] + (1,), np.nan), close[..., :-1]], axis=-1
+    )
+    # fmax 忽略 NaN：首根K线没有昨收时退化为 high - low
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, n: int = 14) -> np.ndarray:
+    """平均真实波幅（Wilder 平滑）"""
+    tr = true_range(high, low, close)
+    out = _recursive_smooth(tr, 1.0 / n)
+    counts = np.cumsum(~np.isnan(tr), axis=-1)
+    return np.where(counts >= n, out, np.nan)
+
+
+def kdj(high, low, close, n: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """KDJ 随机指标，返回 ``(K, D, J)``（K、D 为 RSV 的 1/3 平滑）"""
+    highest = rolling_max(high, n)
+    lowest = rolling_min(low, n)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsv = (_as_float(close) - lowest) / (highest - lowest) * 100
+    rsv = np.where(highest == lowest, 50.0, rsv)
+    rsv = np.where(np.isnan(highest), np.nan, rsv)
+    k = _recursive_smooth(rsv, 1.0 / 3)
+    d = _recursive_smooth(k, 1.0 / 3)
+    return k, d, 3 * k - 2 * d
+
+
+def obv(close, volume) -> np.ndarray:
+    """能量潮"""
+    close, volume = _as_float(close), _as_float(volume)
+    direction = np.sign(np.diff(close, axis=-1, prepend=np.nan))
+    return np.nancumsum(np.nan_to_num(direction) * np.nan_to_num(volume), axis=-1)
+
+
+def volume_ratio(volume, n: int = 5) -> np.ndarray:
+    """量比：当日成交量 / 前 n 日平均成交量"""
+    volume = _as_float(volume)
+    prev_mean = np.concatenate(
+        [np.full(volume.shape[:-1] + (1,), np.nan), sma(volume, n)[..., :-1]], axis=-1
+    )
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return volume / prev_mean
+
+
+def compute_all(ohlcv: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """对一组 OHLCV 数组（一维或二维）算出全部指标序列"""
+    close = _as_float(ohlcv['close'])
+    high = _as_float(ohlcv.get('high', close))
+    low = _as_float(ohlcv.get('low', close))
+    volume = _as_float(ohlcv.get('volume', np.full(close.shape, np.nan)))
+
+    dif, dea, hist = macd(close)
+    boll_mid, boll_upper, boll_lower = bollinger(close)
+    k, d, j = kdj(high, low, close)
+    return {
+        'ma5': sma(close, 5),
+        'ma10': sma(close, 10),
+        'ma20': sma(close, 20),
+        'ma60': sma(close, 60),
+        'ema12': ema(close, 12),
+        'ema26': ema(close, 26),
+        'macd_dif': dif,
+        'macd_dea': dea,
+        'macd_hist': hist,
+        'rsi6': rsi(close, 6),
+        'rsi14': rsi(close, 14),
+        'boll_mid': boll_mid,
+        'boll_upper': boll_upper,
+        'boll_lower': boll_lower,
+        'atr14': atr(high, low, close, 14),
+        'kdj_k': k,
+        'kdj_d': d,
+        'kdj_j': j,
+        'obv': obv(close, volume),
+        'volume_ratio5': volume_ratio(volume, 5),
+    }
+
+
+def _clean(value: float, digits: int = 4) -> Optional[float]:
+    """NaN → None，其余四舍五入，便于 JSON 序列化进 prompt"""
+    value = float(value)
+    if np.isnan(value) or np.isinf(value):
+        return None
+    return round(value, digits)
+
+
+def latest_snapshot(ohlcv: Mapping[str, np.ndarray]) -> Dict[str, Optional[float]]:
+    """单只股票：返回各指标最新一根K线上的取值"""
+    if not len(ohlcv.get('close', ())):
+        return {}
+    series = compute_all(ohlcv)
+    return {name: _clean(values[-1]) for name, values in series.items()}
+
+
+def stack_right_aligned(arrays_by_code: Mapping[str, Mapping[str, np.ndarray]],
+                        fields=('open', 'high', 'low', 'close', 'volume'),
+                        lookback: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """把多只股票长度不一的K线按最新一根对齐，堆成 ``(股票数, K线数)`` 矩阵
+
+    较短的序列在左侧补 NaN；``lookback`` 可截断到最近 N 根以控制矩阵大小。
+    """
+    lengths = [len(a.get('close', ())) for a in arrays_by_code.values()]
+    width = max(lengths, default=0)
+    if lookback:
+        width = min(width, lookback)
+    stacked = {}
+    for field in fields:
+        matrix = np.full((len(lengths), width), np.nan)
+        for row, arrays in enumerate(arrays_by_code.values()):
+            values = _as_float(arrays.get(field, ()))[-width:] if width else ()
+            if len(values):
+                matrix[row, width - len(values):] = values
+        stacked[field] = matrix
+    return stacked
+
+
+def compute_panel(arrays_by_code: Mapping[str, Mapping[str, np.ndarray]],
+                  lookback: Optional[int] = 250) -> Dict[str, Dict[str, Optional[float]]]:
+    """多只股票一次批量计算，返回 股票代码 → 最新指标快照
+
+    Args:
+        arrays_by_code: 股票代码 → OHLCV 数组（如 ``KlineStore.load`` 的返回）
+        lookback: 只用最近 N 根K线计算（足够覆盖 MA60 / EMA 收敛）
+    """
+    codes = list(arrays_by_code)
+    if not codes:
+        return {}
+    stacked = stack_right_aligned(arrays_by_code, lookback=lookback)
+    if not stacked['close'].shape[-1]:
+        return {code: {} for code in codes}
+    series = compute_all(stacked)
+    panel = {}
+    for row, code in enumerate(codes):
+        if not len(arrays_by_code[code].get('close', ())):
+            panel[code] = {}
+            continue
+        panel[code] = {name: _clean(values[row, -1]) for name, values in series.items()}
+    return panel
@@ -0,0 +1,263 @@
+"""本地 K 线仓库 — 每只股票一份紧凑的 NumPy 数组，按需同步。
+
+之前 ``get_history_klines`` 每次都重新下载整段历史。这里把每只股票的日K
+存成 ``data/klines/{code}_{period}.npz``（date / open / high / low / close /
+volume / turnover 七个列数组），同步时：
+
+- 本地最后一根K线已经是最近一个收盘日 → 完全不走网络
+- 否则拉一次接口，只把比本地更新的K线追加进去
+
+注意：麦蕊的K线接口没有起始日期 / 区间参数，每次同步仍然会下载整段历史，
+省掉的只是"数据已是最新"时的请求和本地重写。为此同一只股票两次同步之间
+至少间隔 ``min_sync_interval`` 秒（收盘后数据源还没更新当日K线时，
+不会每次调用都重新下载一遍）。
+
+读取接口直接返回 NumPy 数组，技术指标、回测、市场扫描第二步都可以
+在本地数据上跑。
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .trade_calendar import last_closed_trading_date
+
+# 列名 → MaiRui K线记录里可能出现的字段名（不同端点命名不一）
+FIELD_ALIASES = {
+    'open': ('o',),
+    'high': ('h',),
+    'low': ('l',),
+    'close': ('c',),
+    'volume': ('v',),
+    'turnover': ('hs', 'tr'),
+}
+COLUMNS = ('date',) + tuple(FIELD_ALIASES)
+
+KlineArrays = Dict[str, np.ndarray]
+
+
+def _empty_arrays() -> KlineArrays:
+    arrays = {'date': np.array([], dtype='datetime64[D]')}
+    for name in FIELD_ALIASES:
+        arrays[name] = np.array([], dtype=np.float64)
+    return arrays
+
+
+def _parse_date(record: Dict) -> Optional[np.datetime64]:
+    raw = record.get('d') or record.get('t') or record.get('date')
+    if not raw:
+        return None
+    try:
+        # 兼容 "2024-01-02" / "2024-01-02 00:00:00" / "20240102"
+        text = str(raw).strip()[:10]
+        if len(text) >= 8 and text[:8].isdigit():
+            text = f"{text[:4]}-{text[4:6]}-{text[6:8]}"
+        return np.datetime64(text, 'D')
+    except ValueError:
+        return None
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def klines_to_arrays(klines: List[Dict]) -> KlineArrays:
+    """把接口返回的K线记录列表转成按日期升序、去重后的列数组"""
+    rows = []
+    for record in klines or []:
+        if not isinstance(record, dict):
+            continue
+        day = _parse_date(record)
+        if day is None:
+            continue
+        values = []
+        for aliases in FIELD_ALIASES.values():
+            raw = next((record[a] for a in aliases if a in record), None)
+            values.append(_to_float(raw))
+        rows.append((day, values))
+
+    if not rows:
+        return _empty_arrays()
+
+    dates = np.array([r[0] for r in rows], dtype='datetime64[D]')
+    matrix = np.array([r[1] for r in rows], dtype=np.float64)
+    # 同一天出现多次时保留最后一条，再按日期排序
+    _, last_idx = np.unique(dates[::-1], return_index=True)
+    keep = len(dates) - 1 - last_idx
+    order = keep[np.argsort(dates[keep])]
+
+    arrays = {'date': dates[order]}
+    for i, name in enumerate(FIELD_ALIASES):
+        arrays[name] = matrix[order, i]
+    return arrays
+
+
+class KlineStore:
+    """按股票代码落盘的本地K线仓库"""
+
+    def __init__(self, root: str = "data/klines", min_sync_interval: float = 1800.0):
+        """
+        Args:
+            root: 存放 ``.npz`` 文件的目录
+            min_sync_interval: 同一只股票两次下载之间的最短间隔（秒）
+        """
+        self.root = root
+        self.min_sync_interval = min_sync_interval
+        os.makedirs(root, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._last_download: Dict[str, float] = {}
+
+    def _path(self, stock_code: str, period: str) -> str:
+        return os.path.join(self.root, f"{stock_code}_{period}.npz")
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def load(self, stock_code: str, period: str = "dq") -> KlineArrays:
+        """读取本地K线（不走网络），没有数据时返回空数组
+
+        Returns:
+            Dict[str, np.ndarray]: ``date`` 为 ``datetime64[D]``，其余为 ``float64``
+        """
+        path = self._path(stock_code, period)
+        if not os.path.exists(path):
+            return _empty_arrays()
+        try:
+            with np.load(path) as data:
+                return {name: data[name] for name in COLUMNS}
+        except (OSError, KeyError, ValueError) as e:
+            print(f"读取本地K线失败 ({stock_code}): {e}")
+            return _empty_arrays()
+
+    def save(self, stock_code: str, arrays: KlineArrays, period: str = "dq") -> None:
+        """原子写入本地K线文件"""
+        path = self._path(stock_code, period)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **{name: arrays[name] for name in COLUMNS})
+        os.replace(tmp_path, path)
+
+    def last_date(self, stock_code: str, period: str = "dq") -> Optional[date]:
+        """本地最后一根K线的日期"""
+        dates = self.load(stock_code, period)['date']
+        if not len(dates):
+            return None
+        return dates[-1].astype(date)
+
+    def is_fresh(self, stock_code: str, period: str = "dq",
+                 now: Optional[float] = None) -> bool:
+        """本地数据是否已经覆盖到最近一个收盘日"""
+        last = self.last_date(stock_code, period)
+        target = last_closed_trading_date(now if now is not None else time.time())
+        return last is not None and last >= target
+
+    def sync(self, api, stock_code: str, period: str = "dq") -> int:
+        """同步一只股票的K线
+
+        接口不支持按日期增量拉取，需要同步时会下载整段历史，只把比本地更新的
+        K线追加进去；距离上次下载不足 ``min_sync_interval`` 秒时直接跳过。
+
+        Args:
+            api: ``MaiRuiStockAPI`` 实例（用其 ``get_history_klines``）
+            stock_code: 股票代码
+            period: K线周期
+
+        Returns:
+            int: 新追加的K线根数（已是最新或被限频跳过时为 0，不发请求）
+        """
+        key = f"{stock_code}_{period}"
+        with self._lock_for(key):
+            local = self.load(stock_code, period)
+            now = time.time()
+            target = np.datetime64(last_closed_trading_date(now), 'D')
+            if len(local['date']) and local['date'][-1] >= target:
+                return 0
+            if now - self._last_download.get(key, 0.0) < self.min_sync_interval:
+                return 0
+
+            self._last_download[key] = now
+            remote = klines_to_arrays(api.get_history_klines(stock_code, period))
+            # 只收已收盘的K线：盘中拉到的当日K线还会变，不落盘
+            mask = remote['date'] <= target
+            if len(local['date']):
+                if self._adjustment_changed(local, remote):
+                    # 复权K线在除权除息后会整体重算，旧数据作废、整段重写
+                    local = _empty_arrays()
+                else:
+                    mask &= remote['date'] > local['date'][-1]
+            added = int(mask.sum())
+            if not added:
+                return 0
+
+            merged = {name: np.concatenate([local[name], remote[name][mask]])
+                      for name in COLUMNS}
+            self.save(stock_code, merged, period)
+            return added
+
+    @staticmethod
+    def _adjustment_changed(local: KlineArrays, remote: KlineArrays) -> bool:
+        """本地最后一根K线与远端同日收盘价不一致，说明复权基准变了"""
+        last = local['date'][-1]
+        idx = np.searchsorted(remote['date'], last)
+        if idx >= len(remote['date']) or remote['date'][idx] != last:
+            return False
+        return not np.isclose(remote['close'][idx], local['close'][-1],
+                              rtol=1e-6, equal_nan=True)
+
+    def sync_many(self, api, stock_codes: Iterable[str], period: str = "dq",
+                  max_workers: int = 8) -> Dict[str, int]:
+        """并发同步多只股票，返回 股票代码 → 新增K线根数"""
+        codes = list(dict.fromkeys(stock_codes))
+        if not codes:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(codes)),
+                                thread_name_prefix="kline-sync") as pool:
+            futures = {code: pool.submit(self.sync, api, code, period) for code in codes}
+            added: Dict[str, int] = {}
+            for code, future in futures.items():
+                try:
+                    added[code] = future.result()
+                except Exception as e:
+                    print(f"同步 {code} K线失败: {e}")
+                    added[code] = 0
+        return added
+
+    def get_arrays(self, api, stock_code: str, period: str = "dq",
+                   lookback: Optional[int] = None) -> KlineArrays:
+        """先同步（见 :meth:`sync`），再返回本地K线数组
+
+        Args:
+            lookback: 只返回最近 N 根K线；默认全部
+        """
+        try:
+            self.sync(api, stock_code, period)
+        except Exception as e:
+            # 同步失败时退回本地已有数据
+            print(f"同步 {stock_code} K线失败，使用本地数据: {e}")
+        arrays = self.load(stock_code, period)
+        if lookback:
+            arrays = {name: values[-lookback:] for name, values in arrays.items()}
+        return arrays
+
+
+_default_store: Optional[KlineStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_kline_store() -> KlineStore:
+    """进程内共享的默认K线仓库（目录取 ``KLINE_STORE_DIR``，默认 ``data/klines``）"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = KlineStore(os.getenv("KLINE_STORE_DIR", "data/klines"))
+        return _default_store
@@ -1,11 +1,21 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
-import re
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import List, Dict, Optional
+from datetime import datetime
 import time
 import os
 from dotenv import load_dotenv
+
+from .article_cache import ArticleCache
+from .dedup import NewsIndex, dedup_news, news_fingerprint
+from .endpoints import get_endpoint_selector
+from .extractor_memory import ExtractorMemory, host_of
+from .fetch_pool import HostThrottledPool
+from .html_extract import extract_links, extract_news_list, get_extractor
+from .news_watermarks import NewsWatermarks, parse_news_time
+from .rate_limit import get_rate_limiter
+from .singleflight import get_singleflight, make_key
+
 load_dotenv()
 
 class NewsDataFetcher:
@@ -14,144 +24,275 @@ class NewsDataFetcher:
     BASE_URL = "http://api.mairui.club"
     BACKUP_URL = "http://api1.mairui.club"
     LICENSE = os.getenv('MAIRUI_LICENSE')
+    # 同一次运行内个股新闻复用结果的时长（秒）
+    STOCK_NEWS_MEMO_TTL = 600
+    # 个股新闻最多下载正文的条数，以及列表页最多往回翻的页数
+    STOCK_NEWS_LIMIT = 10
+    STOCK_NEWS_MAX_PAGES = 5
+    # 每日新闻：当前来源多久没返回就并行启动下一个来源，以及整体最长等待（秒）
+    DAILY_NEWS_HEDGE_DELAY = 2.0
+    DAILY_NEWS_DEADLINE = 20.0
     
-    def __init__(self):
+    def __init__(self, article_cache: Optional[ArticleCache] = None,
+                 extractor_memory: Optional[ExtractorMemory] = None):
+        """
+        Args:
+            article_cache: 文章正文缓存；不传则首次抓取正文时创建默认缓存
+            extractor_memory: 按站点学习的正文选择器统计；不传则首次提取正文时创建
+        """
+        self._article_cache = article_cache
+        self._extractor_memory = extractor_memory
         self.session = requests.Session()
+        self.endpoints = get_endpoint_selector("mairui", (self.BASE_URL, self.BACKUP_URL))
+        # 文章正文并发抓取：每个主机最多 2 个并发、相邻请求间隔 0.5s
+        self.article_pool = HostThrottledPool(max_workers=8, per_host=2, delay=0.5)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
     
-    def _request(self, endpoint: str) -> List[Dict]:
+    def _request(self, endpoint: str, timeout: float = 10) -> List[Dict]:
         """发送API请求
 
-        主接口失败时自动降级到备用接口；主备都失败时返回 ``[]``
+        主备接口的尝试顺序由与 ``MaiRuiStockAPI`` 共享的主机选择器决定
+        （主站熔断时直接走备用站）；全部失败时返回 ``[]``
         而不是让异常逃逸（避免主流程被网络抖动打挂）。
 
         Args:
             endpoint: API端点
+            timeout: 单次请求超时（秒）
 
         Returns:
             List[Dict]: JSON响应数据；失败时返回空列表
         """
-        url = f"{self.BASE_URL}/{endpoint}/{self.LICENSE}"
-
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.json()
-        except (requests.RequestException, ValueError):
-            # 主接口失败（网络 / HTTP / JSON 解析）时尝试备用接口
+        last_error = None
+        for host in self.endpoints.candidates():
+            url = f"{host}/{endpoint}/{self.LICENSE}"
+            get_rate_limiter("mairui").acquire()
+            started = time.monotonic()
             try:
-                backup_url = f"{self.BACKUP_URL}/{endpoint}/{self.LICENSE}"
-                response = self.session.get(backup_url)
+                response = self.session.get(url, timeout=timeout)
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
             except (requests.RequestException, ValueError) as e:
-                # 主备都失败：打印告警并返回空列表，让调用方走降级路径
-                print(f"麦蕊 API 主备均失败 ({endpoint}): {e}")
-                return []
+                # 网络 / HTTP / JSON 解析失败：记一次失败，换下一个主机
+                self.endpoints.record_failure(host, time.monotonic() - started)
+                last_error = e
+                continue
+            except BaseException:
+                # 其他异常不计入健康度，但要交还半开探测名额
+                self.endpoints.release(host)
+                raise
+            self.endpoints.record_success(host, time.monotonic() - started)
+            return data
 
-    def get_daily_news(self, min_count: int = 20) -> List[Dict]:
+        # 主备都失败：打印告警并返回空列表，让调用方走降级路径
+        print(f"麦蕊 API 主备均失败 ({endpoint}): {last_error}")
+        return []
+
+    def get_daily_news(self, min_count: int = 20,
+                       hedge_delay: Optional[float] = None) -> List[Dict]:
         """获取每日财经新闻
 
-        优先使用 Tanshu API（需 TANSHU_API_KEY），
-        失败时自动降级到新浪财经免费 feed（无需 key）。
+        来源按优先级为 Tanshu API（需 TANSHU_API_KEY）→ 新浪财经滚动 feed →
+        新浪财经首页抓取。不再逐个等超时：先请求第一个来源，``hedge_delay``
+        秒内没有凑够就并行启动下一个（某个来源失败 / 条数不够时立即启动），
+        结果按来源优先级合并去重，凑够 ``min_count`` 条有正文的新闻即返回。
 
         Args:
             min_count: 最少获取的新闻条数
+            hedge_delay: 启动下一个来源前等待的秒数，默认 ``DAILY_NEWS_HEDGE_DELAY``
 
         Returns:
             List[Dict]: 新闻列表，每条含 title/content/source/time/url
         """
+        sources = []
         api_key = os.getenv("TANSHU_API_KEY")
         if api_key:
-            try:
-                url = "https://api.tanshuapi.com/api/toutiao/v1/index"
-                params = {
-                    "key": api_key,
-                    "type": "股票",
-                    "num": max(min_count, 40),
-                    "start": 0,
-                }
-                response = requests.get(url, params=params, timeout=10)
-                data = response.json()
-
-                if data.get("code") == 1:
-                    news_list = []
-                    for news in data.get("data", {}).get("list", []):
-                        try:
-                            item = {
-                                "title": news.get("title", ""),
-                                "content": news.get("content", ""),
-                                "source": news.get("src", ""),
-                                "time": news.get("time", ""),
-                                "url": news.get("weburl", ""),
-                            }
-                            if item["title"] and item["content"]:
-                                news_list.append(item)
-                        except Exception:
-                            continue
-                    if news_list:
-                        return news_list[:min_count]
-                    print("Tanshu API 返回空列表，降级到新浪 feed")
-                else:
-                    print(f"Tanshu API 返回错误: {data.get('msg')}，降级到新浪 feed")
-            except Exception as e:
-                print(f"Tanshu API 请求失败: {e}，降级到新浪 feed")
+            sources.append(("Tanshu API", lambda: self._fetch_tanshu_page(api_key, max(min_count, 40))))
         else:
             print("未配置 TANSHU_API_KEY，使用新浪财经免费 feed")
+        sources.append(("新浪财经 feed", lambda: self._fetch_sina_roll_page(min_count)))
+        sources.append(("新浪首页", lambda: self._scrape_sina_finance_page(min_count)))
+
+        delay = self.DAILY_NEWS_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        return self._hedged_fetch(sources, min_count, delay)
+
+    def _hedged_fetch(self, sources: List, min_count: int, delay: float) -> List[Dict]:
+        """按优先级对冲请求多个新闻来源，凑够 ``min_count`` 条即返回"""
+        results: Dict[int, List[Dict]] = {}
+
+        def merged() -> List[Dict]:
+            return dedup_news([news for i in sorted(results) for news in results[i]])
 
-        # ── 备选：新浪财经免费新闻 feed ──
-        return self._fetch_sina_daily_news(min_count)
+        def enough(news_list: List[Dict]) -> bool:
+            # 只有标题的条目（首页抓取）不算数，等更好的来源
+            return sum(1 for news in news_list if news.get('content') != news.get('title')) >= min_count
+
+        executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="daily-news")
+        pending: Dict[Future, int] = {}
+        deadline = time.monotonic() + self.DAILY_NEWS_DEADLINE
+
+        def launch_next() -> None:
+            index = len(pending) + len(results)
+            if index < len(sources):
+                pending[executor.submit(sources[index][1])] = index
 
-    def _fetch_sina_daily_news(self, min_count: int = 20) -> List[Dict]:
-        """使用新浪财经免费 feed 获取每日新闻（无需 API key）。"""
         try:
-            url = "https://feed.mix.sina.com.cn/api/roll/get"
-            params = {
-                "pageid": "153",  # 新浪财经新闻
-                "lid": "2516",    # 国内财经
-                "knum": min_count,
-                "page": "1",
-            }
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                "Referer": "https://finance.sina.com.cn/",
-            }
-            response = requests.get(url, params=params, headers=headers, timeout=15)
-            data = response.json()
+            launch_next()
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print("每日新闻获取超时，返回已有结果")
+                    break
+                has_backup = len(pending) + len(results) < len(sources)
+                done, _ = wait(pending, timeout=min(delay, remaining) if has_backup else remaining,
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    # 当前来源迟迟没有返回：对冲启动下一个
+                    if has_backup:
+                        print(f"{sources[len(pending) + len(results) - 1][0]} 响应慢，"
+                              f"并行请求 {sources[len(pending) + len(results)][0]}")
+                        launch_next()
+                    continue
+                for future in done:
+                    index = pending.pop(future)
+                    name = sources[index][0]
+                    try:
+                        results[index] = future.result() or []
+                        print(f"{name} 获取到 {len(results[index])} 条新闻")
+                    except Exception as e:
+                        print(f"{name} 请求失败: {e}")
+                        results[index] = []
+                news_list = merged()
+                if enough(news_list):
+                    return news_list[:min_count]
+                # 已返回的来源不够用：不再等，直接启动下一个
+                if not pending:
+                    launch_next()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-            news_list = []
-            for item in data.get("result", {}).get("data", []):
+        return merged()[:min_count]
+
+    def get_new_daily_news(self, watermarks: NewsWatermarks, max_pages: int = 3,
+                           page_size: int = 40) -> List[Dict]:
+        """增量获取每日财经新闻：只返回比上次水位线新的条目
+
+        与 :meth:`get_daily_news` 相同的来源优先级（Tanshu → 新浪 feed），
+        每个来源单独记水位线。按页往回翻，遇到已见过的条目即停止；
+        首次抓取（还没有水位线）只取第一页。某一页抓取失败时停止翻页，
+        返回前面几页已取到的条目，水位线只推进到实际返回的条目；
+        第一页就失败时换下一个来源。
+
+        Args:
+            watermarks: 水位线存储
+            max_pages: 最多翻几页
+            page_size: 每页条数
+
+        Returns:
+            List[Dict]: 新增新闻（已去重），没有新内容时为空列表
+        """
+        sources = []
+        api_key = os.getenv("TANSHU_API_KEY")
+        if api_key:
+            sources.append(("tanshu", lambda page: self._fetch_tanshu_page(
+                api_key, page_size, start=(page - 1) * page_size)))
+        sources.append(("sina_roll", lambda page: self._fetch_sina_roll_page(page_size, page)))
+
+        for source, fetch_page in sources:
+            fresh = []
+            failed = False
+            for page in range(1, max_pages + 1):
                 try:
-                    title = item.get("title", "").strip()
-                    intro = item.get("intro", "").strip()
-                    content = intro or title
-                    if title:
-                        news_list.append({
-                            "title": title,
-                            "content": content,
-                            "source": item.get("media_name", "新浪财经"),
-                            "time": item.get("ctime", ""),
-                            "url": item.get("url", ""),
-                        })
-                except Exception:
-                    continue
+                    items = fetch_page(page)
+                except Exception as e:
+                    print(f"{source} 增量抓取第 {page} 页失败: {e}")
+                    failed = True
+                    break
+                if not items:
+                    break
+                new_items = watermarks.filter_new(source, items)
+                fresh.extend(new_items)
+                # 本页出现了旧条目，或者首次抓取：不再往回翻
+                if len(new_items) < len(items) or not watermarks.has(source):
+                    break
+            if failed and not fresh:
+                continue
+            fresh = dedup_news(fresh)
+            watermarks.advance(source, fresh)
+            print(f"{source} 新增 {len(fresh)} 条新闻")
+            return fresh
+        return []
 
-            if not news_list:
-                print("新浪 feed 返回空列表，尝试备用页面抓取...")
-                return self._scrape_sina_finance_page(min_count)
+    def _fetch_tanshu_page(self, api_key: str, num: int, start: int = 0) -> List[Dict]:
+        """请求一页 Tanshu 股票新闻；接口报错时抛 ``ValueError``"""
+        url = "https://api.tanshuapi.com/api/toutiao/v1/index"
+        params = {
+            "key": api_key,
+            "type": "股票",
+            "num": num,
+            "start": start,
+        }
+        get_rate_limiter("tanshu").acquire()
+        response = requests.get(url, params=params, timeout=10)
+        data = response.json()
+        if data.get("code") != 1:
+            raise ValueError(f"接口返回错误: {data.get('msg')}")
 
-            print(f"新浪财经 feed 获取到 {len(news_list)} 条新闻")
-            return news_list[:min_count]
+        news_list = []
+        for news in data.get("data", {}).get("list", []):
+            try:
+                item = {
+                    "title": news.get("title", ""),
+                    "content": news.get("content", ""),
+                    "source": news.get("src", ""),
+                    "time": news.get("time", ""),
+                    "url": news.get("weburl", ""),
+                }
+                if item["title"] and item["content"]:
+                    news_list.append(item)
+            except Exception:
+                continue
+        return news_list
 
-        except Exception as e:
-            print(f"新浪 feed 请求失败: {e}，尝试页面抓取...")
-            return self._scrape_sina_finance_page(min_count)
+    def _fetch_sina_roll_page(self, num: int, page: int = 1) -> List[Dict]:
+        """请求一页新浪财经滚动新闻 feed"""
+        url = "https://feed.mix.sina.com.cn/api/roll/get"
+        params = {
+            "pageid": "153",  # 新浪财经新闻
+            "lid": "2516",    # 国内财经
+            "knum": num,
+            "page": str(page),
+        }
+        headers = {
+            "User-Agent": (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0.0.0 Safari/537.36"
+            ),
+            "Referer": "https://finance.sina.com.cn/",
+        }
+        get_rate_limiter("sina").acquire()
+        response = requests.get(url, params=params, headers=headers, timeout=15)
+        data = response.json()
+
+        news_list = []
+        for item in data.get("result", {}).get("data", []):
+            try:
+                title = item.get("title", "").strip()
+                intro = item.get("intro", "").strip()
+                content = intro or title
+                if title:
+                    news_list.append({
+                        "title": title,
+                        "content": content,
+                        "source": item.get("media_name", "新浪财经"),
+                        "time": item.get("ctime", ""),
+                        "url": item.get("url", ""),
+                    })
+            except Exception:
+                continue
+        return news_list
 
     def _scrape_sina_finance_page(self, min_count: int = 20) -> List[Dict]:
         """终极备选：直接解析新浪财经首页的新闻列表。"""
@@ -163,24 +304,28 @@ class NewsDataFetcher:
                     "AppleWebKit/537.36"
                 ),
             }
+            get_rate_limiter("sina").acquire()
             response = requests.get(url, headers=headers, timeout=15)
-            response.encoding = "utf-8"
-            soup = BeautifulSoup(response.text, "html.parser")
 
             news_list = []
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                title = a.text.strip()
+            # 首页同一条新闻常出现在多个栏目里，边收集边去重
+            seen = NewsIndex()
+            for href, title in extract_links(response.content, response.headers.get("Content-Type")):
                 if not title or len(title) < 8:
                     continue
                 if "finance.sina.com.cn" in href or "https://" in href:
-                    news_list.append({
+                    news = {
                         "title": title,
                         "content": title,
                         "source": "新浪财经",
                         "time": datetime.now().strftime("%Y-%m-%d %H:%M"),
                         "url": href,
-                    })
+                    }
+                    fingerprints = news_fingerprint(news)
+                    if seen.seen(fingerprints):
+                        continue
+                    seen.add(fingerprints)
+                    news_list.append(news)
                     if len(news_list) >= min_count:
                         break
 
@@ -193,11 +338,36 @@ class NewsDataFetcher:
 
     def get_stock_news(self, stock_code: str, days: int = 7) -> List[Dict]:
         """获取个股新闻
-        
+
+        同一只股票在同一次运行中（持仓分析 + 市场扫描）可能被请求多次，
+        ``STOCK_NEWS_MEMO_TTL`` 内相同请求共享一次抓取结果。
+
+        只下载发布时间在最近 ``days`` 天内的新闻正文（时间取自新浪列表页），
+        列表按时间倒序逐页往回翻，遇到窗口外的条目即停止。
+
         Args:
             stock_code: 股票代码
             days: 获取最近几天的新闻，默认7天
         """
+        return get_singleflight().do(
+            make_key("sina", "stock_news", {"code": stock_code, "days": days}),
+            self._get_stock_news, stock_code, days,
+            ttl=self.STOCK_NEWS_MEMO_TTL,
+        )
+
+    def get_new_stock_news(self, stock_code: str, watermarks: NewsWatermarks) -> List[Dict]:
+        """增量获取个股新闻：列表页里已经抓过的链接不再下载正文
+
+        水位线来源名为 ``sina_stock:<代码>``；不走请求合并的运行期记忆。
+        """
+        return self._get_stock_news(stock_code, watermarks=watermarks)
+
+    def _get_stock_news(self, stock_code: str, days: int = 7,
+                        watermarks: Optional[NewsWatermarks] = None) -> List[Dict]:
+        """实际抓取个股新闻（不经过请求合并）
+
+        传入 ``watermarks`` 时只抓水位线之后的新链接，并在抓完后推进水位线。
+        """
         try:
             # 处理股票代码格式
             if stock_code.startswith('6'):
@@ -208,85 +378,58 @@ class NewsDataFetcher:
                 print(f"不支持的股票代码格式: {stock_code}")
                 return []
             
-            # 获取新闻列表页面
-            list_url = f'https://vip.stock.finance.sina.com.cn/corp/go.php/vCB_AllNewsStock/symbol/{sina_code}.phtml'
-            print(f"正在获取新闻列表，URL: {list_url}")
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2',
-                'Referer': 'https://vip.stock.finance.sina.com.cn',
-            }
-            
-            response = self.session.get(list_url, headers=headers, timeout=10)
-            response.encoding = 'gb2312'  # 新浪财经使用 GB2312 编码
-            
-            # 解析新闻列表页面
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找新闻表格
-            news_table = soup.find('table', {'id': 'con02-0'})
-            if not news_table:
-                print("未找到主新闻表格，尝试查找其他新闻链接...")
-                news_links = []
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
-                    if any(domain in href for domain in ['finance.sina.com.cn', 'sina.com.cn']) and '/' in href:
-                        title = a.text.strip()
-                        if title and len(title) > 5:  # 过滤掉太短的标题
-                            news_links.append({
-                                'title': title,
-                                'url': href if href.startswith('http') else f'https:{href}'
-                            })
-            else:
-                # 从表格中提取新闻链接
-                news_links = []
-                for row in news_table.find_all('tr')[1:]:  # 跳过表头
-                    cols = row.find_all('td')
-                    if len(cols) >= 2:
-                        link = cols[1].find('a')
-                        if link and link.has_attr('href'):
-                            title = link.text.strip()
-                            url = link['href']
-                            if title and url:
-                                news_links.append({
-                                    'title': title,
-                                    'url': url if url.startswith('http') else f'https:{url}'
-                                })
-            
+            source = f"sina_stock:{stock_code}"
+            cutoff = time.time() - days * 86400
+            news_links = []
+            for page in range(1, self.STOCK_NEWS_MAX_PAGES + 1):
+                links = self._fetch_stock_news_page(sina_code, page)
+                if not links:
+                    break
+                # 列表按时间倒序：超出时间窗口或碰到水位线之前见过的条目，后面的都不用看了
+                in_window = [
+                    link for link in links
+                    if link['published'] is None or link['published'] >= cutoff
+                ]
+                fresh = watermarks.filter_new(source, in_window) if watermarks is not None else in_window
+                news_links.extend(fresh)
+                if (len(fresh) < len(links) or len(news_links) >= self.STOCK_NEWS_LIMIT
+                        or all(link['published'] is None for link in links)):
+                    break
+
             if not news_links:
-                print(f"未找到股票 {stock_code} 的相关新闻链接")
+                print(f"股票 {stock_code} 最近 {days} 天没有{'新的' if watermarks is not None else ''}新闻")
                 return []
             
-            print(f"找到 {len(news_links)} 条新闻链接，获取最新的10条新闻内容...")
+            print(f"找到 {len(news_links)} 条新闻链接，获取最新的{self.STOCK_NEWS_LIMIT}条新闻内容...")
             
-            # 获取每条新闻的详细内容
+            # 并发获取每条新闻的详细内容（按主机限并发 + 限间隔），结果保持列表顺序
+            selected = news_links[:self.STOCK_NEWS_LIMIT]
+            contents = self.article_pool.map(
+                self._fetch_news_content, [news['url'] for news in selected], default=""
+            )
             news_list = []
-            for news in news_links[:10]:  # 限制获取最新的10条新闻
-                try:
-                    print(f"\n正在获取新闻: {news['title']}")
-                    print(f"URL: {news['url']}")
-                    
-                    content = self._fetch_news_content(news['url'])
-                    if content and len(content) > 100:  # 确保内容有足够长度
-                        news_list.append({
-                            'title': news['title'],
-                            'content': content,
-                            'url': news['url'],
-                            'time': datetime.now().strftime('%Y-%m-%d'),  # 使用当前日期
-                            'source': '新浪财经'
-                        })
-                        print(f"✓ 成功获取新闻内容 ({len(content)} 字)")
-                    else:
-                        print("✗ 新闻内容太短或获取失败")
-                except Exception as e:
-                    print(f"✗ 获取新闻失败: {str(e)}")
-                    continue
-                
-                # 添加延时，避免请求过快
-                time.sleep(1)
+            for news, content in zip(selected, contents):
+                print(f"\n新闻: {news['title']}")
+                print(f"URL: {news['url']}")
+                if content and len(content) > 100:  # 确保内容有足够长度
+                    news_list.append({
+                        'title': news['title'],
+                        'content': content,
+                        'url': news['url'],
+                        # 列表页上的发布时间；解析不到时才用抓取时间
+                        'time': news['time'] or datetime.now().strftime('%Y-%m-%d %H:%M'),
+                        'source': '新浪财经'
+                    })
+                    print(f"✓ 成功获取新闻内容 ({len(content)} 字)")
+                else:
+                    print("✗ 新闻内容太短或获取失败")
             
+            if watermarks is not None:
+                # 已尝试过的链接都记入水位线（正文过短的下次也不再重试）
+                watermarks.advance(source, selected)
+
+            # 个股新闻页常把同一事件的多家转载都列出来
+            news_list = dedup_news(news_list)
             print(f"\n成功获取 {len(news_list)} 条完整新闻")
             return news_list
             
@@ -294,57 +437,120 @@ class NewsDataFetcher:
             print(f"获取股票新闻失败: {str(e)}")
             return []
 
+    def _fetch_stock_news_page(self, sina_code: str, page: int = 1) -> List[Dict]:
+        """请求并解析一页新浪个股新闻列表
+
+        Returns:
+            List[Dict]: 每条含 title/url/time（列表页上的原始时间字符串）/
+            published（时间戳，解析不到为 ``None``）
+        """
+        list_url = f'https://vip.stock.finance.sina.com.cn/corp/go.php/vCB_AllNewsStock/symbol/{sina_code}.phtml'
+        params = {'Page': page} if page > 1 else None
+        print(f"正在获取新闻列表，URL: {list_url}" + (f" (第 {page} 页)" if page > 1 else ""))
+
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2',
+            'Referer': 'https://vip.stock.finance.sina.com.cn',
+        }
+
+        get_rate_limiter("sina").acquire()
+        response = self.session.get(list_url, params=params, headers=headers, timeout=10)
+
+        # 只解析新闻列表容器；新浪列表页是 GB2312，响应头 / 页面都没声明编码时按 GB 系解码
+        content_type = response.headers.get('Content-Type')
+        entries = extract_news_list(response.content, content_type, default_charset='gb18030')
+        news_links = []
+        if entries is None:
+            if page > 1:
+                return []
+            print("未找到新闻列表，尝试查找其他新闻链接...")
+            entries = [
+                (href, title, None)
+                for href, title in extract_links(response.content, content_type,
+                                                 default_charset='gb18030')
+                if any(domain in href for domain in ['finance.sina.com.cn', 'sina.com.cn'])
+                and '/' in href and len(title) > 5  # 过滤掉太短的标题
+            ]
+        for url, title, stamp in entries:
+            if title and url:
+                news_links.append({
+                    'title': title,
+                    'url': url if url.startswith('http') else f'https:{url}',
+                    'time': stamp,
+                    'published': parse_news_time(stamp),
+                })
+        return news_links
+
+    @property
+    def article_cache(self) -> ArticleCache:
+        """文章正文缓存（首次使用时创建，默认与分析结果同库）"""
+        if self._article_cache is None:
+            self._article_cache = ArticleCache()
+        return self._article_cache
+
+    @property
+    def extractor_memory(self) -> ExtractorMemory:
+        """按站点学习的正文选择器统计（首次使用时创建，默认与分析结果同库）"""
+        if self._extractor_memory is None:
+            self._extractor_memory = ExtractorMemory()
+        return self._extractor_memory
+
     def _fetch_news_content(self, url: str) -> str:
-        """获取新闻内容"""
+        """获取新闻内容
+
+        先查正文缓存：新鲜的直接返回；过期的带 ETag / Last-Modified
+        发条件请求，304 时沿用缓存正文。
+        """
         try:
+            cached = self.article_cache.get(url)
+            if cached and cached['fresh'] and cached['content']:
+                self.article_cache.record('hits')
+                return cached['content']
+
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
                 'Accept-Language': 'zh-CN,zh;q=0.8,zh-TW;q=0.7,zh-HK;q=0.5,en-US;q=0.3,en;q=0.2',
                 'Referer': 'https://vip.stock.finance.sina.com.cn',
             }
+            headers.update(ArticleCache.conditional_headers(cached))
             
+            # 新浪共享令牌桶控总速率；单主机的并发 / 间隔由 article_pool 控制
+            get_rate_limiter("sina").acquire()
             response = self.session.get(url, headers=headers, timeout=10)
-            
-            # 自动检测编码
-            if 'charset=gb2312' in response.text or 'charset=GB2312' in response.text:
-                response.encoding = 'gb2312'
-            else:
-                response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 尝试多个可能的新闻内容容器
-            content_selectors = [
-                {'id': 'artibody'},
-                {'class_': 'article-content'},
-                {'class_': 'article'},
-                {'class_': 'content'},
-                {'id': 'article_content'},
-                {'class_': 'main-content'},
-            ]
-            
-            for selector in content_selectors:
-                content_div = soup.find('div', **selector)
-                if content_div:
-                    # 移除不需要的元素
-                    for unwanted in content_div.find_all(['script', 'style', 'iframe', 'div', 'table']):
-                        unwanted.decompose()
-                    
-                    # 获取段落文本
-                    paragraphs = []
-                    for p in content_div.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                        text = p.get_text(strip=True)
-                        if text and len(text) > 10:  # 过滤掉太短的段落
-                            paragraphs.append(text)
-                    
-                    if paragraphs:
-                        content = ' '.join(paragraphs)
-                        content = re.sub(r'\s+', ' ', content)
-                        return content[:2000]  # 限制内容长度
-            
-            return ""
+
+            if response.status_code == 304 and cached:
+                self.article_cache.record('revalidated')
+                self.article_cache.touch(url)
+                return cached['content']
+            self.article_cache.record('misses')
+
+            content = self._extract_article_text(response)
+            if content:
+                self.article_cache.put(
+                    url, content,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                )
+            return content
             
         except Exception as e:
             print(f"获取新闻内容失败 {url}: {str(e)}")
-            return ""
\ No newline at end of file
+            return ""
+
+    def _extract_article_text(self, response: requests.Response) -> str:
+        """从文章页面响应中提取正文
+
+        解析后端见 ``html_extract``（默认 lxml，可用 ``NEWS_HTML_BACKEND`` 切换）；
+        编码由原始字节和 ``Content-Type`` 判断，不再对整页先解码再搜 charset。
+        选择器按站点的历史命中情况排序，先试该站点上次命中的容器。
+        """
+        host = host_of(response.url or '')
+        selectors = self.extractor_memory.order(host)
+        content, matched = get_extractor().extract_with_selector(
+            response.content, response.headers.get('Content-Type'), selectors
+        )
+        self.extractor_memory.record(host, selectors, matched)
+        return content
@@ -0,0 +1,110 @@
+"""后台新闻轮询 — 按水位线增量抓取，新增新闻直接写入 ``news_data``。
+
+每轮：
+
+1. 大盘新闻：:meth:`NewsDataFetcher.get_new_daily_news`（Tanshu → 新浪 feed）
+2. 关注股票：逐只 :meth:`NewsDataFetcher.get_new_stock_news`
+
+只有比水位线新的条目才会被下载正文和入库，一轮通常只有几个列表请求。
+可以嵌入程序（``NewsPoller(...).start()``），也可以单独运行::
+
+    python -m src.data.news_poller 600036 000858 --interval 300
+"""
+
+import argparse
+import threading
+from typing import Dict, Iterable, Optional
+
+from .database import DatabaseManager
+from .news_data import NewsDataFetcher
+from .news_watermarks import NewsWatermarks
+
+
+class NewsPoller:
+    """增量新闻轮询器"""
+
+    def __init__(self, news_api: Optional[NewsDataFetcher] = None,
+                 db: Optional[DatabaseManager] = None,
+                 codes: Iterable[str] = (), interval: float = 300,
+                 watermarks: Optional[NewsWatermarks] = None):
+        """
+        Args:
+            news_api: 新闻获取器
+            db: 数据库（新闻写入 ``news_data``）
+            codes: 需要轮询个股新闻的股票代码
+            interval: 两轮之间的间隔（秒）
+            watermarks: 水位线存储，默认与 ``db`` 同库
+        """
+        self.news_api = news_api or NewsDataFetcher()
+        self.db = db or DatabaseManager()
+        self.codes = list(dict.fromkeys(codes))
+        self.interval = interval
+        self.watermarks = watermarks or NewsWatermarks(self.db.db_path)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll_once(self) -> Dict[str, int]:
+        """执行一轮增量抓取，返回各来源新入库的条数（``market`` 为大盘新闻）"""
+        counts = {}
+        market_news = self.news_api.get_new_daily_news(self.watermarks)
+        self.db.save_news(market_news)
+        counts['market'] = len(market_news)
+        for code in self.codes:
+            if self._stop.is_set():
+                break
+            news_list = self.news_api.get_new_stock_news(code, self.watermarks)
+            self.db.save_news(news_list, code)
+            counts[code] = len(news_list)
+        return counts
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                counts = self.poll_once()
+                print(f"新闻轮询完成: {counts}")
+            except Exception as e:
+                print(f"新闻轮询出错: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """在后台线程中开始轮询（已在运行时不重复启动）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="news-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """停止轮询（当前这一轮抓完后退出）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="增量新闻轮询，新增新闻写入 news_data")
+    parser.add_argument('codes', nargs='*', help='需要轮询个股新闻的股票代码')
+    parser.add_argument('--interval', type=float, default=300, help='轮询间隔（秒）')
+    parser.add_argument('--once', action='store_true', help='只执行一轮')
+    args = parser.parse_args()
+
+    poller = NewsPoller(codes=args.codes, interval=args.interval)
+    if args.once:
+        print(poller.poll_once())
+        return
+    poller.start()
+    try:
+        while poller.running:
+            poller._thread.join(1)
+    except KeyboardInterrupt:
+        print("\n正在停止新闻轮询...")
+        poller.stop()
+
+
+if __name__ == '__main__':
+    main()
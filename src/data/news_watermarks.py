@@ -0,0 +1,183 @@
+"""新闻抓取水位线 — 按来源记录已抓到的最新时间和最近见过的 URL。
+
+之前每次运行都重新拉取 Tanshu / 新浪 feed 的前 N 条、重新抓个股新闻页的
+全部正文，不管上次已经拿到了什么。这里为每个来源（``tanshu``、``sina_roll``、
+``sina_stock:600519`` ……）维护一条水位线（SQLite，默认与分析结果同库，
+``news_watermarks`` 表）：
+
+- ``latest_time``：已见过的最新发布时间
+- ``recent``：最近见过的若干条 URL（规范化后；没有 URL 时用标题）
+
+时间早于水位线、或 URL 已见过的条目视为旧新闻；没有可解析时间的来源
+（个股新闻列表）只靠 URL 判断。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from .article_cache import normalize_url
+
+# 每个来源保留多少条最近见过的 URL
+MAX_RECENT = 500
+
+_TIME_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%Y/%m/%d %H:%M:%S',
+    '%Y/%m/%d %H:%M',
+    '%Y/%m/%d',
+    '%Y%m%d',
+)
+
+
+def parse_news_time(value: Any) -> Optional[float]:
+    """把新闻时间解析成时间戳（秒）
+
+    支持 Unix 时间戳（秒 / 毫秒，数字或数字字符串）和常见的日期时间字符串；
+    解析不了时返回 ``None``。
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        number = float(value)
+        return number / 1000 if number > 1e11 else number
+    text = str(value).strip()
+    if text.isdigit() and len(text) in (10, 13):
+        return parse_news_time(int(text))
+    # 去掉 ISO 格式里的 T / 小数秒
+    text = text.replace('T', ' ').split('.')[0]
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def _item_key(item: Dict) -> str:
+    url = item.get('url')
+    return normalize_url(url) if url else f"title:{item.get('title', '')}"
+
+
+class _Watermark:
+    __slots__ = ('latest_time', 'recent', 'recent_set')
+
+    def __init__(self, latest_time: Optional[float] = None, recent: Sequence[str] = ()):
+        self.latest_time = latest_time
+        self.recent = list(recent)
+        self.recent_set = set(self.recent)
+
+
+class NewsWatermarks:
+    """各新闻来源的水位线（线程安全）"""
+
+    def __init__(self, db_path: str = "data/stock_analysis.db"):
+        """
+        Args:
+            db_path: SQLite 文件路径（默认与 DatabaseManager 同库）
+        """
+        dirname = os.path.dirname(db_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.db_path = db_path
+        self._marks: Dict[str, _Watermark] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS news_watermarks (
+                        source TEXT PRIMARY KEY,
+                        latest_time REAL,
+                        recent TEXT,
+                        updated_at REAL
+                    )
+                """)
+                rows = conn.execute(
+                    "SELECT source, latest_time, recent FROM news_watermarks"
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"读取新闻水位线失败: {e}")
+            return
+        for source, latest_time, recent in rows:
+            try:
+                keys = json.loads(recent or '[]')
+            except ValueError:
+                keys = []
+            self._marks[source] = _Watermark(latest_time, keys)
+
+    def has(self, source: str) -> bool:
+        """该来源是否已有水位线（首次抓取时没有）"""
+        with self._lock:
+            return source in self._marks
+
+    def latest_time(self, source: str) -> Optional[float]:
+        with self._lock:
+            mark = self._marks.get(source)
+            return mark.latest_time if mark else None
+
+    def is_new(self, source: str, item: Dict) -> bool:
+        """条目是否比水位线新"""
+        with self._lock:
+            mark = self._marks.get(source)
+            if mark is None:
+                return True
+            if _item_key(item) in mark.recent_set:
+                return False
+            published = parse_news_time(item.get('time'))
+            return published is None or mark.latest_time is None or published >= mark.latest_time
+
+    def filter_new(self, source: str, items: Sequence[Dict]) -> List[Dict]:
+        """只保留比水位线新的条目（保持原顺序）"""
+        return [item for item in items if self.is_new(source, item)]
+
+    def advance(self, source: str, items: Sequence[Dict]) -> None:
+        """把这批条目记入水位线并落盘"""
+        if not items:
+            return
+        with self._lock:
+            mark = self._marks.get(source) or _Watermark()
+            times = [t for t in (parse_news_time(item.get('time')) for item in items) if t is not None]
+            if times:
+                mark.latest_time = max([mark.latest_time or 0.0] + times)
+            keys = [key for key in (_item_key(item) for item in items) if key not in mark.recent_set]
+            mark.recent = (keys + mark.recent)[:MAX_RECENT]
+            mark.recent_set = set(mark.recent)
+            self._marks[source] = mark
+            row = (source, mark.latest_time, json.dumps(mark.recent, ensure_ascii=False), time.time())
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO news_watermarks (source, latest_time, recent, updated_at)
+                    VALUES (?, ?, ?, ?)
+                """, row)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"保存新闻水位线失败: {e}")
+
+    def reset(self, source: Optional[str] = None) -> None:
+        """清除某个来源（不传则全部）的水位线，下次全量抓取"""
+        with self._lock:
+            if source is None:
+                self._marks.clear()
+            else:
+                self._marks.pop(source, None)
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                if source is None:
+                    conn.execute("DELETE FROM news_watermarks")
+                else:
+                    conn.execute("DELETE FROM news_watermarks WHERE source = ?", (source,))
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"清除新闻水位线失败: {e}")
@@ -0,0 +1,147 @@
+"""进程级限流器 — 每个数据源一个令牌桶，线程和 asyncio 都能用。
+
+麦蕊、新浪、Tanshu 各有调用频率限制，之前要么完全不控速
+（``MaiRuiStockAPI``），要么每篇文章固定 ``time.sleep(1)``。这里为每个
+数据源维护一个令牌桶（速率 + 突发容量），所有客户端发请求前先取令牌：
+并发请求可以把配额用满，但不会超。
+
+速率可用环境变量覆盖，格式 ``每秒请求数[/突发容量]``，如::
+
+    RATE_LIMIT_MAIRUI=10/20
+    RATE_LIMIT_SINA=2
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# 数据源 → (每秒请求数, 突发容量)
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    'mairui': (5.0, 10.0),
+    'sina': (2.0, 4.0),
+    'tanshu': (1.0, 2.0),
+}
+FALLBACK_LIMIT = (5.0, 5.0)
+
+
+class TokenBucket:
+    """令牌桶（线程安全）"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: 每秒补充的令牌数（必须大于 0）
+            burst: 桶容量（允许的突发请求数），默认等于 ``max(rate, 1)``
+
+        Raises:
+            ValueError: ``rate`` 或 ``burst`` 不大于 0
+        """
+        if rate <= 0:
+            raise ValueError(f"rate 必须大于 0: {rate}")
+        if burst is not None and burst <= 0:
+            raise ValueError(f"burst 必须大于 0: {burst}")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens: float) -> float:
+        """尝试取令牌；成功返回 0，否则返回还需等待的秒数
+
+        Raises:
+            ValueError: ``tokens`` 超过桶容量（永远取不到）
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"一次请求 {tokens} 个令牌，超过桶容量 {self.capacity}")
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """非阻塞取令牌"""
+        return self._reserve(tokens) == 0.0
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """阻塞直到取到令牌（线程中使用）
+
+        Returns:
+            bool: 是否取到；超时返回 ``False``
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """异步取令牌（等待时让出事件循环）"""
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            await asyncio.sleep(wait)
+
+
+def _limit_from_env(provider: str) -> Tuple[float, float]:
+    default = DEFAULT_LIMITS.get(provider, FALLBACK_LIMIT)
+    raw = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+    if not raw:
+        return default
+    try:
+        rate_text, _, burst_text = raw.partition('/')
+        rate = float(rate_text)
+        burst = float(burst_text) if burst_text else max(rate, 1.0)
+        if rate <= 0 or burst <= 0:
+            raise ValueError
+        return rate, burst
+    except ValueError:
+        print(f"RATE_LIMIT_{provider.upper()} 格式错误: {raw}，使用默认值")
+        return default
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """获取某个数据源的进程级令牌桶（首次调用时按配置创建）"""
+    with _buckets_lock:
+        bucket = _buckets.get(provider)
+        if bucket is None:
+            rate, burst = _limit_from_env(provider)
+            bucket = _buckets[provider] = TokenBucket(rate, burst)
+        return bucket
+
+
+def acquire(provider: str, tokens: float = 1.0) -> None:
+    """阻塞式地为某个数据源取一个令牌"""
+    get_rate_limiter(provider).acquire(tokens)
+
+
+async def acquire_async(provider: str, tokens: float = 1.0) -> None:
+    """异步地为某个数据源取一个令牌"""
+    await get_rate_limiter(provider).acquire_async(tokens)
@@ -0,0 +1,141 @@
+"""Single-flight 请求合并 — 相同请求同一时刻只发一次，结果共享。
+
+同一次运行里同一只股票会被多次请求：持仓分析拉一次新闻 / 财务，
+市场扫描推荐了同一只股票又拉一次；并发 fan-out 时也可能同时发出两个
+一模一样的请求。这里按 ``(数据源, 端点, 参数)`` 做键：
+
+- 正在进行中的相同请求：后来者等待并复用第一个请求的结果
+- 可选 ``ttl``：请求完成后的一段时间内，相同请求直接复用结果（运行期记忆）
+
+失败（抛异常）和空结果不会被记忆，下次调用会重新请求。
+"""
+
+import copy
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def make_key(provider: str, endpoint: str, params: Any = None) -> Tuple[str, str, str]:
+    """由数据源、端点和参数生成稳定的键（参数顺序无关）"""
+    if params is None:
+        return provider, endpoint, ''
+    return provider, endpoint, json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """请求合并组（线程安全）"""
+
+    # 记忆条目超过这个数量时顺手清理过期条目
+    MAX_MEMO = 1024
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._memo: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args,
+           ttl: float = 0.0, **kwargs) -> Any:
+        """执行 ``fn(*args, **kwargs)``，相同 ``key`` 的并发 / 近期调用共享结果
+
+        Args:
+            key: 请求键（通常由 :func:`make_key` 生成）
+            fn: 实际发请求的函数
+            ttl: 完成后记忆结果的秒数；0 表示只合并进行中的请求
+
+        Returns:
+            Any: ``fn`` 的返回值（dict / list 返回浅拷贝，调用方修改不会互相影响）
+        """
+        with self._lock:
+            memo = self._memo.get(key)
+            if memo is not None:
+                if memo[0] > time.time():
+                    self.shared += 1
+                    return self._copy(memo[1])
+                del self._memo[key]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._copy(call.result)
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self.executed += 1
+                self._calls.pop(key, None)
+                if ttl > 0 and call.error is None and self._worth_keeping(call.result):
+                    now = time.time()
+                    self._memo[key] = (now + ttl, call.result)
+                    if len(self._memo) > self.MAX_MEMO:
+                        self._memo = {k: v for k, v in self._memo.items() if v[0] > now}
+            call.done.set()
+        return self._copy(call.result)
+
+    @staticmethod
+    def _worth_keeping(result: Any) -> bool:
+        if result is None:
+            return False
+        empty = getattr(result, 'empty', None)  # pandas DataFrame
+        if isinstance(empty, bool):
+            return not empty
+        try:
+            return len(result) > 0
+        except TypeError:
+            return True
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        if isinstance(result, (dict, list)):
+            return copy.copy(result)
+        return result
+
+    def forget(self, key: Hashable) -> None:
+        """丢弃某个键的记忆结果"""
+        with self._lock:
+            self._memo.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'shared': self.shared,
+                'in_flight': len(self._calls),
+                'memoized': len(self._memo),
+            }
+
+
+_default_group = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    """进程内共享的请求合并组"""
+    return _default_group
@@ -1,8 +1,24 @@
+import asyncio
+import numpy as np
 import requests
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
-from typing import Dict, List, Optional, Any
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from . import indicators
+from .cache import ResponseCache, get_default_cache
+from .endpoints import EndpointSelector, get_endpoint_selector
+from .entity_linker import StockEntityLinker
+from .kline_store import KlineArrays, KlineStore, get_default_kline_store
+from .rate_limit import get_rate_limiter
+from .singleflight import get_singleflight, make_key
+from .universe import (
+    UNKNOWN_BUSINESS, UNKNOWN_INDUSTRY, StockUniverse, get_default_universe,
+)
 
 load_dotenv()
 
@@ -13,39 +29,121 @@ class MaiRuiStockAPI:
     BACKUP_URL = "http://api1.mairui.club"
     LICENSE = os.getenv("MAIRUI_LICENSE")
 
-    def __init__(self):
+    # 单次请求默认超时（秒）。之前不设超时，主站挂起时会一直阻塞
+    DEFAULT_TIMEOUT = 10.0
+    # 连接池大小：与并发 fan-out 的上限对齐，避免连接被反复新建
+    DEFAULT_POOL_SIZE = 10
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 cache: Optional[ResponseCache] = None,
+                 kline_store: Optional[KlineStore] = None,
+                 universe: Optional[StockUniverse] = None):
+        """
+        Args:
+            timeout: 单次 HTTP 请求的默认超时（秒）
+            pool_size: 每个主机保持的最大连接数
+            cache: 响应缓存；不传则使用进程内共享的默认缓存
+                （传 ``ResponseCache(policies=[])`` 可完全关闭缓存）
+            kline_store: 本地K线仓库；不传则使用默认仓库（``data/klines``）
+            universe: 股票池索引；不传则首次使用时加载默认索引
+        """
+        self.cache = cache if cache is not None else get_default_cache()
+        # 与 NewsDataFetcher 共享同一个麦蕊主机选择器
+        self.endpoints: EndpointSelector = get_endpoint_selector(
+            "mairui", (self.BASE_URL, self.BACKUP_URL)
+        )
+        # 所有麦蕊客户端共享一个令牌桶，并发 fan-out 也不会超配额
+        self.rate_limiter = get_rate_limiter("mairui")
+        self._kline_store = kline_store
+        self._universe = universe
+        self._entity_linker: Optional[StockEntityLinker] = None
+        self.timeout = timeout
+        self.pool_size = pool_size
         self.session = requests.Session()
-    
-    def _request(self, endpoint: str, params: Optional[Dict] = None) -> List[Dict]:
-        """发送API请求
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """关闭底层连接池"""
+        self.session.close()
 
-        主接口失败时自动降级到备用接口；主备都失败时返回 ``[]``
-        而不是让异常逃逸（避免主流程被网络抖动打挂）。
+    def cache_stats(self) -> Dict[str, Any]:
+        """返回响应缓存的命中 / 未命中计数"""
+        return self.cache.stats()
+
+    def _request(self, endpoint: str, params: Optional[Dict] = None,
+                 timeout: Optional[float] = None, prepaid: bool = False) -> List[Dict]:
+        """发送API请求（先查响应缓存，未命中再走网络，相同的在途请求合并）
 
         Args:
             endpoint: API端点
             params: 请求参数
+            timeout: 本次请求超时（秒），默认使用 ``self.timeout``
+            prepaid: 调用方已经为第一次尝试取过令牌（异步客户端在事件循环里取）
 
         Returns:
             List[Dict]: JSON响应数据；失败时返回空列表
         """
-        url = f"{self.BASE_URL}/{endpoint}/{self.LICENSE}"
+        hit, cached = self.cache.get(endpoint, params)
+        if hit:
+            return cached
 
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except (requests.RequestException, ValueError):
-            # 主接口失败（网络 / HTTP / JSON 解析）时尝试备用接口
+        def fetch_and_cache() -> List[Dict]:
+            data = self._fetch(endpoint, params, timeout, prepaid)
+            self.cache.set(endpoint, params, data)
+            return data
+
+        # 并发发出的相同请求只走一次网络，其余请求等待并共享结果
+        return get_singleflight().do(make_key("mairui", endpoint, params), fetch_and_cache)
+
+    def _fetch(self, endpoint: str, params: Optional[Dict] = None,
+               timeout: Optional[float] = None, prepaid: bool = False) -> List[Dict]:
+        """直接请求网络（不经过缓存）
+
+        主备接口的尝试顺序由共享的 :class:`EndpointSelector` 决定；
+        全部失败时返回 ``[]`` 而不是让异常逃逸（避免主流程被网络抖动打挂）。
+
+        Args:
+            endpoint: API端点
+            params: 请求参数
+            timeout: 本次请求超时（秒），默认使用 ``self.timeout``
+            prepaid: 第一次尝试的令牌已由调用方取过
+
+        Returns:
+            List[Dict]: JSON响应数据；失败时返回空列表
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        last_error: Optional[Exception] = None
+
+        # 按主机健康度排序依次尝试：主站熔断时直接走备用站，不再先白等一次
+        for host in self.endpoints.candidates():
+            url = f"{host}/{endpoint}/{self.LICENSE}"
+            if prepaid:
+                prepaid = False
+            else:
+                self.rate_limiter.acquire()
+            started = time.monotonic()
             try:
-                backup_url = f"{self.BACKUP_URL}/{endpoint}/{self.LICENSE}"
-                response = self.session.get(backup_url, params=params)
+                response = self.session.get(url, params=params, timeout=timeout)
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
             except (requests.RequestException, ValueError) as e:
-                # 主备都失败：打印告警并返回空列表
-                print(f"麦蕊 API 主备均失败 ({endpoint}): {e}")
-                return []
+                # 网络 / HTTP / JSON 解析失败：记一次失败，换下一个主机
+                self.endpoints.record_failure(host, time.monotonic() - started)
+                last_error = e
+                continue
+            except BaseException:
+                # 其他异常不计入健康度，但要交还半开探测名额
+                self.endpoints.release(host)
+                raise
+            self.endpoints.record_success(host, time.monotonic() - started)
+            return data
+
+        # 主备都失败：打印告警并返回空列表
+        print(f"麦蕊 API 主备均失败 ({endpoint}): {last_error}")
+        return []
 
     def get_stock_list(self) -> List[Dict]:
         """获取沪深两市股票列表
@@ -64,8 +162,44 @@ class MaiRuiStockAPI:
         Returns:
             Dict: 实时行情数据
         """
+        return self._parse_realtime_quote(self._request(f"hsrl/ssjy/{stock_code}"))
+
+    def get_realtime_quotes(self, stock_codes: Iterable[str]) -> Dict[str, Dict]:
+        """批量获取多只股票的实时行情
+
+        麦蕊的 ``hsrl/ssjy`` 一次只接受一个代码，这里先去重，再用与连接池
+        同宽的线程池并发请求，整体耗时约等于最慢的一批请求，而不是逐只累加。
+
+        Args:
+            stock_codes: 股票代码列表（可含重复）
+
+        Returns:
+            Dict[str, Dict]: 股票代码 → 行情字典（失败的代码对应空字典），
+            按输入顺序排列
+        """
+        codes = [code for code in dict.fromkeys(stock_codes) if code]
+        if not codes:
+            return {}
+        if len(codes) == 1:
+            return {codes[0]: self.get_realtime_quote(codes[0])}
+
+        workers = min(len(codes), self.pool_size)
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix="mairui-quote") as pool:
+            futures = {code: pool.submit(self.get_realtime_quote, code) for code in codes}
+            quotes: Dict[str, Dict] = {}
+            for code, future in futures.items():
+                try:
+                    quotes[code] = future.result()
+                except Exception as e:
+                    print(f"获取 {code} 实时行情失败: {e}")
+                    quotes[code] = {}
+        return quotes
+
+    @staticmethod
+    def _parse_realtime_quote(data: Any) -> Dict:
+        """把 ``hsrl/ssjy`` 的原始响应整理成行情字典"""
         try:
-            data = self._request(f"hsrl/ssjy/{stock_code}")
             # 麦蕊API返回的是列表，需要处理成字典格式
             if isinstance(data, list) and data:
                 return {
@@ -76,7 +210,7 @@ class MaiRuiStockAPI:
                     'volume': data[0].get('v', 0)
                 }
             return {}
-        except (KeyError, IndexError):
+        except (KeyError, IndexError, AttributeError):
             return {}
 
     def get_history_klines(self, stock_code: str, period: str = "dq") -> List[Dict]:
@@ -91,6 +225,45 @@ class MaiRuiStockAPI:
         """
         return self._request(f"hszbl/fsjy/{stock_code}/{period}")
 
+    @property
+    def kline_store(self) -> KlineStore:
+        """本地K线仓库（首次访问时才创建目录）"""
+        if self._kline_store is None:
+            self._kline_store = get_default_kline_store()
+        return self._kline_store
+
+    def get_kline_arrays(self, stock_code: str, period: str = "dq",
+                         lookback: Optional[int] = None) -> KlineArrays:
+        """从本地K线仓库读取K线（先按需同步）
+
+        Args:
+            stock_code: 股票代码
+            period: K线周期,默认日线前复权
+            lookback: 只返回最近 N 根K线
+
+        Returns:
+            Dict[str, np.ndarray]: date / open / high / low / close / volume / turnover
+        """
+        return self.kline_store.get_arrays(self, stock_code, period, lookback)
+
+    @property
+    def universe(self) -> StockUniverse:
+        """全市场股票索引（首次访问时从磁盘缓存或股票列表接口加载）"""
+        if self._universe is None:
+            self._universe = get_default_universe(self)
+        return self._universe
+
+    @property
+    def entity_linker(self) -> StockEntityLinker:
+        """新闻 → 股票实体链接器（基于股票池，首次访问时构建）"""
+        if self._entity_linker is None or self._entity_linker.universe is not self.universe:
+            self._entity_linker = StockEntityLinker(self.universe)
+        return self._entity_linker
+
+    def search_stocks(self, prefix: str, limit: int = 20) -> List[Dict]:
+        """按代码或名称前缀搜索股票"""
+        return self.universe.search(prefix, limit)
+
     def get_stock_info(self, stock_code: str) -> Dict[str, str]:
         """获取股票基本信息
         
@@ -101,47 +274,21 @@ class MaiRuiStockAPI:
             Dict: 股票基本信息，包含名称、行业、主营业务等
         """
         try:
-            # 由于接口限制，这里返回模拟数据
-            # 后续可以接入实际的股票信息API
-            industry_map = {
-                '600626': '房地产开发',
-                '003032': '新能源汽车',
-                '000001': '银行',
-                '600000': '银行',
-                # 可以添加更多股票的行业映射
-            }
-            
-            name_map = {
-                '600626': '申达股份',
-                '003032': '传智教育',
-                '000001': '平安银行',
-                '600000': '浦发银行',
-                # 可以添加更多股票的名称映射
-            }
-            
-            business_map = {
-                '600626': '主要从事房地产开发、物业管理等业务',
-                '003032': '主要从事教育培训、在线教育等业务',
-                '000001': '主要从事商业银行业务，包括公司业务、零售业务和金融市场业务等',
-                '600000': '主要从事商业银行业务，包括公司金融、零售金融和金融市场业务等',
-                # 可以添加更多股票的主营业务描述
-            }
-            
-            if stock_code not in name_map:
-                print(f"警告：未找到股票 {stock_code} 的基本信息，尝试实时获取...")
-                # 这里可以添加实时获取股票信息的逻辑
+            info = self.universe.get(stock_code)
+            if info is None:
+                print(f"警告：股票池中未找到股票 {stock_code}")
                 return {
                     'code': stock_code,
                     'name': f'未知股票_{stock_code}',
-                    'industry': '未知行业',
-                    'main_business': '暂无描述'
+                    'industry': UNKNOWN_INDUSTRY,
+                    'main_business': UNKNOWN_BUSINESS
                 }
             
             return {
                 'code': stock_code,
-                'name': name_map.get(stock_code, '未知'),
-                'industry': industry_map.get(stock_code, '未知行业'),
-                'main_business': business_map.get(stock_code, '暂无描述')
+                'name': info.get('name', '未知'),
+                'industry': info.get('industry') or UNKNOWN_INDUSTRY,
+                'main_business': info.get('main_business') or UNKNOWN_BUSINESS
             }
             
         except Exception as e:
@@ -157,8 +304,12 @@ class MaiRuiStockAPI:
         Returns:
             List[Dict]: 股东信息列表
         """
+        return self._parse_top_holders(self._request(f"hscp/sdgd/{stock_code}"))
+
+    @staticmethod
+    def _parse_top_holders(data: Any) -> List[Dict]:
+        """把 ``hscp/sdgd`` 的原始响应整理成股东列表"""
         try:
-            data = self._request(f"hscp/sdgd/{stock_code}")
             if isinstance(data, list) and data and 'sdgd' in data[0]:
                 holders = data[0]['sdgd']
                 return [
@@ -171,35 +322,217 @@ class MaiRuiStockAPI:
                     for holder in holders
                 ]
             return []
-        except (KeyError, IndexError):
+        except (KeyError, IndexError, AttributeError):
             return []
 
     def get_technical_indicators(self, stock_code: str) -> Dict[str, Any]:
-        """获取技术指标"""
+        """获取技术指标
+
+        优先用本地K线仓库（已是最新时零网络）；
+        本地没有数据时回退到 ``hsrl/kline`` 接口。
+
+        Returns:
+            Dict[str, Any]: MA / EMA / MACD / RSI / 布林带 / ATR / KDJ / OBV /
+            量比的最新值，以及最新成交量和换手率
+        """
         try:
-            # 获取K线数据
-            klines = self._request(f"hsrl/kline/{stock_code}")
-            
-            # 计算技术指标
-            ma5 = self._calculate_ma(klines, 5)
-            ma10 = self._calculate_ma(klines, 10)
-            ma20 = self._calculate_ma(klines, 20)
-            
-            return {
-                'ma5': ma5,
-                'ma10': ma10,
-                'ma20': ma20,
-                'volume': klines[-1].get('v', 0) if klines and len(klines) > 0 else 0,
-                'turnover_rate': klines[-1].get('tr', 0) if klines and len(klines) > 0 else 0
-            }
+            arrays = self.get_kline_arrays(stock_code, lookback=250)
+        except Exception as e:
+            print(f"读取本地K线失败: {str(e)}")
+            arrays = None
+        if arrays is None or not len(arrays['close']):
+            arrays = self._klines_to_ohlcv(self._request(f"hsrl/kline/{stock_code}"))
+        return self._build_technical_indicators(arrays)
+
+    def get_technical_indicators_batch(self, stock_codes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取多只股票的技术指标
+
+        先并发同步本地K线，再把所有股票堆成一个矩阵一次算完。
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 股票代码 → 指标字典（同 ``get_technical_indicators``）
+        """
+        codes = [code for code in dict.fromkeys(stock_codes) if code]
+        if not codes:
+            return {}
+        self.kline_store.sync_many(self, codes, max_workers=self.pool_size)
+        arrays_by_code = {code: self.kline_store.load(code) for code in codes}
+        panel = indicators.compute_panel(arrays_by_code)
+
+        results = {}
+        for code in codes:
+            arrays = arrays_by_code[code]
+            if not len(arrays['close']):
+                # 本地没有K线的股票单独走接口兜底
+                results[code] = self.get_technical_indicators(code)
+                continue
+            results[code] = self._with_latest_volume(panel[code], arrays)
+        return results
+
+    @staticmethod
+    def _klines_to_ohlcv(klines: Any) -> Dict[str, np.ndarray]:
+        """把无日期字段的K线记录（如 ``hsrl/kline``）转成 OHLCV 数组"""
+        records = [k for k in klines if isinstance(k, dict)] if isinstance(klines, list) else []
+
+        def column(*keys) -> np.ndarray:
+            values = []
+            for record in records:
+                raw = next((record[key] for key in keys if key in record), None)
+                try:
+                    values.append(float(raw))
+                except (TypeError, ValueError):
+                    values.append(np.nan)
+            return np.array(values, dtype=np.float64)
+
+        return {
+            'open': column('o'),
+            'high': column('h'),
+            'low': column('l'),
+            'close': column('c'),
+            'volume': column('v'),
+            'turnover': column('tr', 'hs'),
+        }
+
+    def _build_technical_indicators(self, arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """由K线数组计算技术指标"""
+        try:
+            if not len(arrays['close']):
+                return {}
+            return self._with_latest_volume(indicators.latest_snapshot(arrays), arrays)
         except Exception as e:
             print(f"获取技术指标失败: {str(e)}")
             return {}
 
-    def _calculate_ma(self, klines: List[Dict], period: int) -> float:
-        """计算移动平均线"""
-        if not klines or len(klines) < period:
-            return 0
-        
-        closes = [float(k.get('c', 0)) for k in klines[-period:]]
-        return sum(closes) / period
\ No newline at end of file
+    @staticmethod
+    def _with_latest_volume(snapshot: Dict[str, Any],
+                            arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """补上最新成交量 / 换手率（保持旧接口的 volume / turnover_rate 字段）"""
+        result = dict(snapshot)
+        result['volume'] = float(np.nan_to_num(arrays['volume'][-1]))
+        result['turnover_rate'] = float(np.nan_to_num(arrays['turnover'][-1]))
+        return result
+
+class AsyncMaiRuiStockAPI:
+    """麦蕊股票数据API的 asyncio 版本
+
+    方法名与 :class:`MaiRuiStockAPI` 一致，但都是 ``async`` 的。底层复用同步
+    客户端的 ``requests.Session`` 连接池，在线程里执行阻塞 IO，用信号量把
+    同时在途的请求数限制在连接池大小以内——这样整个持仓的行情 / K线 /
+    股东请求可以并发发出，而不是逐个排队。
+
+    用法::
+
+        async with AsyncMaiRuiStockAPI(max_concurrency=8) as api:
+            quotes = await api.fan_out(api.get_realtime_quote, codes)
+    """
+
+    def __init__(self, max_concurrency: int = MaiRuiStockAPI.DEFAULT_POOL_SIZE,
+                 timeout: float = MaiRuiStockAPI.DEFAULT_TIMEOUT,
+                 api: Optional[MaiRuiStockAPI] = None):
+        """
+        Args:
+            max_concurrency: 同时在途的最大请求数（同时也是连接池大小）
+            timeout: 单次请求默认超时（秒）
+            api: 复用已有的同步客户端；不传则新建一个
+        """
+        self.max_concurrency = max_concurrency
+        self._api = api or MaiRuiStockAPI(timeout=timeout, pool_size=max_concurrency)
+        # 信号量必须在运行中的事件循环里创建，按循环惰性初始化
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncMaiRuiStockAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """关闭底层连接池"""
+        self._api.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _request(self, endpoint: str, params: Optional[Dict] = None,
+                       timeout: Optional[float] = None) -> List[Dict]:
+        """异步发送API请求（主备降级、失败返回 ``[]`` 的语义与同步版一致）
+
+        缓存命中直接返回；否则先在事件循环里等令牌（不占工作线程），
+        再到线程里发请求。
+        """
+        hit, cached = self._api.cache.get(endpoint, params)
+        if hit:
+            return cached
+        async with self._get_semaphore():
+            await self._api.rate_limiter.acquire_async()
+            return await asyncio.to_thread(self._api._request, endpoint, params, timeout, True)
+
+    async def get_stock_list(self) -> List[Dict]:
+        """获取沪深两市股票列表"""
+        return await self._request("hslt/list")
+
+    async def get_realtime_quote(self, stock_code: str,
+                                 timeout: Optional[float] = None) -> Dict:
+        """获取股票实时行情"""
+        data = await self._request(f"hsrl/ssjy/{stock_code}", timeout=timeout)
+        return self._api._parse_realtime_quote(data)
+
+    async def get_realtime_quotes(self, stock_codes: Iterable[str]) -> Dict[str, Dict]:
+        """批量获取多只股票的实时行情（去重后并发请求）"""
+        return await self.fan_out(self.get_realtime_quote, stock_codes, default={})
+
+    async def get_history_klines(self, stock_code: str, period: str = "dq",
+                                 timeout: Optional[float] = None) -> List[Dict]:
+        """获取历史K线数据"""
+        return await self._request(f"hszbl/fsjy/{stock_code}/{period}", timeout=timeout)
+
+    async def get_stock_info(self, stock_code: str) -> Dict[str, str]:
+        """获取股票基本信息
+
+        首次调用要加载股票池（可能走网络），放到线程里执行，不阻塞事件循环。
+        """
+        async with self._get_semaphore():
+            return await asyncio.to_thread(self._api.get_stock_info, stock_code)
+
+    async def get_top_holders(self, stock_code: str,
+                              timeout: Optional[float] = None) -> List[Dict]:
+        """获取前十大股东"""
+        data = await self._request(f"hscp/sdgd/{stock_code}", timeout=timeout)
+        return self._api._parse_top_holders(data)
+
+    async def get_technical_indicators(self, stock_code: str) -> Dict[str, Any]:
+        """获取技术指标（本地K线仓库优先）"""
+        async with self._get_semaphore():
+            return await asyncio.to_thread(self._api.get_technical_indicators, stock_code)
+
+    async def fan_out(self, method: Callable[..., Awaitable[Any]],
+                      stock_codes: Iterable[str], default: Any = None,
+                      **kwargs) -> Dict[str, Any]:
+        """对一组股票代码并发调用同一个异步方法（``asyncio.gather`` 风格）
+
+        Args:
+            method: 本类的异步方法，如 ``api.get_realtime_quote``
+            stock_codes: 股票代码列表，重复代码只请求一次
+            default: 单只股票抛异常时填入的结果
+            **kwargs: 透传给 ``method`` 的参数（如 ``timeout``）
+
+        Returns:
+            Dict[str, Any]: 股票代码 → 结果，保持输入顺序
+        """
+        codes = list(dict.fromkeys(stock_codes))
+        results = await asyncio.gather(
+            *(method(code, **kwargs) for code in codes),
+            return_exceptions=True,
+        )
+        out: Dict[str, Any] = {}
+        for code, result in zip(codes, results):
+            if isinstance(result, Exception):
+                print(f"并发请求 {code} 失败: {result}")
+                result = default
+            out[code] = result
+        return out
@@ -0,0 +1,195 @@
+"""流式技术指标 — 每来一个行情 tick 以 O(1) 更新状态。
+
+``indicators`` 模块面向整段K线；实时行情页和盯盘循环则是一个个 tick
+到来，每次都从头重算会让 CPU 随会话时长线性增长。这里的指标对象只保存
+常数大小的状态（``__slots__``，无 ``__dict__``），``update()`` 常数时间完成，
+盯多少只股票、跑多久都不会变慢。
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class RollingMean:
+    """固定窗口滑动平均（维护窗口和累加和）"""
+
+    __slots__ = ('window', '_values', '_sum')
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(value)
+        self._sum += value
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._values) < self.window:
+            return None
+        return self._sum / self.window
+
+
+class StreamingEMA:
+    """指数移动平均（alpha = 2 / (period + 1)）"""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, period: int):
+        self.alpha = 2.0 / (period + 1)
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class StreamingRSI:
+    """相对强弱指标（Wilder 平滑），前 period 个变化量之后才给出数值"""
+
+    __slots__ = ('period', '_prev', '_avg_gain', '_avg_loss', '_count')
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev: Optional[float] = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._count = 0
+
+    def update(self, price: float) -> Optional[float]:
+        if self._prev is not None:
+            delta = price - self._prev
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self._count += 1
+            if self._count == 1:
+                self._avg_gain, self._avg_loss = gain, loss
+            else:
+                alpha = 1.0 / self.period
+                self._avg_gain += alpha * (gain - self._avg_gain)
+                self._avg_loss += alpha * (loss - self._avg_loss)
+        self._prev = price
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._count < self.period:
+            return None
+        if self._avg_loss == 0:
+            return 100.0 if self._avg_gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+
+class StreamingVWAP:
+    """成交量加权均价
+
+    行情接口给的是当日累计成交量，这里用相邻两次的差值作为本次 tick 的
+    成交量；累计量变小说明换日了，自动清零重新累计。
+    """
+
+    __slots__ = ('_pv', '_volume', '_last_cum_volume')
+
+    def __init__(self):
+        self._pv = 0.0
+        self._volume = 0.0
+        self._last_cum_volume: Optional[float] = None
+
+    def reset(self) -> None:
+        self._pv = 0.0
+        self._volume = 0.0
+        self._last_cum_volume = None
+
+    def update(self, price: float, cumulative_volume: float) -> Optional[float]:
+        if self._last_cum_volume is None or cumulative_volume < self._last_cum_volume:
+            self.reset()
+            tick_volume = 0.0
+        else:
+            tick_volume = cumulative_volume - self._last_cum_volume
+        self._last_cum_volume = cumulative_volume
+        if tick_volume > 0:
+            self._pv += price * tick_volume
+            self._volume += tick_volume
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._volume <= 0:
+            return None
+        return self._pv / self._volume
+
+
+class TickIndicators:
+    """一只股票的全部流式指标，按行情字典逐个 tick 喂入"""
+
+    __slots__ = ('ma', 'ema', 'rsi', 'vwap', 'ticks', '_last_tick')
+
+    def __init__(self, ma_window: int = 10, ema_period: int = 12, rsi_period: int = 14):
+        self.ma = RollingMean(ma_window)
+        self.ema = StreamingEMA(ema_period)
+        self.rsi = StreamingRSI(rsi_period)
+        self.vwap = StreamingVWAP()
+        self.ticks = 0
+        self._last_tick = None
+
+    def update(self, quote: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        """喂入一条 ``get_realtime_quote`` 返回的行情
+
+        价格无效或与上一 tick 完全相同（缓存命中 / 未成交）时不更新状态，
+        直接返回当前值，避免重复 tick 把均线拉平。
+        """
+        try:
+            price = float(quote.get('price') or 0)
+            volume = float(quote.get('volume') or 0)
+        except (TypeError, ValueError):
+            return self.snapshot()
+        if price <= 0 or math.isnan(price):
+            return self.snapshot()
+
+        tick = (price, volume)
+        if tick != self._last_tick:
+            self._last_tick = tick
+            self.ticks += 1
+            self.ma.update(price)
+            self.ema.update(price)
+            self.rsi.update(price)
+            self.vwap.update(price, volume)
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {
+            'ma': self.ma.value,
+            'ema': self.ema.value,
+            'rsi': self.rsi.value,
+            'vwap': self.vwap.value,
+        }
+
+
+class TickIndicatorBook:
+    """按股票代码管理多只股票的 :class:`TickIndicators`"""
+
+    def __init__(self, **indicator_kwargs):
+        self._kwargs = indicator_kwargs
+        self._states: Dict[str, TickIndicators] = {}
+
+    def update(self, stock_code: str, quote: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        state = self._states.get(stock_code)
+        if state is None:
+            state = self._states[stock_code] = TickIndicators(**self._kwargs)
+        return state.update(quote)
+
+    def update_many(self, quotes: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Optional[float]]]:
+        """批量喂入 ``get_realtime_quotes`` 的结果"""
+        return {code: self.update(code, quote) for code, quote in quotes.items() if quote}
+
+    def discard(self, stock_code: str) -> None:
+        self._states.pop(stock_code, None)
+
+    def __contains__(self, stock_code: str) -> bool:
+        return stock_code in self._states
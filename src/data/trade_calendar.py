@@ -0,0 +1,267 @@
+"""交易日历 — Tushare ``trade_cal`` 缓存到磁盘，很少刷新。
+
+之前只按周一到周五近似交易日：节假日照样当成交易日，日线缓存在长假里
+天天失效；``main.py`` / TUI 在周末、节假日运行时也会重新拉行情、K线、新闻
+并再花一次 LLM 调用，而数据和上次收盘后跑的结果完全一样。这里把上交所
+交易日历（去年年初到今年年底）存进 ``data/trade_calendar.json``：
+
+- 超过 ``max_age``（默认 30 天）或今天不在覆盖范围内时才重新拉取
+- 没配 ``TUSHARE_TOKEN`` 时不发请求；拉取失败（网络错误、没有权限）时退回旧缓存，
+  再不行按工作日近似，并把这次失败记进缓存文件，``FAILED_FETCH_RETRY`` 内的
+  其他进程不再重试
+- 覆盖范围以外的日期同样按工作日近似
+
+提供交易日判断、前后交易日、最近一次收盘时刻，以及日线类数据的缓存过期时间。
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Iterable, List, Optional, Union
+
+# 收盘后留一点余量再让日线缓存失效，给数据源落库留时间
+MARKET_CLOSE_HOUR = 15
+MARKET_CLOSE_MINUTE = 30
+
+# 拉取失败后多久内不再重试（秒）
+FAILED_FETCH_RETRY = 3600
+
+# 拉取区间内所有交易日 → 交易日列表（``YYYYMMDD``）
+FetchOpenDays = Callable[[str, str], List[str]]
+
+
+def _to_date(value: Union[date, datetime, str]) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).replace('-', '')[:8]
+    return datetime.strptime(text, '%Y%m%d').date()
+
+
+def _close_of(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE)
+
+
+def fetch_open_days_from_tushare(start: str, end: str) -> List[str]:
+    """从 Tushare ``trade_cal`` 取 ``[start, end]`` 内的上交所交易日（``YYYYMMDD``）
+
+    没配 ``TUSHARE_TOKEN`` 时返回空列表（不发请求）。
+    """
+    token = os.getenv('TUSHARE_TOKEN')
+    if not token:
+        return []
+
+    import tushare as ts
+    from .tushare_scheduler import get_tushare_scheduler
+
+    api = ts.pro_api(token)
+    df = get_tushare_scheduler().call(
+        'trade_cal', lambda endpoint, **params: api.query(endpoint, **params),
+        dict(exchange='SSE', start_date=start, end_date=end,
+             is_open='1', fields='cal_date,is_open'),
+    )
+    if df is None or df.empty:
+        return []
+    return sorted(str(day) for day in df['cal_date'])
+
+
+class TradeCalendar:
+    """交易日历（覆盖范围内查表，范围外按工作日近似）"""
+
+    def __init__(self, open_days: Iterable[Union[date, str]] = (),
+                 start: Optional[date] = None, end: Optional[date] = None):
+        """
+        Args:
+            open_days: 交易日
+            start / end: 日历覆盖的区间（含两端）；不传时没有覆盖范围，全部按工作日近似
+        """
+        self._open_days = {_to_date(day) for day in open_days}
+        self.start = start
+        self.end = end
+        self.fetched_at = time.time()
+        # 上次拉取失败时，这个时间之前不再重试
+        self.retry_at = 0.0
+
+    def covers(self, day: date) -> bool:
+        return self.start is not None and self.end is not None and self.start <= day <= self.end
+
+    def is_trading_day(self, day: Union[date, datetime, str]) -> bool:
+        day = _to_date(day)
+        if self.covers(day):
+            return day in self._open_days
+        return day.weekday() < 5
+
+    def next_trading_day(self, day: Union[date, datetime, str], inclusive: bool = False) -> date:
+        """``day`` 之后（``inclusive`` 时含当天）的第一个交易日"""
+        day = _to_date(day)
+        if not inclusive:
+            day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def previous_trading_day(self, day: Union[date, datetime, str], inclusive: bool = False) -> date:
+        """``day`` 之前（``inclusive`` 时含当天）的最后一个交易日"""
+        day = _to_date(day)
+        if not inclusive:
+            day -= timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def last_closed_trading_date(self, now: float) -> date:
+        """最近一个已收盘交易日的日期"""
+        current = datetime.fromtimestamp(now)
+        day = current.date()
+        if current < _close_of(day):
+            day -= timedelta(days=1)
+        return self.previous_trading_day(day, inclusive=True)
+
+    def last_close_time(self, now: float) -> datetime:
+        """最近一次收盘（含 ``MARKET_CLOSE`` 余量）的时刻"""
+        return _close_of(self.last_closed_trading_date(now))
+
+    def end_of_trading_day(self, now: float) -> float:
+        """下一个"收盘后"时间点的时间戳，作为日线类数据的过期时间
+
+        当天是交易日且未收盘时取当天收盘时刻，否则顺延到下一个交易日收盘。
+        """
+        current = datetime.fromtimestamp(now)
+        day = current.date()
+        if current >= _close_of(day) or not self.is_trading_day(day):
+            day = self.next_trading_day(day)
+        return _close_of(day).timestamp()
+
+    def result_still_valid(self, timestamp: Optional[str], now: Optional[float] = None) -> bool:
+        """非交易日里，一份在最近一次收盘之后生成的结果是否可以直接沿用
+
+        交易日（盘中行情在变、收盘后有新数据）一律返回 ``False``。
+
+        Args:
+            timestamp: 结果生成时间（ISO 格式，如 ``AnalysisStatus`` 的 ``timestamp``）
+        """
+        now = now if now is not None else time.time()
+        if not timestamp or self.is_trading_day(datetime.fromtimestamp(now)):
+            return False
+        try:
+            generated = datetime.fromisoformat(str(timestamp))
+        except ValueError:
+            return False
+        return generated >= self.last_close_time(now)
+
+    # ── 持久化 ───────────────────────────────────────────
+
+    def save(self, path: str) -> None:
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fetched_at': self.fetched_at,
+                'retry_at': self.retry_at,
+                'start': self.start.strftime('%Y%m%d') if self.start else None,
+                'end': self.end.strftime('%Y%m%d') if self.end else None,
+                'open_days': sorted(day.strftime('%Y%m%d') for day in self._open_days),
+            }, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_file(cls, path: str) -> Optional["TradeCalendar"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            calendar = cls(
+                data.get('open_days', []),
+                _to_date(data['start']) if data.get('start') else None,
+                _to_date(data['end']) if data.get('end') else None,
+            )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"读取交易日历缓存失败: {e}")
+            return None
+        calendar.fetched_at = data.get('fetched_at', 0)
+        calendar.retry_at = data.get('retry_at', 0)
+        return calendar
+
+    @classmethod
+    def load(cls, path: str = "data/trade_calendar.json",
+             fetch: Optional[FetchOpenDays] = None,
+             max_age: float = 30 * 24 * 3600,
+             today: Optional[date] = None) -> "TradeCalendar":
+        """优先读磁盘缓存；缓存缺失、过期或不含今天时通过 ``fetch`` 重新拉取
+
+        拉取失败时退回旧缓存（即使已过期），再不行返回按工作日近似的空日历；
+        失败会写进缓存文件，``FAILED_FETCH_RETRY`` 秒内不再重试。
+        """
+        today = today or date.today()
+        now = time.time()
+        cached = cls.load_file(path)
+        if cached is not None:
+            if now < cached.retry_at:
+                return cached
+            # 今天不在覆盖范围内（次年日历还没发布）时最多每天重拉一次
+            limit = max_age if cached.covers(today) else min(max_age, 24 * 3600)
+            if now - cached.fetched_at < limit:
+                return cached
+
+        start, end = date(today.year - 1, 1, 1), date(today.year, 12, 31)
+        try:
+            open_days = (fetch or fetch_open_days_from_tushare)(
+                start.strftime('%Y%m%d'), end.strftime('%Y%m%d'))
+        except Exception as e:
+            print(f"获取交易日历失败，按工作日近似: {e}")
+            fallback = cached
+            if fallback is None:
+                fallback = cls()
+                fallback.fetched_at = 0.0  # 空日历不算拉取成功，重试时间一到就重拉
+            fallback.retry_at = now + FAILED_FETCH_RETRY
+            try:
+                fallback.save(path)
+            except OSError as save_error:
+                print(f"写入交易日历缓存失败: {save_error}")
+            return fallback
+        if not open_days:
+            # 没配 TUSHARE_TOKEN：不记失败，配置好后下次运行即可拉取
+            return cached or cls()
+
+        # 日历可能还没发布到年底，覆盖范围只算到拉到的最后一个交易日
+        calendar = cls(open_days, start, max(_to_date(day) for day in open_days))
+        try:
+            calendar.save(path)
+        except OSError as e:
+            print(f"写入交易日历缓存失败: {e}")
+        return calendar
+
+
+_default_calendar: Optional[TradeCalendar] = None
+_default_calendar_lock = threading.Lock()
+
+
+def get_default_calendar() -> TradeCalendar:
+    """进程内共享的交易日历（路径取 ``TRADE_CALENDAR_PATH``，默认 ``data/trade_calendar.json``）"""
+    global _default_calendar
+    with _default_calendar_lock:
+        if _default_calendar is None:
+            path = os.getenv("TRADE_CALENDAR_PATH", "data/trade_calendar.json")
+            _default_calendar = TradeCalendar.load(path)
+        return _default_calendar
+
+
+def is_trading_day(day: Optional[Union[date, datetime, str]] = None) -> bool:
+    """某天（默认今天）是否为交易日"""
+    return get_default_calendar().is_trading_day(day or date.today())
+
+
+def end_of_trading_day(now: float) -> float:
+    """下一个"收盘后"时间点的时间戳（见 :meth:`TradeCalendar.end_of_trading_day`）"""
+    return get_default_calendar().end_of_trading_day(now)
+
+
+def last_closed_trading_date(now: float) -> date:
+    """最近一个已收盘交易日的日期（见 :meth:`TradeCalendar.last_closed_trading_date`）"""
+    return get_default_calendar().last_closed_trading_date(now)
@@ -0,0 +1,207 @@
+"""Tushare 请求调度 — 按接口的每分钟额度排队，被限流时退避重试。
+
+Tushare 的频率限制是“每个接口每分钟 N 次”，N 由账号积分档位决定；之前所有
+接口共用一个 3 次/秒 的令牌桶，既可能超过单个接口的额度，也用不满其他接口
+的额度，超限报错还会被上层吞成 ``{}``。这里为每个接口维护一个 60 秒滑动窗口：
+
+- 窗口内调用数到达额度时，后来的调用按先来后到排队等待（线程阻塞，不丢请求）
+- 服务端仍返回“每分钟最多访问”之类的限流错误时，该接口整体暂停，
+  按指数退避重试（最多 ``MAX_RETRIES`` 次）；网络错误同样重试
+- 每日额度用尽、没有权限等错误不重试，直接抛给调用方
+
+额度按 ``TUSHARE_POINTS`` 选择积分档位，单个接口可用 ``TUSHARE_RATE_LIMITS``
+覆盖，格式 ``接口=每分钟次数``，逗号分隔，如::
+
+    TUSHARE_POINTS=5000
+    TUSHARE_RATE_LIMITS=income_vip=60,fina_indicator=100
+
+相同接口 + 相同参数的请求由调用方的 single-flight 合并，只排一次队。
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+# 积分档位 → 每个接口每分钟调用次数（从高到低匹配）
+POINTS_TIERS = (
+    (10000, 1000),
+    (5000, 500),
+    (2000, 200),
+    (0, 50),
+)
+DEFAULT_POINTS = 2000
+WINDOW_SECONDS = 60.0
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+
+# 每分钟限流报错里的关键字（如“抱歉，您每分钟最多访问该接口200次，权限的具体详情……”）
+_THROTTLE_MARKERS = ('每分钟', '频率', '频繁', 'too many')
+
+
+def _minute_limit(points: int) -> int:
+    for threshold, limit in POINTS_TIERS:
+        if points >= threshold:
+            return limit
+    return POINTS_TIERS[-1][1]
+
+
+def _parse_overrides(raw: Optional[str]) -> Dict[str, int]:
+    overrides: Dict[str, int] = {}
+    for item in (raw or '').split(','):
+        endpoint, _, limit = item.partition('=')
+        if not endpoint.strip():
+            continue
+        try:
+            overrides[endpoint.strip()] = int(limit)
+        except ValueError:
+            print(f"TUSHARE_RATE_LIMITS 格式错误: {item}，忽略")
+    return overrides
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """是否为可重试的错误（每分钟限流 / 网络错误）"""
+    import requests
+
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _THROTTLE_MARKERS)
+
+
+class MinuteWindow:
+    """单个接口的 60 秒滑动窗口（线程安全，先来先服务）"""
+
+    def __init__(self, limit: int, window: float = WINDOW_SECONDS):
+        self.limit = max(1, limit)
+        self.window = window
+        self._calls: Deque[float] = deque()
+        self._paused_until = 0.0
+        self._next_ticket = 0
+        self._serving = 0
+        self._cond = threading.Condition()
+
+    def _wait_time(self, now: float) -> float:
+        while self._calls and self._calls[0] <= now - self.window:
+            self._calls.popleft()
+        wait = self._paused_until - now
+        if len(self._calls) >= self.limit:
+            wait = max(wait, self._calls[0] + self.window - now)
+        return max(wait, 0.0)
+
+    def acquire(self) -> None:
+        """排队直到窗口内有空余额度，并记下这次调用"""
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while True:
+                if ticket == self._serving:
+                    wait = self._wait_time(time.monotonic())
+                    if wait == 0.0:
+                        self._calls.append(time.monotonic())
+                        self._serving += 1
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+
+    def pause(self, seconds: float) -> None:
+        """服务端报限流时暂停整个接口一段时间"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    @property
+    def in_window(self) -> int:
+        """最近 60 秒内的调用数"""
+        with self._cond:
+            self._wait_time(time.monotonic())
+            return len(self._calls)
+
+
+class TushareScheduler:
+    """按接口额度调度 Tushare 请求（进程内共享，见 :func:`get_tushare_scheduler`）"""
+
+    def __init__(self, points: Optional[int] = None,
+                 overrides: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            points: 账号积分，决定默认的每分钟额度
+            overrides: 接口 → 每分钟次数，覆盖默认额度
+        """
+        self.points = points if points is not None else DEFAULT_POINTS
+        self.default_limit = _minute_limit(self.points)
+        self.overrides = dict(overrides or {})
+        self._windows: Dict[str, MinuteWindow] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+
+    def window(self, endpoint: str) -> MinuteWindow:
+        with self._lock:
+            window = self._windows.get(endpoint)
+            if window is None:
+                limit = self.overrides.get(endpoint, self.default_limit)
+                window = self._windows[endpoint] = MinuteWindow(limit)
+            return window
+
+    def call(self, endpoint: str, invoke: Callable[..., Any], params: Dict[str, Any]) -> Any:
+        """排队调用 ``invoke(endpoint, **params)``，被限流时退避重试
+
+        Raises:
+            Exception: 不可重试的错误，或重试 ``MAX_RETRIES`` 次后仍失败
+        """
+        window = self.window(endpoint)
+        for attempt in range(MAX_RETRIES + 1):
+            window.acquire()
+            try:
+                result = invoke(endpoint, **params)
+                with self._lock:
+                    self.calls += 1
+                return result
+            except Exception as e:
+                if attempt == MAX_RETRIES or not is_throttle_error(e):
+                    raise
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+                print(f"Tushare {endpoint} 被限流，{delay:.0f} 秒后重试 ({attempt + 1}/{MAX_RETRIES}): {e}")
+                window.pause(delay)
+                with self._lock:
+                    self.retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """调用次数、重试次数和各接口当前窗口内的调用数"""
+        with self._lock:
+            windows = dict(self._windows)
+            stats = {'calls': self.calls, 'retries': self.retries}
+        stats['in_window'] = {endpoint: window.in_window for endpoint, window in windows.items()}
+        return stats
+
+
+def _points_from_env() -> int:
+    raw = os.getenv("TUSHARE_POINTS")
+    if not raw:
+        return DEFAULT_POINTS
+    try:
+        return int(raw)
+    except ValueError:
+        print(f"TUSHARE_POINTS 格式错误: {raw}，使用默认值 {DEFAULT_POINTS}")
+        return DEFAULT_POINTS
+
+
+_default_scheduler: Optional[TushareScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_tushare_scheduler() -> TushareScheduler:
+    """进程内共享的 Tushare 调度器（额度按账号计，所有 FinancialDataFetcher 共用）"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = TushareScheduler(
+                _points_from_env(), _parse_overrides(os.getenv("TUSHARE_RATE_LIMITS"))
+            )
+        return _default_scheduler
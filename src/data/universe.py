@@ -0,0 +1,264 @@
+"""股票池索引 — 由 ``get_stock_list()`` 构建并缓存到磁盘。
+
+之前 ``get_stock_info`` 只认识四只写死的股票，其余一律返回
+``未知股票_xxx``，还会被写进 ``stock_info`` 表。这里把全市场列表建成索引：
+
+- 代码 → 基本信息：字典 O(1) 查找
+- 代码 / 名称前缀搜索：排好序的键 + 二分查找
+- 行业 → 代码列表：反向索引
+
+索引落盘到 ``data/stock_universe.json``，过期前启动不再请求列表接口。
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+# 股票列表接口不提供行业 / 主营业务，先用已知数据兜底，后续可通过
+# ``StockUniverse.update_info`` 补充
+SEED_INFO: Dict[str, Dict[str, str]] = {
+    '600626': {
+        'name': '申达股份',
+        'industry': '房地产开发',
+        'main_business': '主要从事房地产开发、物业管理等业务',
+    },
+    '003032': {
+        'name': '传智教育',
+        'industry': '新能源汽车',
+        'main_business': '主要从事教育培训、在线教育等业务',
+    },
+    '000001': {
+        'name': '平安银行',
+        'industry': '银行',
+        'main_business': '主要从事商业银行业务，包括公司业务、零售业务和金融市场业务等',
+    },
+    '600000': {
+        'name': '浦发银行',
+        'industry': '银行',
+        'main_business': '主要从事商业银行业务，包括公司金融、零售金融和金融市场业务等',
+    },
+}
+
+UNKNOWN_INDUSTRY = '未知行业'
+UNKNOWN_BUSINESS = '暂无描述'
+
+_CODE_PATTERN = re.compile(r'(\d{6})')
+
+
+def normalize_code(raw: str) -> str:
+    """把 ``sh600000`` / ``600000.SH`` / ``600000`` 统一成 6 位数字代码"""
+    match = _CODE_PATTERN.search(str(raw or ''))
+    return match.group(1) if match else str(raw or '').strip()
+
+
+def to_ts_code(raw: str) -> str:
+    """把 ``600000`` / ``sh600000`` / ``600000.SH`` 统一成 Tushare 的 ``600000.SH``
+
+    按代码段判断交易所：6/9 开头为上交所，4/8/92 开头为北交所，其余为深交所。
+    """
+    code = normalize_code(raw)
+    if not code.isdigit() or len(code) != 6:
+        return code
+    if code.startswith(('92', '4', '8')):
+        return f"{code}.BJ"
+    if code.startswith(('6', '9')):
+        return f"{code}.SH"
+    return f"{code}.SZ"
+
+
+class StockUniverse:
+    """全市场股票索引"""
+
+    def __init__(self, records: Optional[Iterable[Dict]] = None):
+        """
+        Args:
+            records: 股票列表记录（``hslt/list`` 原始格式或已规整的格式均可）
+        """
+        self._by_code: Dict[str, Dict[str, str]] = {}
+        self._by_industry: Dict[str, List[str]] = {}
+        self._sorted_codes: List[str] = []
+        self._sorted_names: List[tuple] = []
+        self.built_at = time.time()
+        for code, info in SEED_INFO.items():
+            self._by_code[code] = {'code': code, 'exchange': '', **info}
+        self.add_records(records or [])
+
+    # ── 构建 ─────────────────────────────────────────────
+
+    def add_records(self, records: Iterable[Dict]) -> None:
+        """并入股票列表记录并重建索引"""
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            code = normalize_code(record.get('code') or record.get('dm'))
+            name = (record.get('name') or record.get('mc') or '').strip()
+            if not code or not name:
+                continue
+            entry = self._by_code.setdefault(code, {
+                'code': code,
+                'name': name,
+                'exchange': '',
+                'industry': UNKNOWN_INDUSTRY,
+                'main_business': UNKNOWN_BUSINESS,
+            })
+            entry['name'] = name
+            exchange = record.get('exchange') or record.get('jys')
+            if exchange:
+                entry['exchange'] = str(exchange).lower()
+            industry = record.get('industry') or record.get('hy')
+            if industry:
+                entry['industry'] = industry
+            business = record.get('main_business')
+            if business:
+                entry['main_business'] = business
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        self._sorted_codes = sorted(self._by_code)
+        self._sorted_names = sorted((info['name'], code) for code, info in self._by_code.items())
+        by_industry: Dict[str, List[str]] = {}
+        for code in self._sorted_codes:
+            industry = self._by_code[code].get('industry') or UNKNOWN_INDUSTRY
+            if industry != UNKNOWN_INDUSTRY:
+                by_industry.setdefault(industry, []).append(code)
+        self._by_industry = by_industry
+
+    def update_info(self, stock_code: str, industry: Optional[str] = None,
+                    main_business: Optional[str] = None) -> None:
+        """补充某只股票的行业 / 主营业务（会同步更新行业反向索引）"""
+        entry = self._by_code.get(normalize_code(stock_code))
+        if entry is None:
+            return
+        if main_business:
+            entry['main_business'] = main_business
+        if industry and industry != entry.get('industry'):
+            old = entry.get('industry')
+            if old in self._by_industry:
+                self._by_industry[old].remove(entry['code'])
+                if not self._by_industry[old]:
+                    del self._by_industry[old]
+            entry['industry'] = industry
+            bisect.insort(self._by_industry.setdefault(industry, []), entry['code'])
+
+    # ── 查询 ─────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def __contains__(self, stock_code: str) -> bool:
+        return normalize_code(stock_code) in self._by_code
+
+    def get(self, stock_code: str) -> Optional[Dict[str, str]]:
+        """按代码查找，返回信息字典的副本；找不到返回 ``None``"""
+        entry = self._by_code.get(normalize_code(stock_code))
+        return dict(entry) if entry else None
+
+    def search(self, prefix: str, limit: int = 20) -> List[Dict[str, str]]:
+        """按代码或名称前缀搜索（代码匹配优先）"""
+        prefix = (prefix or '').strip()
+        if not prefix:
+            return []
+        codes: List[str] = []
+        if prefix.isdigit():
+            i = bisect.bisect_left(self._sorted_codes, prefix)
+            while i < len(self._sorted_codes) and len(codes) < limit \
+                    and self._sorted_codes[i].startswith(prefix):
+                codes.append(self._sorted_codes[i])
+                i += 1
+        i = bisect.bisect_left(self._sorted_names, (prefix, ''))
+        while i < len(self._sorted_names) and len(codes) < limit \
+                and self._sorted_names[i][0].startswith(prefix):
+            code = self._sorted_names[i][1]
+            if code not in codes:
+                codes.append(code)
+            i += 1
+        return [dict(self._by_code[code]) for code in codes]
+
+    def codes_in_industry(self, industry: str) -> List[str]:
+        """行业 → 该行业下的股票代码"""
+        return list(self._by_industry.get(industry, []))
+
+    def industries(self) -> List[str]:
+        return sorted(self._by_industry)
+
+    def all_codes(self) -> List[str]:
+        return list(self._sorted_codes)
+
+    def entries(self) -> List[Dict[str, str]]:
+        return [dict(self._by_code[code]) for code in self._sorted_codes]
+
+    # ── 持久化 ───────────────────────────────────────────
+
+    def save(self, path: str) -> None:
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'built_at': self.built_at, 'stocks': self.entries()},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_file(cls, path: str) -> Optional["StockUniverse"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取股票池缓存失败: {e}")
+            return None
+        universe = cls(data.get('stocks', []))
+        universe.built_at = data.get('built_at', 0)
+        return universe
+
+    @classmethod
+    def load(cls, api, path: str = "data/stock_universe.json",
+             max_age: float = 7 * 24 * 3600) -> "StockUniverse":
+        """优先读磁盘缓存；缓存缺失或过期时通过 ``api.get_stock_list()`` 重建
+
+        接口失败时退回旧缓存（即使已过期），再不行只用内置的已知股票。
+        """
+        cached = cls.load_file(path)
+        if cached is not None and len(cached) > len(SEED_INFO) \
+                and time.time() - cached.built_at < max_age:
+            return cached
+
+        try:
+            records = api.get_stock_list()
+        except Exception as e:
+            print(f"获取股票列表失败: {e}")
+            records = []
+        if not records:
+            return cached or cls()
+
+        universe = cls(records)
+        # 保留旧缓存里补充过的行业 / 主营业务
+        if cached is not None:
+            for entry in cached.entries():
+                universe.update_info(entry['code'], entry.get('industry'),
+                                     entry.get('main_business'))
+        try:
+            universe.save(path)
+        except OSError as e:
+            print(f"写入股票池缓存失败: {e}")
+        return universe
+
+
+_default_universe: Optional[StockUniverse] = None
+_default_universe_lock = threading.Lock()
+
+
+def get_default_universe(api) -> StockUniverse:
+    """进程内共享的股票池（路径取 ``STOCK_UNIVERSE_PATH``，默认 ``data/stock_universe.json``）"""
+    global _default_universe
+    with _default_universe_lock:
+        if _default_universe is None:
+            path = os.getenv("STOCK_UNIVERSE_PATH", "data/stock_universe.json")
+            _default_universe = StockUniverse.load(api, path)
+        return _default_universe
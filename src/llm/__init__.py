@@ -1,3 +1,26 @@
-from .model_api import LLMService
+"""LLM 层 — 按需导入（``instructor`` / ``openai`` 在第一次用到 ``LLMService`` 时才加载）。"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .model_api import LLMService
+
+_LAZY_ATTRS = {
+    'LLMService': '.model_api',
+}
 
 __all__ = ["LLMService"]
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
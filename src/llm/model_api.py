@@ -15,11 +15,7 @@ import traceback
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
-import instructor
-from instructor.core import InstructorRetryException
-from openai import OpenAI
-
-from ..data import MaiRuiStockAPI, NewsDataFetcher, FinancialDataFetcher
+from ..data.universe import SEED_INFO
 from .schemas import (
     AnalysisStatus,
     MarketAnalysis,
@@ -32,14 +28,50 @@ class LLMService:
     """大模型服务接口 — 基于 Instructor 的结构化 LLM 调用。"""
 
     def __init__(self, api_key: str):
-        """初始化 DeepSeek API，并通过 Instructor 包装以支持结构化输出。"""
-        self.client = instructor.from_openai(
-            OpenAI(api_key=api_key, base_url="https://api.deepseek.com"),
-            mode=instructor.Mode.TOOLS,
-        )
-        self.stock_api = MaiRuiStockAPI()
-        self.financial_api = FinancialDataFetcher()
-        self.news_api = NewsDataFetcher()
+        """保存 DeepSeek API Key；客户端和数据接口都在第一次使用时才创建。
+
+        ``instructor`` / ``openai`` 和各数据接口导入较慢，TUI 启动、只跑个股
+        分析等场景用不到全部，因此延迟到对应属性第一次被访问。
+        """
+        self.api_key = api_key
+        self._client = None
+        self._stock_api = None
+        self._financial_api = None
+        self._news_api = None
+
+    @property
+    def client(self):
+        """经 Instructor 包装、支持结构化输出的 DeepSeek 客户端"""
+        if self._client is None:
+            import instructor
+            from openai import OpenAI
+
+            self._client = instructor.from_openai(
+                OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com"),
+                mode=instructor.Mode.TOOLS,
+            )
+        return self._client
+
+    @property
+    def stock_api(self):
+        if self._stock_api is None:
+            from ..data import MaiRuiStockAPI
+            self._stock_api = MaiRuiStockAPI()
+        return self._stock_api
+
+    @property
+    def financial_api(self):
+        if self._financial_api is None:
+            from ..data import FinancialDataFetcher
+            self._financial_api = FinancialDataFetcher()
+        return self._financial_api
+
+    @property
+    def news_api(self):
+        if self._news_api is None:
+            from ..data import NewsDataFetcher
+            self._news_api = NewsDataFetcher()
+        return self._news_api
 
     # ──────────────────────────────────────────────
     # 公共方法
@@ -59,7 +91,7 @@ class LLMService:
         Args:
             stock_info: 股票基本信息（含 code, name, industry, main_business）。
             news_list: 相关新闻列表，最多取前 3 条。
-            financial_data: 财务数据（含 revenue, net_profit, gross_margin, roe）。
+            financial_data: 财务数据（``get_financial_data`` 的结果，含营收、利润率、ROE、增长等）。
 
         Returns:
             dict: 包含 status / analysis / trading_advice / timestamp 的 dict。
@@ -104,7 +136,9 @@ class LLMService:
             if progress_callback:
                 progress_callback("第 1/3 步：AI 从新闻中推荐股票...")
             recommendations = self._step1_recommend_stocks(news_list)
-            recommended_stocks = [r.code for r in recommendations.recommendations]
+            recommended_stocks = self._known_codes(
+                [r.code for r in recommendations.recommendations]
+            )
             print(f"\n解析出的股票代码: {recommended_stocks}")
 
             if not recommended_stocks:
@@ -219,11 +253,18 @@ class LLMService:
 """
 
         prompt += f"""
-4. 主要财务指标:
+4. 主要财务指标（报告期 {financial_data.get('report_period')}，累计值，比率单位 %）:
 营业收入: {financial_data.get('revenue')}
 净利润: {financial_data.get('net_profit')}
 毛利率: {financial_data.get('gross_margin')}
+净利率: {financial_data.get('net_margin')}
 ROE: {financial_data.get('roe')}
+资产负债率: {financial_data.get('debt_ratio')}
+流动比率: {financial_data.get('current_ratio')}
+经营现金流/净利润: {financial_data.get('ocf_to_net_profit')}
+营收同比: {financial_data.get('revenue_yoy')}
+净利润同比: {financial_data.get('net_profit_yoy')}
+营收环比（单季）: {financial_data.get('revenue_qoq')}
 
 请从以下几个方面进行分析并给出具体建议：
 
@@ -259,19 +300,62 @@ ROE: {financial_data.get('roe')}
     # 私有方法 — 市场分析三步流程
     # ──────────────────────────────────────────────
 
+    def _tag_news(self, news_list: List[Dict]) -> List[Dict]:
+        """用股票池实体链接器给新闻打上 ``stocks`` 标签；失败时原样返回"""
+        try:
+            return self.stock_api.entity_linker.tag_news(news_list)
+        except Exception as e:
+            print(f"新闻股票标注失败: {str(e)}")
+            return news_list
+
+    def _known_codes(self, codes: List[str]) -> List[str]:
+        """去掉股票池里不存在的代码（模型编造的）；股票池未加载时原样返回"""
+        try:
+            universe = self.stock_api.universe
+        except Exception:
+            return codes
+        if len(universe) <= len(SEED_INFO):
+            return codes
+        known = [code for code in codes if code in universe]
+        dropped = [code for code in codes if code not in universe]
+        if dropped:
+            print(f"忽略股票池中不存在的代码: {dropped}")
+        return known
+
     def _step1_recommend_stocks(self, news_list: List[Dict]) -> StockRecommendations:
-        """第一步：根据新闻推荐 3-5 只股票。"""
+        """第一步：根据新闻推荐 3-5 只股票。
+
+        新闻先经实体链接标注提到的股票：提到具体股票的新闻优先放进提示词，
+        并把被提及的股票作为候选列表提供给模型。
+        """
+        tagged = self._tag_news(news_list)
+        # 稳定排序：提到具体股票的新闻排在前面
+        selected = sorted(tagged, key=lambda news: not news.get('stocks'))[:10]
+        universe = self.stock_api.universe if any(n.get('stocks') for n in selected) else None
+
+        def describe(code: str) -> str:
+            info = universe.get(code) if universe is not None else None
+            return f"{code} {info['name']}" if info else code
+
         prompt = f"""请分析以下最新市场新闻,并推荐3-5只值得关注的股票：
 
 1. 最新市场新闻：
 """
-        for i, news in enumerate(news_list[:10], 1):
+        for i, news in enumerate(selected, 1):
             prompt += f"""
 新闻{i}:
 标题: {news.get('title')}
 时间: {news.get('time')}
 内容: {news.get('content')}
 """
+            if news.get('stocks'):
+                prompt += f"提及股票: {'、'.join(describe(code) for code in news['stocks'])}\n"
+
+        candidates = self.stock_api.entity_linker.candidates(selected, limit=15) if universe else []
+        if candidates:
+            prompt += "\n2. 新闻中提及的股票（括号内为提及的新闻条数，请优先从中选择）：\n"
+            prompt += "、".join(f"{describe(code)}({count})" for code, count in candidates)
+            prompt += "\n"
 
         prompt += """
 请根据以上新闻分析当前市场环境，并推荐3-5只值得关注的股票。
@@ -315,17 +399,28 @@ ROE: {financial_data.get('roe')}
     ) -> List[Dict]:
         """第二步：获取推荐股票的详细信息（行情 + 财务 + 新闻 + 技术指标）。
         
-        每只股票依次拉取 4 个数据接口（get_stock_info / financial / news / tech_indicators），
+        技术指标先对全部股票批量计算，再逐只拉取 get_stock_info / financial / news，
         通过 progress_callback 实时通知 UI，避免长时间无反馈。
         """
         stock_details = []
         total = len(stock_codes)
+        # 技术指标对全部推荐股一次批量计算（本地K线 + 矩阵运算），
+        # 不再每只股票单独拉K线、单独算
+        try:
+            indicator_panel = self.stock_api.get_technical_indicators_batch(stock_codes)
+        except Exception as e:
+            print(f"批量计算技术指标失败，逐只获取: {str(e)}")
+            indicator_panel = {}
+        # 财务指标同样对全部推荐股一次算完（本地财务仓库 + 列运算）
+        financial_panel = self.financial_api.get_financial_data_batch(stock_codes)
         for i, stock_code in enumerate(stock_codes, 1):
             msg = f"  [{i}/{total}] 获取 {stock_code} 行情+财务+新闻..."
             print(f"\n{msg}")
             if progress_callback:
                 progress_callback(msg)
-            details = self._get_stock_details(stock_code)
+            details = self._get_stock_details(
+                stock_code, indicator_panel.get(stock_code), financial_panel.get(stock_code)
+            )
             if details:
                 stock_details.append(details)
                 ok_msg = f"  ✓ {stock_code} 详情获取完成"
@@ -410,13 +505,25 @@ ROE: {financial_data.get('roe')}
     # 私有方法 — 数据获取 & 错误处理
     # ──────────────────────────────────────────────
 
-    def _get_stock_details(self, stock_code: str) -> Dict[str, Any]:
-        """获取股票详细信息（用于市场分析第二步）。"""
+    def _get_stock_details(
+        self, stock_code: str,
+        technical_indicators: Optional[Dict[str, Any]] = None,
+        financial_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """获取股票详细信息（用于市场分析第二步）。
+
+        Args:
+            stock_code: 股票代码。
+            technical_indicators: 已批量算好的技术指标；为空时单独获取。
+            financial_data: 已批量算好的财务指标；为空时单独获取。
+        """
         try:
             basic_info = self.stock_api.get_stock_info(stock_code)
-            financial_data = self.financial_api.get_financial_data(stock_code)
+            if not financial_data:
+                financial_data = self.financial_api.get_financial_data(stock_code)
             news = self.news_api.get_stock_news(stock_code, days=7)
-            technical_indicators = self.stock_api.get_technical_indicators(stock_code)
+            if not technical_indicators:
+                technical_indicators = self.stock_api.get_technical_indicators(stock_code)
 
             return {
                 "basic_info": basic_info,
@@ -439,6 +546,11 @@ ROE: {financial_data.get('roe')}
         if log_traceback:
             error_msg = f"{error_msg}\n{traceback.format_exc()}"
 
+        try:
+            from instructor.core import InstructorRetryException
+        except ImportError:  # instructor 未安装时 e 本身就是导入失败
+            InstructorRetryException = ()
+
         # Instructor 重试耗尽 → validation_error
         # NOTE: error_dict(error_msg, error_type) 签名: 第一个是 message, 第二个是 type
         if isinstance(e, InstructorRetryException):
@@ -1,9 +1,9 @@
 """src/tui/runner.py"""
 from textual.message import Message
-from typing import Dict, Any, List, Optional
-from src.data import MaiRuiStockAPI, FinancialDataFetcher, NewsDataFetcher
-from src.llm import LLMService
+from typing import Dict, Optional
+from src.data.analysis_reuse import plan_reuse, stamp_market_result, stamp_stock_result
 from src.data.database import DatabaseManager
+from src.data.dedup import dedup_news
 
 
 class AnalysisProgress(Message):
@@ -33,8 +33,16 @@ class AnalysisRunner:
         self.post_message(AnalysisProgress(stock_code, stage, message, result))
 
     async def run_analysis(self, portfolio: Dict[str, Dict[str, float]],
-                           balance: float) -> None:
-        """在后台线程运行的完整分析流程。"""
+                           balance: float, force: bool = False) -> None:
+        """在后台线程运行的完整分析流程。
+
+        非交易日里，最近一次收盘后以相同持仓 / 资金分析过的结果直接沿用
+        数据库里的记录，不再重新拉数据、调用模型（``force=True`` 时照常分析）。
+        """
+        # 数据 / LLM 客户端导入较慢，开始分析时才加载
+        from src.data import MaiRuiStockAPI, FinancialDataFetcher, NewsDataFetcher
+        from src.llm import LLMService
+
         try:
             stock_api = MaiRuiStockAPI()
             news_api = NewsDataFetcher()
@@ -42,46 +50,67 @@ class AnalysisRunner:
             llm = LLMService(self.api_key)
             db = DatabaseManager()
 
-            # 1. 分析每只持仓股
+            plan = plan_reuse(db, portfolio, balance, force)
+            reused, reused_market, pending = plan.stocks, plan.market, plan.pending
+
+            # 市场新闻先拉一次：既用于市场分析，也按提到的股票分发给持仓
+            market_news = []
+            if pending or reused_market is None:
+                market_news = stock_api.entity_linker.tag_news(news_api.get_daily_news(min_count=20))
+            routed_news = stock_api.entity_linker.route(market_news, pending)
+
+            # 1. 分析每只持仓股（实时行情、财务指标一次批量拉齐）
+            quotes = stock_api.get_realtime_quotes(pending) if pending else {}
+            financials = fin_api.get_financial_data_batch(pending) if pending else {}
             for stock_code, position in portfolio.items():
+                if stock_code in reused:
+                    self._emit(stock_code, "stock_done",
+                               f"♻️ {stock_code} 非交易日，沿用 {reused[stock_code].get('timestamp')} 的分析",
+                               reused[stock_code])
+                    continue
+
                 self._emit(stock_code, "fetch_info", f"获取 {stock_code} 信息...")
                 stock_info = stock_api.get_stock_info(stock_code)
                 if not stock_info:
                     self._emit(stock_code, "error", f"无法获取 {stock_code} 信息")
                     continue
 
-                try:
-                    quote = stock_api.get_realtime_quote(stock_code)
-                    stock_info["current_price"] = quote.get("price", 0)
-                except Exception:
-                    stock_info["current_price"] = 0
+                quote = quotes.get(stock_code) or {}
+                stock_info["current_price"] = quote.get("price", 0)
 
                 db.save_stock_info(stock_info)
 
                 self._emit(stock_code, "fetch_news", f"获取 {stock_code} 新闻...")
                 news_list = news_api.get_stock_news(stock_code)
+                news_list = dedup_news(news_list + routed_news.get(stock_code, []))
                 db.save_news(news_list, stock_code)
 
-                financial_data = fin_api.get_financial_data(stock_code)
+                financial_data = financials.get(stock_code) or {}
                 stock_info["position"] = position
 
                 self._emit(stock_code, "llm_analysis", f"🤖 {stock_code} LLM 分析中...")
                 result = llm.analyze_stock(stock_info, news_list, financial_data)
                 if result["status"] == "success":
                     result["stock_name"] = stock_info.get("name", "")
-                    db.save_stock_analysis(stock_code, result)
+                    db.save_stock_analysis(stock_code, stamp_stock_result(result, stock_code, position))
 
                 self._emit(stock_code, "stock_done", f"✅ {stock_code} 完成", result)
 
             # 2. 市场分析
-            self._emit("", "market_start", "获取市场新闻...")
-            market_news = news_api.get_daily_news(min_count=20)
+            if reused_market is not None:
+                self._emit("", "all_done",
+                           f"✅ 全部完成（非交易日，沿用 {reused_market.get('timestamp')} 的市场分析）",
+                           {"market_result": reused_market})
+                return
+
+            self._emit("", "market_start", "整理市场新闻...")
             if not market_news:
                 self._emit("", "market_skip", "⚠️ 无当日市场新闻，跳过市场分析")
                 self._emit("", "all_done", "✅ 持仓分析完成（无市场新闻）")
                 return
 
             db.save_news(market_news)
+            db.save_news_by_stock(market_news)
             self._emit("", "market_llm", f"🤖 市场分析开始（{len(market_news)} 条新闻）...")
 
             market_result = llm.analyze_market(
@@ -89,6 +118,7 @@ class AnalysisRunner:
                 progress_callback=lambda msg: self._emit("", "market_progress", msg),
             )
             if market_result["status"] == "success":
+                stamp_market_result(market_result, portfolio, balance)
                 db.save_market_analysis(market_result, balance)
 
             self._emit("", "all_done", "✅ 全部完成", {
@@ -2,8 +2,6 @@
 from textual.containers import Vertical
 from textual.widgets import Button, Static, RichLog, Input
 from textual import work
-from src.data import NewsDataFetcher
-from src.llm import LLMService
 from src.data.database import DatabaseManager
 
 
@@ -23,6 +21,10 @@ class MarketScreen(Vertical):
         balance = float(cash_input.value or 100000)
 
         import os
+        # 数据 / LLM 客户端导入较慢，点“开始扫描”时才加载
+        from src.data import NewsDataFetcher
+        from src.llm import LLMService
+
         api_key = os.getenv("DEEPSEEK_API_KEY") or os.getenv("DASHSCOPE_API_KEY", "")
         llm = LLMService(api_key)
         news_api = NewsDataFetcher()
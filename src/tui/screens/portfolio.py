@@ -110,6 +110,8 @@ class PortfolioScreen(Vertical):
         with Horizontal(id="bottom-bar"):
             yield RichLog(id="progress-log", max_lines=5)
             yield Button("▶ 运行分析", id="run-btn", classes="action-btn")
+            # 非交易日默认沿用收盘后的结果，这里强制重新拉数据、调用模型
+            yield Button("⟳ 强制重新分析", id="force-run-btn", classes="action-btn")
 
         # 底部：历史记录
         yield Static("📋 历史记录", id="history-title", classes="section-title")
@@ -233,6 +235,9 @@ class PortfolioScreen(Vertical):
             elif btn_id == "run-btn":
                 self._run_analysis()
 
+            elif btn_id == "force-run-btn":
+                self._run_analysis(force=True)
+
             elif btn_id == "history-query-btn":
                 self._query_history()
 
@@ -242,12 +247,12 @@ class PortfolioScreen(Vertical):
     # ── 运行分析 ─────────────────────────────────────────────
 
     @work(thread=True)
-    async def _run_analysis(self) -> None:
+    async def _run_analysis(self, force: bool = False) -> None:
         runner = AnalysisRunner(api_key=self._get_api_key())
         runner.post_message = self.post_message
         store = PortfolioStore()
         portfolio = store.load()
-        await runner.run_analysis(portfolio, balance=100000.0)
+        await runner.run_analysis(portfolio, balance=100000.0, force=force)
 
     def on_analysis_progress(self, msg: AnalysisProgress) -> None:
         log = self.query_one("#progress-log", RichLog)
@@ -1,7 +1,7 @@
 """src/tui/screens/realtime.py"""
 from textual.containers import Horizontal, Vertical
 from textual.widgets import DataTable, Button, Input
-from src.data import MaiRuiStockAPI
+from src.data.streaming import TickIndicatorBook
 
 
 class RealtimeScreen(Vertical):
@@ -17,14 +17,18 @@ class RealtimeScreen(Vertical):
 
     def on_mount(self) -> None:
         table = self.query_one("#quote-table", DataTable)
-        table.add_columns("代码", "名称", "最新价", "涨跌幅", "成交量")
+        table.add_columns("代码", "名称", "最新价", "涨跌幅", "成交量", "均价", "RSI")
         self._stock_codes = ["600036", "000858", "600519", "601318"]
+        # 每只股票的流式指标状态：每次刷新只喂入新 tick，O(1) 更新，
+        # 会话开多久都不用从头重算
+        self._indicators = TickIndicatorBook()
         self._auto_refresh = False
         # 持有 Timer 引用：set_interval 返回的句柄需要保存，否则
         # 关闭自动刷新时无法停止，多按几次「自动」按钮会泄漏出 N 个
         # 并发计时器（每次都跑 30s 一次网络请求 → API 配额被双扣）。
         self._auto_timer = None
-        self._do_refresh()
+        # 首帧画出来之后再拉行情，网络请求不挡启动
+        self.call_after_refresh(self._do_refresh)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "refresh-btn":
@@ -49,12 +53,17 @@ class RealtimeScreen(Vertical):
                     self._auto_timer = None
 
     def _do_refresh(self) -> None:
+        from src.data import MaiRuiStockAPI
+
         api = MaiRuiStockAPI()
         table = self.query_one("#quote-table", DataTable)
         table.clear()
+        # 一次性并发拉取全部行情，避免 N 只股票 N 次串行往返
+        quotes = api.get_realtime_quotes(self._stock_codes)
         for code in self._stock_codes:
             try:
-                quote = api.get_realtime_quote(code)
+                quote = quotes.get(code) or {}
+                stream = self._indicators.update(code, quote)
                 info = api.get_stock_info(code)
                 price = quote.get("price", 0)
                 open_p = quote.get("open", price)
@@ -62,6 +71,10 @@ class RealtimeScreen(Vertical):
                 vol = quote.get("volume", 0)
                 name = info.get("name", code) if info else code
                 change_str = f"{'+' if change_pct >= 0 else ''}{change_pct:.2f}%"
-                table.add_row(code, name, f"{price:.2f}", change_str, str(vol))
+                vwap = stream.get("vwap")
+                rsi = stream.get("rsi")
+                table.add_row(code, name, f"{price:.2f}", change_str, str(vol),
+                              f"{vwap:.2f}" if vwap is not None else "—",
+                              f"{rsi:.1f}" if rsi is not None else "—")
             except Exception:
-                table.add_row(code, "—", "—", "—", "—")
+                table.add_row(code, "—", "—", "—", "—", "—", "—")
@@ -0,0 +1,6 @@
+"""pytest 配置：把项目根目录加入 ``sys.path``，测试里直接 ``import src.data...``"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
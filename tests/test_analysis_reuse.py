@@ -0,0 +1,102 @@
+"""src/data/analysis_reuse.py：非交易日沿用已保存分析结果的判断"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.data.analysis_reuse import (
+    plan_reuse, portfolio_fingerprint, position_fingerprint,
+    stamp_market_result, stamp_stock_result,
+)
+from src.data.database import DatabaseManager
+from src.data.trade_calendar import TradeCalendar
+
+PORTFOLIO = {
+    '600036': {'shares': 1000, 'cost': 30.5},
+    '000858': {'shares': 500, 'cost': 45.2},
+}
+BALANCE = 100000.0
+
+
+class HolidayCalendar(TradeCalendar):
+    """今天是非交易日、``valid`` 时间之后生成的结果都算有效"""
+
+    def __init__(self, valid_after: str):
+        super().__init__()
+        self.valid_after = datetime.fromisoformat(valid_after)
+
+    def result_still_valid(self, timestamp, now=None):
+        return bool(timestamp) and datetime.fromisoformat(timestamp) >= self.valid_after
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'analysis.db'))
+    for code, position in PORTFOLIO.items():
+        result = {'status': 'success', 'analysis': code, 'timestamp': '2024-10-02T10:00:00'}
+        db.save_stock_analysis(code, stamp_stock_result(result, code, position))
+    market = {'status': 'success', 'analysis': 'market', 'timestamp': '2024-10-02T10:00:00'}
+    db.save_market_analysis(stamp_market_result(market, PORTFOLIO, BALANCE), BALANCE)
+    return db
+
+
+CALENDAR = HolidayCalendar('2024-09-30T15:30:00')
+
+
+def test_fingerprints_depend_on_inputs():
+    assert position_fingerprint('600036', {'shares': 1000, 'cost': 30.5}) == \
+        position_fingerprint('600036', {'shares': 1000.0, 'cost': 30.50, 'name': 'x'})
+    assert position_fingerprint('600036', {'shares': 1000, 'cost': 30.5}) != \
+        position_fingerprint('600036', {'shares': 1100, 'cost': 30.5})
+    assert portfolio_fingerprint(PORTFOLIO, BALANCE) == \
+        portfolio_fingerprint(dict(reversed(list(PORTFOLIO.items()))), BALANCE)
+    assert portfolio_fingerprint(PORTFOLIO, BALANCE) != portfolio_fingerprint(PORTFOLIO, BALANCE + 1)
+
+
+def test_unchanged_inputs_are_reused(db):
+    plan = plan_reuse(db, PORTFOLIO, BALANCE, calendar=CALENDAR)
+    assert set(plan.stocks) == set(PORTFOLIO)
+    assert plan.market['analysis'] == 'market'
+    assert plan.pending == []
+
+
+def test_force_reanalyzes_everything(db):
+    plan = plan_reuse(db, PORTFOLIO, BALANCE, force=True, calendar=CALENDAR)
+    assert not plan.any_reused
+    assert plan.pending == list(PORTFOLIO)
+
+
+def test_changed_position_and_balance(db):
+    portfolio = {**PORTFOLIO, '600036': {'shares': 2000, 'cost': 30.5}}
+    plan = plan_reuse(db, portfolio, BALANCE, calendar=CALENDAR)
+    assert plan.pending == ['600036']
+    assert plan.market is None
+
+    plan = plan_reuse(db, PORTFOLIO, BALANCE * 2, calendar=CALENDAR)
+    assert plan.pending == []
+    assert plan.market is None
+
+
+def test_added_or_removed_position(db):
+    plan = plan_reuse(db, {**PORTFOLIO, '601318': {'shares': 100, 'cost': 50}}, BALANCE,
+                      calendar=CALENDAR)
+    assert plan.pending == ['601318']
+    assert plan.market is None
+
+    plan = plan_reuse(db, {'600036': PORTFOLIO['600036']}, BALANCE, calendar=CALENDAR)
+    assert plan.pending == []
+    assert plan.market is None
+
+
+def test_stale_or_unstamped_results_are_not_reused(db):
+    plan = plan_reuse(db, PORTFOLIO, BALANCE, calendar=HolidayCalendar('2024-10-03T00:00:00'))
+    assert plan.pending == list(PORTFOLIO) and plan.market is None
+
+    db.save_stock_analysis('600036', {'status': 'success', 'timestamp': '2024-10-02T11:00:00'})
+    assert plan_reuse(db, PORTFOLIO, BALANCE, calendar=CALENDAR).pending == ['600036']
+
+
+def test_real_calendar_on_trading_day_never_reuses(db):
+    today = date.today()
+    calendar = TradeCalendar([today], today - timedelta(days=1), today + timedelta(days=1))
+    assert plan_reuse(db, PORTFOLIO, BALANCE, calendar=calendar).pending == list(PORTFOLIO)
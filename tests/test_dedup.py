@@ -0,0 +1,116 @@
+"""src/data/dedup.py 的 SimHash 近似去重，以及 DatabaseManager.save_news 的入库去重"""
+
+import sqlite3
+
+import pytest
+
+from src.data.database import DatabaseManager
+from src.data.dedup import (
+    NewsDeduplicator, SimHashIndex, dedup_news, hamming, news_fingerprint,
+    normalize_text, simhash,
+)
+
+TITLE = '招商银行三季度净利润同比增长百分之八，资产质量保持稳定'
+CONTENT = '招商银行发布三季度报告，前三季度实现营业收入两千五百亿元，归母净利润同比增长百分之八，不良率环比持平。'
+
+
+def _news(title=TITLE, content=CONTENT, time='2024-10-30 18:00:00'):
+    return {'title': title, 'content': content, 'source': 'test', 'time': time, 'url': ''}
+
+
+def _count(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_normalize_text_strips_punctuation_and_fullwidth():
+    assert normalize_text('ＡＢＣ，招商 银行！') == 'abc招商银行'
+
+
+def test_simhash_near_and_far():
+    base = simhash(f"{TITLE} {CONTENT}")
+    near = simhash(f"【快讯】{TITLE}。 {CONTENT}")
+    far = simhash('宁德时代发布新一代钠离子电池，能量密度大幅提升 量产时间提前到明年')
+    assert simhash('') == 0
+    assert hamming(base, near) <= 3
+    assert hamming(base, far) > 10
+
+
+def test_index_finds_within_threshold():
+    index = SimHashIndex(threshold=3)
+    index.add(0b1011)
+    assert index.find(0b1011 ^ 0b111) == 0b1011
+    assert index.find(0b1011 ^ 0b1111 << 20) is None
+
+
+def test_dedup_news_keeps_first_of_each_group():
+    items = [
+        _news(),
+        _news(title=f"{TITLE}！"),
+        _news(title='宁德时代发布新一代钠离子电池，能量密度大幅提升', content='电池'),
+    ]
+    assert dedup_news(items) == [items[0], items[2]]
+
+
+def test_title_only_source_matches_full_article():
+    assert news_fingerprint(_news(content=TITLE))[0] != 0
+    assert dedup_news([_news(), _news(content=TITLE)]) == [_news()]
+
+
+def test_deduplicator_only_registers_after_commit(tmp_path):
+    dedup = NewsDeduplicator(str(tmp_path / 'news.db'))
+    fresh = dedup.find_new([_news()], '600036')
+    assert len(fresh) == 1
+    # 未登记前仍视为新新闻
+    assert len(dedup.find_new([_news()], '600036')) == 1
+    with sqlite3.connect(dedup.db_path) as conn:
+        dedup.record(conn, '600036', fresh)
+    dedup.register('600036', fresh)
+    assert dedup.find_new([_news()], '600036') == []
+    # 按股票分组
+    assert len(dedup.find_new([_news()], '000858')) == 1
+    # 指纹落盘，新实例也能判重
+    assert NewsDeduplicator(dedup.db_path).find_new([_news()], '600036') == []
+
+
+def test_save_news_skips_near_duplicates(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'news.db'))
+    db.save_news([_news()], '600036')
+    db.save_news([_news(title=f"【快讯】{TITLE}", time='2024-10-30 18:05:00')], '600036')
+    assert _count(db.db_path, 'news_data') == 1
+    assert _count(db.db_path, 'news_fingerprints') == 1
+
+
+def test_save_news_updates_same_article(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'news.db'))
+    db.save_news([_news(content=TITLE)], '600036')
+    db.save_news([_news()], '600036')
+    with sqlite3.connect(db.db_path) as conn:
+        rows = conn.execute("SELECT content FROM news_data").fetchall()
+    assert rows == [(CONTENT,)]
+
+
+def test_failed_insert_does_not_mark_duplicate(tmp_path, monkeypatch):
+    db = DatabaseManager(str(tmp_path / 'news.db'))
+
+    def broken(*args, **kwargs):
+        raise RuntimeError('normalize failed')
+
+    monkeypatch.setattr(db, '_normalize_news_time', broken)
+    with pytest.raises(RuntimeError):
+        db.save_news([_news()], '600036')
+    monkeypatch.undo()
+
+    assert _count(db.db_path, 'news_fingerprints') == 0
+    db.save_news([_news()], '600036')
+    assert _count(db.db_path, 'news_data') == 1
+
+
+def test_resaving_market_news_keeps_one_row(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'news.db'))
+    batch = [_news(), _news(title='宁德时代发布新一代钠离子电池，能量密度大幅提升', content='电池')]
+    db.save_news(batch)
+    db.save_news(batch)
+    # 新的 DatabaseManager（新进程）也不会重复插入
+    DatabaseManager(db.db_path).save_news(batch)
+    assert _count(db.db_path, 'news_data') == 2
@@ -0,0 +1,104 @@
+"""src/data/endpoints.py 的主机选择器状态转换"""
+
+import time
+
+import pytest
+
+from src.data.endpoints import CLOSED, HALF_OPEN, OPEN, EndpointSelector
+
+PRIMARY = 'https://primary'
+BACKUP = 'https://backup'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    return now
+
+
+def _state(selector, host):
+    return next(s['state'] for s in selector.stats() if s['host'] == host)
+
+
+def _selector(**kwargs):
+    kwargs.setdefault('failure_threshold', 2)
+    kwargs.setdefault('cooldown', 30.0)
+    return EndpointSelector([PRIMARY, BACKUP], **kwargs)
+
+
+def test_configured_order_until_measured(clock):
+    selector = _selector()
+    assert selector.candidates() == [PRIMARY, BACKUP]
+    selector.record_success(PRIMARY, 0.5)
+    selector.record_success(BACKUP, 0.1)
+    assert selector.candidates() == [BACKUP, PRIMARY]
+
+
+def test_trips_after_consecutive_failures(clock):
+    selector = _selector()
+    selector.record_failure(PRIMARY)
+    assert _state(selector, PRIMARY) == CLOSED
+    selector.record_failure(PRIMARY)
+    assert _state(selector, PRIMARY) == OPEN
+    # 熔断中的主机排到最后
+    assert selector.candidates() == [BACKUP, PRIMARY]
+
+
+def test_half_open_probe_success_closes(clock):
+    selector = _selector()
+    selector.record_failure(PRIMARY)
+    selector.record_failure(PRIMARY)
+    clock[0] += 30
+    assert selector.candidates()[0] == PRIMARY
+    assert _state(selector, PRIMARY) == HALF_OPEN
+    # 同一时刻只放行一个探测
+    assert selector.candidates()[-1] == PRIMARY
+    selector.record_success(PRIMARY, 0.1)
+    assert _state(selector, PRIMARY) == CLOSED
+
+
+def test_half_open_probe_failure_reopens(clock):
+    selector = _selector()
+    selector.record_failure(PRIMARY)
+    selector.record_failure(PRIMARY)
+    clock[0] += 30
+    selector.candidates()
+    selector.record_failure(PRIMARY)
+    assert _state(selector, PRIMARY) == OPEN
+    clock[0] += 10
+    assert selector.candidates() == [BACKUP, PRIMARY]
+
+
+def test_release_allows_next_probe(clock):
+    selector = _selector()
+    selector.record_failure(PRIMARY)
+    selector.record_failure(PRIMARY)
+    clock[0] += 30
+    selector.candidates()
+    selector.release(PRIMARY)
+    assert _state(selector, PRIMARY) == OPEN
+    assert selector.candidates()[0] == PRIMARY
+    assert _state(selector, PRIMARY) == HALF_OPEN
+
+
+def test_lost_probe_expires(clock):
+    selector = _selector(probe_timeout=60.0)
+    selector.record_failure(PRIMARY)
+    selector.record_failure(PRIMARY)
+    clock[0] += 30
+    selector.candidates()
+    clock[0] += 59
+    assert selector.candidates()[-1] == PRIMARY
+    clock[0] += 1
+    assert selector.candidates()[0] == PRIMARY
+
+
+def test_stale_healthy_host_is_remeasured(clock):
+    selector = _selector(probe_interval=300.0)
+    selector.candidates()
+    selector.record_success(PRIMARY, 0.5)
+    selector.record_success(BACKUP, 0.1)
+    assert selector.candidates()[0] == BACKUP
+    clock[0] += 300
+    assert selector.candidates()[0] == PRIMARY
@@ -0,0 +1,89 @@
+"""src/data/entity_linker.py 的 Aho-Corasick 匹配与股票实体链接"""
+
+import pytest
+
+from src.data.entity_linker import AhoCorasick, StockEntityLinker
+from src.data.universe import StockUniverse
+
+RECORDS = [
+    {'dm': '600000', 'mc': '浦发银行', 'jys': 'sh'},
+    {'dm': '000001', 'mc': '平安银行', 'jys': 'sz'},
+    {'dm': '600030', 'mc': '中信证券', 'jys': 'sh'},
+    {'dm': '601998', 'mc': '中信银行', 'jys': 'sh'},
+    {'dm': '000004', 'mc': '*ST国华', 'jys': 'sz'},
+    {'dm': '600804', 'mc': '*ST鹏博士', 'jys': 'sh'},
+    {'dm': '000333', 'mc': '美的', 'jys': 'sz'},
+]
+
+
+@pytest.fixture(scope='module')
+def linker():
+    return StockEntityLinker(StockUniverse(RECORDS))
+
+
+def test_automaton_reports_overlapping_matches():
+    automaton = AhoCorasick()
+    for pattern in ('he', 'she', 'his', 'hers'):
+        automaton.add(pattern, pattern)
+    assert sorted(automaton.iter_matches('ushers')) == [(1, 4, 'she'), (2, 4, 'he'), (2, 6, 'hers')]
+
+
+def test_links_names_and_stripped_prefix(linker):
+    assert linker.link('浦发银行与平安银行同日公告') == ['600000', '000001']
+    assert linker.link('鹏博士今日复牌') == ['600804']
+    assert linker.link('*ST国华今日复牌') == ['000004']
+
+
+@pytest.mark.parametrize('text', [
+    '中国华电发布公告',
+    '国华今日复牌',
+    '美的集团',
+    '完美的开局',
+])
+def test_short_names_inside_words_are_ignored(linker, text):
+    assert linker.link(text) == []
+
+
+@pytest.mark.parametrize('text', ['美的 发布公告', '（美的）涨停', '美的'])
+def test_short_name_with_boundary_is_linked(linker, text):
+    assert linker.link(text) == ['000333']
+
+
+def test_leftmost_longest(linker):
+    # “中信证券”不会再额外算一次更短的名称
+    assert linker.mentions('中信证券、中信银行、中信证券') == {'600030': 2, '601998': 1}
+
+
+@pytest.mark.parametrize('text', [
+    '浦发银行(600000)',
+    '浦发银行（600000）',
+    '600000.SH 涨停',
+    'SH600000',
+    'sh600000',
+    '代码: 600000,',
+    '600000',
+])
+def test_code_with_boundary_is_linked(linker, text):
+    assert linker.link(text) == ['600000']
+
+
+@pytest.mark.parametrize('text', [
+    '成交额600000元',
+    '持有000001股',
+    '共6000001笔',
+    '编号A600000',
+    'ASH600000',
+    '20240600000',
+    '约600000万',
+])
+def test_code_inside_amount_is_ignored(linker, text):
+    assert linker.link(text) == []
+
+
+def test_route_only_wanted_codes(linker):
+    news = [
+        {'title': '浦发银行发布公告', 'content': ''},
+        {'title': '平安银行成交600000元', 'content': ''},
+    ]
+    routed = linker.route(linker.tag_news(news), ['600000', '600030'])
+    assert routed == {'600000': [{**news[0], 'stocks': ['600000']}], '600030': []}
@@ -0,0 +1,75 @@
+"""src/data/financial_ratios.py：在手工构造的两年报表上核对指标口径"""
+
+import pandas as pd
+import pytest
+
+from src.data.financial_ratios import compute_ratios, financial_data_by_code
+
+CODE = '600036.SH'
+# 累计营收 / 归母净利润（A 股报表是年初至今累计值）
+INCOME = {
+    '20230331': (100.0, 10.0),
+    '20230630': (220.0, 22.0),
+    '20230930': (330.0, 33.0),
+    '20231231': (450.0, 45.0),
+    '20240331': (120.0, 12.0),
+    '20240630': (260.0, 26.0),
+}
+EQUITY = {'20231231': 500.0, '20240630': 540.0}
+
+
+@pytest.fixture(scope='module')
+def ratios():
+    income = pd.DataFrame([
+        {'ts_code': CODE, 'end_date': period, 'revenue': revenue, 'oper_cost': revenue * 0.6,
+         'n_income': profit, 'n_income_attr_p': profit}
+        for period, (revenue, profit) in INCOME.items()
+    ])
+    balancesheet = pd.DataFrame([
+        {'ts_code': CODE, 'end_date': period, 'total_hldr_eqy_exc_min_int': equity,
+         'total_assets': equity * 2, 'total_liab': equity}
+        for period, equity in EQUITY.items()
+    ])
+    indicator = pd.DataFrame([{'ts_code': CODE, 'end_date': '20230331', 'roe': 1.5}])
+    return compute_ratios(income, balancesheet, None, indicator).set_index('end_date')
+
+
+def test_sorted_latest_first(ratios):
+    assert list(ratios.index) == sorted(INCOME, reverse=True)
+
+
+def test_roe_uses_average_equity(ratios):
+    # 26 / ((540 + 500) / 2)
+    assert ratios.loc['20240630', 'roe'] == pytest.approx(5.0)
+    # 上年末缺失时用期末值：45 / 500
+    assert ratios.loc['20231231', 'roe'] == pytest.approx(9.0)
+    # 算不出来时用 fina_indicator 补齐
+    assert ratios.loc['20230331', 'roe'] == pytest.approx(1.5)
+
+
+def test_margins_and_leverage(ratios):
+    assert ratios.loc['20240630', 'gross_margin'] == pytest.approx(40.0)
+    assert ratios.loc['20240630', 'net_margin'] == pytest.approx(10.0)
+    assert ratios.loc['20240630', 'debt_ratio'] == pytest.approx(50.0)
+
+
+def test_revenue_yoy_on_cumulative_values(ratios):
+    assert ratios.loc['20240630', 'revenue_yoy'] == pytest.approx((260 - 220) / 220 * 100)
+    assert ratios.loc['20240331', 'revenue_yoy'] == pytest.approx(20.0)
+    assert pd.isna(ratios.loc['20231231', 'revenue_yoy'])
+
+
+def test_revenue_qoq_on_single_quarters(ratios):
+    # 二季度单季 140 对一季度 120
+    assert ratios.loc['20240630', 'revenue_qoq'] == pytest.approx((140 - 120) / 120 * 100)
+    # 一季度单季 120 对上年四季度单季 450 - 330
+    assert ratios.loc['20240331', 'revenue_qoq'] == pytest.approx(0.0)
+    assert pd.isna(ratios.loc['20230331', 'revenue_qoq'])
+
+
+def test_financial_data_by_code(ratios):
+    data = financial_data_by_code(ratios.reset_index(), [CODE, '000001.SZ'])
+    assert data['000001.SZ'] == {}
+    assert data[CODE]['report_period'] == '20240630'
+    assert data[CODE]['roe'] == 5.0
+    assert data[CODE]['revenue_yoy'] == 18.18
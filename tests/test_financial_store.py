@@ -0,0 +1,122 @@
+"""src/data/financial_store.py：报告期过期判断、更正版本去重、批量 → 按股票退回"""
+
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+
+from src.data.financial_store import (
+    REFRESH_TTL, FinancialStore, _period_stale, disclosure_deadline, recent_periods,
+)
+
+
+def _ts(*args):
+    return datetime(*args).timestamp()
+
+
+def test_recent_periods():
+    assert recent_periods(5, date(2024, 7, 15)) == \
+        ['20240630', '20240331', '20231231', '20230930', '20230630']
+
+
+@pytest.mark.parametrize('period, deadline', [
+    ('20240331', (2024, 5, 1)),
+    ('20240630', (2024, 9, 1)),
+    ('20240930', (2024, 11, 1)),
+    ('20231231', (2024, 5, 1)),
+])
+def test_disclosure_deadline(period, deadline):
+    assert disclosure_deadline(period) == _ts(*deadline)
+
+
+@pytest.mark.parametrize('fetched_at, now, stale', [
+    # 报告期还没结束
+    (None, (2024, 6, 29), False),
+    # 从没拉过
+    (None, (2024, 7, 15), True),
+    # 披露期内：距上次拉取不到 REFRESH_TTL 不重拉，超过则重拉
+    ((2024, 8, 30, 12), (2024, 8, 30, 23), False),
+    ((2024, 8, 29), (2024, 8, 31, 0, 1), True),
+    # 截止日前拉过、现在已过截止日：补拉一次定稿
+    ((2024, 8, 31, 23), (2024, 9, 1, 0, 1), True),
+    # 截止日之后拉过：不再请求
+    ((2024, 9, 1), (2025, 3, 1), False),
+])
+def test_period_stale_around_deadline(fetched_at, now, stale):
+    fetched = _ts(*fetched_at) if fetched_at else None
+    assert _period_stale('20240630', fetched, _ts(*now)) is stale
+
+
+def test_refresh_ttl_is_a_day():
+    assert REFRESH_TTL == 24 * 3600
+
+
+def _income(rows):
+    return pd.DataFrame([{
+        'ts_code': '600036.SH', 'end_date': '20240630', 'report_type': '1',
+        'ann_date': None, 'f_ann_date': None, 'update_flag': '0', **row,
+    } for row in rows])
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FinancialStore(str(tmp_path / 'fin.db'), periods=4)
+
+
+def test_upsert_keeps_corrected_version(store):
+    store._upsert('income', _income([
+        {'ann_date': '20240910', 'f_ann_date': '20240910', 'update_flag': '1', 'revenue': 101.0},
+        {'ann_date': '20240820', 'f_ann_date': '20240820', 'update_flag': '0', 'revenue': 100.0},
+    ]))
+    assert store.latest('income', '600036')['revenue'] == 101.0
+    # 之后又拉到更正后的另一版本，以最新写入为准
+    store._upsert('income', _income([
+        {'ann_date': '20241020', 'f_ann_date': '20241020', 'update_flag': '1', 'revenue': 102.0},
+    ]))
+    rows = store.records('income', '600036')
+    assert len(rows) == 1 and rows[0]['revenue'] == 102.0
+
+
+class StubTushare:
+    """批量接口没有权限，按股票接口返回一行"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, endpoint, **kwargs):
+        self.calls.append(endpoint)
+        if endpoint.endswith('_vip'):
+            raise Exception('抱歉，您没有访问该接口的权限')
+        return _income([{'ann_date': '20240820', 'f_ann_date': '20240820', 'revenue': 100.0}])
+
+
+def test_permission_error_falls_back_to_per_stock(store):
+    call = StubTushare()
+    now = _ts(2024, 9, 15)
+    store.ensure(call, 'income', '600036', now)
+    # 第一次批量请求没权限后，本进程内其他报告期不再尝试批量接口
+    assert call.calls == ['income_vip', 'income']
+    assert store.latest('income', '600036')['revenue'] == 100.0
+
+    # 已是最新：不再请求
+    store.ensure(call, 'income', '600036', now + 3600)
+    assert call.calls == ['income_vip', 'income']
+
+
+def test_bulk_sync_pages_and_marks_period(store, monkeypatch):
+    monkeypatch.setattr('src.data.financial_store.BULK_PAGE_SIZE', 2)
+    pages = [
+        pd.concat([_income([{'revenue': 1.0}]), _income([{'revenue': 2.0}]).assign(ts_code='000001.SZ')]),
+        _income([{'revenue': 3.0}]).assign(ts_code='000858.SZ'),
+    ]
+    offsets = []
+
+    def call(endpoint, **kwargs):
+        offsets.append(kwargs['offset'])
+        return pages[len(offsets) - 1]
+
+    now = _ts(2024, 9, 15)
+    assert store.sync_period(call, 'income', '20240630', now) == 3
+    assert offsets == [0, 2]
+    assert store.sync_period(call, 'income', '20240630', now + 60) == 0
+    assert len(store.load('income')) == 3
@@ -0,0 +1,82 @@
+"""src/data/fts.py 的分词与 MATCH 表达式，以及 DatabaseManager.search_news"""
+
+import sqlite3
+
+import pytest
+
+from src.data.database import DatabaseManager
+from src.data.fts import build_match_query, tokenize
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('贵州茅台', '贵州 州茅 茅台'),
+    ('ROE 15.04%', 'roe 15 04'),
+    ('茅台ROE', '茅台 roe'),
+    ('ＡＢＣ１２', 'abc12'),
+    ('涨', '涨'),
+    ('', ''),
+    (None, ''),
+])
+def test_tokenize(text, expected):
+    assert tokenize(text) == expected
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('茅台', '"茅台"'),
+    ('贵州茅台', '"贵州 州茅 茅台"'),
+    ('茅台 ROE', '"茅台" "roe"'),
+    ('茅台ROE', '"茅台 roe"'),
+    ('"茅台"', '"茅台"'),
+    ('600519.SH', '"600519 sh"'),
+])
+def test_build_match_query(query, expected):
+    assert build_match_query(query) == expected
+
+
+@pytest.mark.parametrize('query', ['', '   ', '!!!', '涨', '茅台 涨'])
+def test_build_match_query_falls_back(query):
+    assert build_match_query(query) is None
+
+
+def test_match_query_escapes_fts_syntax():
+    # 引号、括号、运算符都不会出现在表达式里，不会让 MATCH 报语法错误
+    match = build_match_query('茅台 OR (NEAR "x*')
+    assert match == '"茅台" "or" "near" "x"'
+
+
+def _fts5_available():
+    try:
+        with sqlite3.connect(':memory:') as conn:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+@pytest.mark.skipif(not _fts5_available(), reason='SQLite 未编译 FTS5')
+def test_search_news_substring_and_like_fallback(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'news.db'))
+    db.save_news([
+        {'title': '贵州茅台发布三季度业绩公告', 'content': '营收同比增长', 'time': '2024-10-25 18:00:00'},
+        {'title': '宁德时代发布钠离子电池', 'content': '能量密度提升', 'time': '2024-10-26 09:00:00'},
+    ], '600519')
+    assert [n['title'] for n in db.search_news('茅台')] == ['贵州茅台发布三季度业绩公告']
+    assert db.search_news('茅台 电池') == []
+    # 单字查询走 LIKE
+    results = db.search_news('电')
+    assert [n['title'] for n in results] == ['宁德时代发布钠离子电池']
+    assert results[0]['score'] is None
+
+
+@pytest.mark.skipif(not _fts5_available(), reason='SQLite 未编译 FTS5')
+def test_resaved_market_news_stays_searchable(tmp_path):
+    db = DatabaseManager(str(tmp_path / 'news.db'))
+    news = {'title': '贵州茅台发布三季度业绩公告', 'content': '营收同比增长', 'time': '2024-10-25 18:00:00'}
+    db.save_news([news])
+    db.save_news([{**news, 'content': '营收同比增长，净利润创新高'}])
+    results = db.search_news('茅台')
+    assert len(results) == 1
+    assert results[0]['content'] == '营收同比增长，净利润创新高'
+    assert len(db.search_news('净利润')) == 1
+    with sqlite3.connect(db.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM news_fts").fetchone()[0] == 1
@@ -0,0 +1,95 @@
+"""src/data/kline_store.py：本地K线仓库的同步判断"""
+
+import time
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.data import kline_store
+from src.data.kline_store import KlineStore, klines_to_arrays
+
+LAST_CLOSE = date(2024, 10, 8)
+
+
+def _bar(day, close):
+    return {'d': day, 'o': close, 'h': close, 'l': close, 'c': close, 'v': 100, 'hs': 1.0}
+
+
+class StubAPI:
+    def __init__(self, bars):
+        self.bars = bars
+        self.calls = 0
+
+    def get_history_klines(self, stock_code, period):
+        self.calls += 1
+        return list(self.bars)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, 'time', lambda: now[0])
+    monkeypatch.setattr(kline_store, 'last_closed_trading_date', lambda _: LAST_CLOSE)
+    return now
+
+
+@pytest.fixture
+def store(tmp_path):
+    return KlineStore(str(tmp_path / 'klines'), min_sync_interval=1800)
+
+
+def test_klines_to_arrays_sorts_and_dedups():
+    arrays = klines_to_arrays([
+        _bar('2024-09-30', 2.0), _bar('20240927', 1.0), _bar('2024-09-30 00:00:00', 3.0), {'x': 1},
+    ])
+    assert arrays['date'].tolist() == [date(2024, 9, 27), date(2024, 9, 30)]
+    assert arrays['close'].tolist() == [1.0, 3.0]
+
+
+def test_sync_appends_closed_bars_only(clock, store):
+    api = StubAPI([_bar('2024-09-30', 10.0), _bar('2024-10-08', 11.0), _bar('2024-10-09', 12.0)])
+    assert store.sync(api, '600036') == 2
+    assert store.load('600036')['date'][-1] == np.datetime64('2024-10-08')
+
+
+def test_fresh_store_makes_no_network_call(clock, store):
+    api = StubAPI([_bar('2024-09-30', 10.0), _bar('2024-10-08', 11.0)])
+    store.sync(api, '600036')
+    clock[0] += 3600
+    assert store.sync(api, '600036') == 0
+    assert api.calls == 1
+    assert store.is_fresh('600036')
+
+
+def test_second_sync_within_interval_is_skipped(clock, store):
+    # 数据源还没有最近一个收盘日的K线：本地仍然不是最新
+    api = StubAPI([_bar('2024-09-30', 10.0)])
+    assert store.sync(api, '600036') == 1
+    clock[0] += 1799
+    assert store.sync(api, '600036') == 0
+    assert api.calls == 1
+
+    clock[0] += 1
+    api.bars.append(_bar('2024-10-08', 11.0))
+    assert store.sync(api, '600036') == 1
+    assert api.calls == 2
+
+
+def test_adjustment_change_rewrites_history(clock, store):
+    api = StubAPI([_bar('2024-09-27', 10.0), _bar('2024-09-30', 10.0)])
+    store.sync(api, '600036')
+    clock[0] += 1800
+    # 除权后复权价整体重算：同日收盘价不一致
+    api.bars = [_bar('2024-09-27', 5.0), _bar('2024-09-30', 5.0), _bar('2024-10-08', 5.5)]
+    assert store.sync(api, '600036') == 3
+    assert store.load('600036')['close'].tolist() == [5.0, 5.0, 5.5]
+
+
+def test_unchanged_adjustment_appends_tail(clock, store):
+    api = StubAPI([_bar('2024-09-27', 10.0), _bar('2024-09-30', 10.0)])
+    store.sync(api, '600036')
+    clock[0] += 1800
+    api.bars.append(_bar('2024-10-08', 10.5))
+    assert store.sync(api, '600036') == 1
+    assert store.load('600036')['close'].tolist() == [10.0, 10.0, 10.5]
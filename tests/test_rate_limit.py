@@ -0,0 +1,71 @@
+"""src/data/rate_limit.py 的令牌桶"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.data.rate_limit import TokenBucket
+
+
+def test_burst_then_empty():
+    bucket = TokenBucket(rate=1, burst=3)
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_refill_over_time(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire()
+    clock[0] += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    clock[0] += 10
+    # 补充不超过桶容量
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire()
+
+
+def test_acquire_timeout_returns_false():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert not bucket.acquire(timeout=0.05)
+    assert time.monotonic() - started < 0.5
+
+
+def test_acquire_waits_for_refill():
+    bucket = TokenBucket(rate=50, burst=1)
+    assert bucket.acquire()
+    started = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - started >= 0.01
+
+
+def test_more_tokens_than_burst_raises():
+    bucket = TokenBucket(rate=5, burst=2)
+    with pytest.raises(ValueError):
+        bucket.acquire(3)
+    with pytest.raises(ValueError):
+        bucket.try_acquire(3)
+
+
+@pytest.mark.parametrize('rate, burst', [(0, None), (-1, None), (1, 0)])
+def test_invalid_rate_or_burst(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, burst)
+
+
+def test_acquire_async():
+    bucket = TokenBucket(rate=50, burst=1)
+
+    async def run():
+        assert await bucket.acquire_async()
+        assert not await bucket.acquire_async(timeout=0.001)
+        assert await bucket.acquire_async(timeout=1)
+        with pytest.raises(ValueError):
+            await bucket.acquire_async(2)
+
+    asyncio.run(run())
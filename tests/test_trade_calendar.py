@@ -0,0 +1,141 @@
+"""src/data/trade_calendar.py 的交易日判断、缓存过期与结果沿用"""
+
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.data import trade_calendar
+from src.data.trade_calendar import FAILED_FETCH_RETRY, TradeCalendar
+
+START, END = date(2024, 9, 1), date(2024, 10, 31)
+# 2024 国庆休市：10 月 1 日 ~ 7 日
+HOLIDAYS = {date(2024, 10, d) for d in range(1, 8)}
+
+
+def _open_days():
+    day, days = START, []
+    while day <= END:
+        if day.weekday() < 5 and day not in HOLIDAYS:
+            days.append(day.strftime('%Y%m%d'))
+        day += timedelta(days=1)
+    return days
+
+
+@pytest.fixture
+def calendar():
+    return TradeCalendar(_open_days(), START, END)
+
+
+def _ts(*args):
+    return datetime(*args).timestamp()
+
+
+def test_is_trading_day(calendar):
+    assert calendar.is_trading_day('20240930')
+    assert not calendar.is_trading_day(date(2024, 10, 2))
+    assert not calendar.is_trading_day('2024-10-05')
+    # 覆盖范围外按工作日近似
+    assert calendar.is_trading_day(date(2025, 1, 2))
+    assert not calendar.is_trading_day(date(2025, 1, 4))
+
+
+def test_next_and_previous_trading_day(calendar):
+    assert calendar.next_trading_day('20240930') == date(2024, 10, 8)
+    assert calendar.previous_trading_day('20241008') == date(2024, 9, 30)
+    assert calendar.previous_trading_day('20241008', inclusive=True) == date(2024, 10, 8)
+
+
+def test_last_closed_trading_date(calendar):
+    assert calendar.last_closed_trading_date(_ts(2024, 9, 30, 10)) == date(2024, 9, 27)
+    assert calendar.last_closed_trading_date(_ts(2024, 9, 30, 16)) == date(2024, 9, 30)
+    assert calendar.last_closed_trading_date(_ts(2024, 10, 4, 12)) == date(2024, 9, 30)
+
+
+def test_end_of_trading_day(calendar):
+    assert calendar.end_of_trading_day(_ts(2024, 9, 30, 10)) == _ts(2024, 9, 30, 15, 30)
+    # 节前收盘后到节后第一个交易日收盘
+    assert calendar.end_of_trading_day(_ts(2024, 9, 30, 16)) == _ts(2024, 10, 8, 15, 30)
+    assert calendar.end_of_trading_day(_ts(2024, 10, 3, 9)) == _ts(2024, 10, 8, 15, 30)
+
+
+@pytest.mark.parametrize('generated, now, expected', [
+    # 节假日里，节前最后一次收盘后生成的结果可以沿用
+    ('2024-09-30T16:00:00', (2024, 10, 3, 9), True),
+    ('2024-10-02T20:00:00', (2024, 10, 3, 9), True),
+    # 收盘前生成的不行
+    ('2024-09-30T14:00:00', (2024, 10, 3, 9), False),
+    # 交易日一律重新分析
+    ('2024-09-30T16:00:00', (2024, 9, 30, 17), False),
+    ('2024-10-08T16:00:00', (2024, 10, 8, 20), False),
+    # 周末：周五收盘后的结果可沿用
+    ('2024-09-27T15:31:00', (2024, 9, 29, 12), True),
+    ('2024-09-26T20:00:00', (2024, 9, 29, 12), False),
+    (None, (2024, 10, 3, 9), False),
+    ('not a time', (2024, 10, 3, 9), False),
+])
+def test_result_still_valid(calendar, generated, now, expected):
+    assert calendar.result_still_valid(generated, _ts(*now)) is expected
+
+
+def test_save_and_load_roundtrip(calendar, tmp_path):
+    path = str(tmp_path / 'cal.json')
+    calendar.save(path)
+    loaded = TradeCalendar.load_file(path)
+    assert loaded.start == START and loaded.end == END
+    assert not loaded.is_trading_day('20241002')
+
+
+def test_load_uses_fresh_cache_without_fetching(calendar, tmp_path):
+    path = str(tmp_path / 'cal.json')
+    calendar.save(path)
+
+    def fetch(start, end):
+        raise AssertionError('不应请求')
+
+    assert TradeCalendar.load(path, fetch, today=date(2024, 10, 3)).covers(date(2024, 10, 3))
+
+
+def test_load_fetches_and_saves(tmp_path):
+    path = str(tmp_path / 'cal.json')
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return _open_days()
+
+    loaded = TradeCalendar.load(path, fetch, today=date(2024, 10, 3))
+    assert calls == [('20230101', '20241231')]
+    # 覆盖范围只到拉到的最后一个交易日
+    assert loaded.end == date(2024, 10, 31)
+    assert not loaded.is_trading_day('20241002')
+    assert TradeCalendar.load(path, fetch, today=date(2024, 10, 3)).end == loaded.end
+    assert len(calls) == 1
+
+
+def test_failed_fetch_is_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cal.json')
+    calls = []
+
+    def fetch(start, end):
+        calls.append(start)
+        raise ConnectionError('offline')
+
+    clock = [1_000_000.0]
+    monkeypatch.setattr(trade_calendar.time, 'time', lambda: clock[0])
+    first = TradeCalendar.load(path, fetch, today=date(2024, 10, 3))
+    assert first.is_trading_day('20241002')  # 按工作日近似
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['retry_at'] == clock[0] + FAILED_FETCH_RETRY
+
+    # 重试时间内其他进程（重新读文件）不再请求
+    TradeCalendar.load(path, fetch, today=date(2024, 10, 3))
+    assert len(calls) == 1
+    clock[0] += FAILED_FETCH_RETRY
+    TradeCalendar.load(path, fetch, today=date(2024, 10, 3))
+    assert len(calls) == 2
+
+
+def test_missing_token_skips_request(monkeypatch):
+    monkeypatch.delenv('TUSHARE_TOKEN', raising=False)
+    assert trade_calendar.fetch_open_days_from_tushare('20240101', '20241231') == []